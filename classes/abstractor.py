@@ -4,15 +4,117 @@ GameAbstractor is a singleton per configured channel that bridges Discord
 messages to the game engine.  It manages the lobby player list, owns
 the current MafiaGame reference, and handles the lobby message lifecycle
 (creating new lobby embeds and deleting stale ones).
+
+Each abstractor drains its own inbound queue on a worker task, so a slow
+channel (e.g. one posting a lobby embed) never holds up routing for the
+others.
 """
 
-import discord, logging, data, asyncio
+import discord, logging, data, asyncio, os, time
 
+from collections import deque
 from discord.ext import commands
 from classes.player import Player
 from classes.game import MafiaGame
 logger = logging.getLogger(__name__)
 
+# Maximum number of queued inbound messages per channel before the
+# overflow policy kicks in.
+INBOX_SIZE = 50
+
+# Seconds of channel silence to wait for before moving the lobby down,
+# and the minimum number of seconds between two lobby bumps.
+LOBBY_QUIET_PERIOD = float(os.getenv("LOBBY_QUIET_PERIOD", "3"))
+LOBBY_MIN_INTERVAL = float(os.getenv("LOBBY_MIN_INTERVAL", "10"))
+
+class LobbyBumper:
+	"""Coalesces chat activity into occasional lobby re-posts.
+
+	Every chat message in an idle channel calls trigger(), but the lobby is
+	only re-posted once the channel has been quiet for `quiet_period`
+	seconds, and never more than once per `min_interval` seconds.  A burst
+	of messages therefore costs one send + one delete instead of one per
+	message.
+
+	Attributes:
+		abstractor: The GameAbstractor whose lobby this bumps.
+		quiet_period: Seconds of inactivity required before bumping.
+		min_interval: Minimum seconds between two bumps.
+		bumps: Number of lobby re-posts made.
+		skipped: Number of bumps skipped because the lobby was already
+			the newest message in the channel.
+	"""
+
+	def __init__(self, abstractor: "GameAbstractor", quiet_period: float = LOBBY_QUIET_PERIOD, min_interval: float = LOBBY_MIN_INTERVAL):
+		self.abstractor = abstractor
+		self.quiet_period = quiet_period
+		self.min_interval = min_interval
+		self.last_activity = 0.0
+		self.last_bump = 0.0
+		self.bumps = 0
+		self.skipped = 0
+		self._task: asyncio.Task | None = None
+		self._posting = False
+		self._lock = asyncio.Lock()
+
+	def trigger(self):
+		"""Note chat activity and schedule a bump if one isn't pending."""
+		self.last_activity = time.monotonic()
+		if self._task is None or self._task.done():
+			self._task = asyncio.create_task(self._bump_when_quiet())
+
+	async def _bump_when_quiet(self):
+		"""Sleep until both the quiet period and minimum interval have passed, then bump."""
+		while True:
+			due = max(self.last_activity + self.quiet_period, self.last_bump + self.min_interval)
+			delay = due - time.monotonic()
+			if delay <= 0:
+				break
+			await asyncio.sleep(delay)
+
+		# From here on cancel() leaves the bump to finish.
+		self._posting = True
+		try:
+			await self.bump()
+		except Exception:
+			logger.exception("Failed to bump lobby in channel %s", self.abstractor.channel)
+		finally:
+			self._posting = False
+
+	async def bump(self, force: bool = False):
+		"""Re-post the lobby now, unless a game started or nothing covers it.
+
+		Args:
+			force: If True, re-post even if the lobby is already the newest
+				message (e.g. on startup, when the old button is stale).
+		"""
+		async with self._lock:
+			if self.abstractor.running:
+				return
+
+			channel = self.abstractor.bot.get_channel(self.abstractor.channel)
+			if not force and self.abstractor.last_lobby_id and getattr(channel, "last_message_id", None) == self.abstractor.last_lobby_id:
+				self.skipped += 1
+				return
+
+			await self.abstractor.post_lobby()
+			self.last_bump = time.monotonic()
+			self.bumps += 1
+
+	def cancel(self):
+		"""Drop any bump still waiting for the channel to go quiet.
+
+		A bump that is already posting is left to finish: interrupting it
+		between sending the new lobby and deleting the old one (or before
+		post_lobby's check for a game having started) would leave an
+		orphaned lobby message.
+		"""
+		if self._task and not self._task.done():
+			if self._posting:
+				return
+			self._task.cancel()
+		self._task = None
+
 class GameAbstractor:
 	"""Per-channel coordinator for lobby state and game routing.
 
@@ -28,13 +130,15 @@ class GameAbstractor:
 		running: True if a game is currently in progress.
 		owner: The Discord user who started the current lobby.
 		game: The active MafiaGame instance, or None.
+		inbox: Bounded queue of messages waiting for the worker task.
+		inbox_stats: Counters for the inbound queue (see submit()).
 	"""
 
 	def __init__(self, channel: int, bot: commands.Bot):
 		"""Create a GameAbstractor for a specific channel.
 
-		Loads the last lobby message ID from data.json so it can be
-		deleted when a new lobby is posted.
+		Looks up the last lobby message ID in the config store so it can
+		be deleted when a new lobby is posted.
 
 		Args:
 			channel: Discord channel ID.
@@ -47,12 +151,124 @@ class GameAbstractor:
 		self.running: bool = False
 		self.owner: discord.User | None = None
 		self.interactions: dict[int, discord.Interaction] = {}
-		config = data.load()
-		self.last_lobby_id: int | None = config.get("profiles", {}).get(self.channel_key, {}).get("last_lobby")
+		self.last_lobby_id: int | None = data.get_profile(self.channel).get("last_lobby")
 		self.game: MafiaGame | None = None
 
+		self.inbox: deque[discord.Message] = deque()
+		self.inbox_size = INBOX_SIZE
+		self.inbox_stats = {"received": 0, "processed": 0, "coalesced": 0, "dropped": 0, "max_depth": 0}
+		self._inbox_ready = asyncio.Event()
+		# The queued lobby-refresh trigger, which absorbs any others until
+		# the worker takes it, whether or not a game has started since.
+		self._lobby_entry: discord.Message | None = None
+		self._worker: asyncio.Task | None = None
+		self.lobby = LobbyBumper(self)
+
+	def _is_player_message(self, message: discord.Message) -> bool:
+		"""Return True if the message may be a human player's turn.
+
+		These are never dropped by the overflow policy.  Everything else is
+		either a lobby-refresh trigger or chatter the TurnManager ignores.
+		"""
+		return self.running and message.author.id in self.players
+
+	def submit(self, message: discord.Message) -> bool:
+		"""Queue a message for the worker task without waiting for it.
+
+		Overflow policy: while no game is running, every message is just a
+		lobby-refresh trigger, so one queued trigger absorbs any others.
+		When the queue is full, player messages evict the oldest droppable
+		entry (or exceed the bound if there is none); anything else is
+		dropped.
+
+		Returns:
+			True if the message was queued, False if it was coalesced or
+			dropped.
+		"""
+		self.inbox_stats["received"] += 1
+		self._ensure_worker()
+
+		if self._is_player_message(message):
+			if len(self.inbox) >= self.inbox_size:
+				for queued in self.inbox:
+					if not self._is_player_message(queued):
+						self.inbox.remove(queued)
+						if queued is self._lobby_entry:
+							self._lobby_entry = None
+						self.inbox_stats["dropped"] += 1
+						break
+				else:
+					logger.warning("Inbox for channel %s is full of player messages, exceeding bound", self.channel)
+		elif not self.running and self._lobby_entry is not None:
+			self.inbox_stats["coalesced"] += 1
+			return False
+		elif len(self.inbox) >= self.inbox_size:
+			self.inbox_stats["dropped"] += 1
+			return False
+
+		if not self.running:
+			self._lobby_entry = message
+		self.inbox.append(message)
+		self.inbox_stats["max_depth"] = max(self.inbox_stats["max_depth"], len(self.inbox))
+		self._inbox_ready.set()
+		return True
+
+	def _ensure_worker(self):
+		"""Start the inbox worker task if it isn't running."""
+		if self._worker is None or self._worker.done():
+			self._worker = asyncio.create_task(self._drain_inbox())
+
+	async def _drain_inbox(self):
+		"""Worker loop: hand queued messages to on_message one at a time."""
+		while True:
+			while not self.inbox:
+				self._inbox_ready.clear()
+				await self._inbox_ready.wait()
+
+			message = self.inbox.popleft()
+			if message is self._lobby_entry:
+				self._lobby_entry = None
+			try:
+				await self.on_message(message)
+			except Exception:
+				logger.exception("Failed to handle message %s in channel %s", message.id, self.channel)
+			self.inbox_stats["processed"] += 1
+
+	def queue_depth(self) -> int:
+		"""Return the number of messages waiting for the worker."""
+		return len(self.inbox)
+
+	async def close(self):
+		"""Stop the inbox worker, discarding anything still queued."""
+		if self._worker:
+			self._worker.cancel()
+			try:
+				await self._worker
+			except asyncio.CancelledError:
+				pass
+			self._worker = None
+		self.inbox.clear()
+		self._lobby_entry = None
+		self.lobby.cancel()
+
+	def attach_thread(self, thread_id: int):
+		"""Route messages from a game thread (e.g. Mafia chat) to this abstractor."""
+		router = getattr(self.bot, "router", None)
+		if router:
+			router.register(thread_id, self)
+
+	def detach_thread(self, thread_id: int):
+		"""Stop routing messages from a game thread to this abstractor."""
+		router = getattr(self.bot, "router", None)
+		if router:
+			router.unregister(thread_id)
+
 	async def _delete_last_lobby(self) -> None:
-		"""Delete the previous lobby embed message, if it still exists."""
+		"""Delete the previous lobby embed message, if it still exists.
+
+		Deletes through a partial message built from the remembered ID, so
+		no fetch is needed first.
+		"""
 
 		if not self.last_lobby_id:
 			return
@@ -65,8 +281,7 @@ class GameAbstractor:
 		assert isinstance(channel, (discord.TextChannel, discord.Thread))  # PYREX NOTE: ... because otherwise the below conditions fail
 
 		try:
-			msg = await channel.fetch_message(self.last_lobby_id)
-			await msg.delete()
+			await channel.get_partial_message(self.last_lobby_id).delete()
 		except discord.NotFound:
 			logger.warning("Last lobby message %s already gone", self.last_lobby_id)
 		except discord.Forbidden:
@@ -78,15 +293,16 @@ class GameAbstractor:
 		"""Route messages to the active game or post a new lobby embed.
 
 		If a game is running, forwards the message to the TurnManager.
-		Otherwise, posts a fresh StartGameView lobby embed and deletes
-		the old one.
+		Otherwise, asks the LobbyBumper to move the lobby embed below the
+		new message once the channel goes quiet.
 
 		If `message` is `False`, the call is ignored.
 
 		Args:
 			message: A Discord message to route, or True to trigger a
 				new lobby without an actual message (used after game end
-				and after failed lobby cancellation). False is ignored.
+				and after failed lobby cancellation), which re-posts the
+				lobby immediately. False is ignored.
 		"""
 		if isinstance(message, discord.Message):
 			# Accept message if it's in the main channel OR in the mafia chat
@@ -106,6 +322,13 @@ class GameAbstractor:
 				await self.game.turns.on_message(message)
 			return
 
+		if message is True:
+			await self.lobby.bump(force=True)
+		else:
+			self.lobby.trigger()
+
+	async def post_lobby(self):
+		"""Post a fresh StartGameView lobby embed and delete the old one."""
 		from classes.views import StartGameView
 
 		# PYREX NOTE: Seems defeasible to me? Should be handled
@@ -138,10 +361,8 @@ class GameAbstractor:
 		self.save_config()
 
 	def save_config(self):
-		"""Persist the last lobby message ID to data.json."""
-		config = data.load()
-		config.setdefault("profiles", {}).setdefault(self.channel_key, {})["last_lobby"] = self.last_lobby_id
-		data.save(config)
+		"""Persist the last lobby message ID (written to disk in the background)."""
+		data.update_profile(self.channel, last_lobby=self.last_lobby_id)
 
 	def reset(self):
 		"""Clear all lobby state after a game ends."""
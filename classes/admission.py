@@ -0,0 +1,234 @@
+"""Process-wide admission control for LLM requests.
+
+Every game shares the same provider quotas, so requests are admitted
+through a single AdmissionController before they are sent.  Each model
+has two token buckets, one for requests per minute and one for
+(estimated) tokens per minute, configured with 'rpm' / 'tpm' on the model
+in models.json or under the top-level 'llm' key.  Models without limits
+are admitted immediately.
+
+When a model is over its limits, waiting requests are served by priority
+class (SPEECH before ACTION before BACKGROUND) and, within a class, round
+robin across channels so that one busy game can't starve the others.
+"""
+
+import asyncio, logging, time
+from collections import OrderedDict, deque
+
+from classes.registry import MODELS
+
+logger = logging.getLogger(__name__)
+
+# Priority classes, most urgent first.
+SPEECH = 0       # Discussion speech and the speaker analysis it waits on
+ACTION = 1       # Votes and night actions
+BACKGROUND = 2   # Summaries, speculation, shadow checks
+PRIORITY_NAMES = ("speech", "action", "background")
+
+# How many recent waits are kept per priority class for percentiles.
+WAIT_WINDOW = 500
+
+class TokenBucket:
+	"""Classic token bucket refilled continuously.
+
+	Attributes:
+		rate: Tokens added per second.
+		capacity: Most tokens the bucket holds (one minute's worth).
+		tokens: Tokens currently available.
+	"""
+
+	def __init__(self, per_minute: float):
+		self.rate = per_minute / 60.0
+		self.capacity = float(per_minute)
+		self.tokens = float(per_minute)
+		self._updated = time.monotonic()
+
+	def _refill(self):
+		now = time.monotonic()
+		self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+		self._updated = now
+
+	def wait_time(self, amount: float) -> float:
+		"""Seconds until `amount` tokens are available (0 if they are now)."""
+		self._refill()
+		amount = min(amount, self.capacity)
+		if self.tokens >= amount:
+			return 0.0
+		return (amount - self.tokens) / self.rate
+
+	def take(self, amount: float):
+		self._refill()
+		self.tokens -= min(amount, self.capacity)
+
+class _Waiter:
+	__slots__ = ("future", "tokens", "priority", "queued_at")
+
+	def __init__(self, future: asyncio.Future, tokens: int, priority: int):
+		self.future = future
+		self.tokens = tokens
+		self.priority = priority
+		self.queued_at = time.monotonic()
+
+class _ModelQueue:
+	"""Buckets and waiting requests for one model.
+
+	Waiters are kept per priority class as an ordered dict of channel ID ->
+	deque, so the next waiter is taken from the first channel in the most
+	urgent non-empty class, after which that channel moves to the back.
+	"""
+
+	def __init__(self, rpm: float | None, tpm: float | None):
+		self.requests = TokenBucket(rpm) if rpm else None
+		self.tokens = TokenBucket(tpm) if tpm else None
+		self.waiting: list[OrderedDict[int, deque[_Waiter]]] = [OrderedDict() for _ in PRIORITY_NAMES]
+		self.dispatcher: asyncio.Task | None = None
+
+	def wait_time(self, tokens: int) -> float:
+		wait = 0.0
+		if self.requests:
+			wait = max(wait, self.requests.wait_time(1))
+		if self.tokens:
+			wait = max(wait, self.tokens.wait_time(tokens))
+		return wait
+
+	def take(self, tokens: int):
+		if self.requests:
+			self.requests.take(1)
+		if self.tokens:
+			self.tokens.take(tokens)
+
+	def has_waiters(self) -> bool:
+		return any(self.waiting)
+
+	def peek(self) -> _Waiter | None:
+		"""Return the next waiter to serve, dropping any that gave up."""
+		for channels in self.waiting:
+			while channels:
+				channel, queue = next(iter(channels.items()))
+				while queue and queue[0].future.done():
+					queue.popleft()
+				if queue:
+					return queue[0]
+				del channels[channel]
+		return None
+
+	def pop(self, waiter: _Waiter):
+		"""Remove a waiter returned by peek() and rotate its channel to the back."""
+		channels = self.waiting[waiter.priority]
+		channel, queue = next(iter(channels.items()))
+		queue.popleft()
+		channels.move_to_end(channel)
+		if not queue:
+			del channels[channel]
+
+class AdmissionController:
+	"""Admits LLM requests within per-model rate limits.
+
+	Attributes:
+		waits: Recent queue wait times in seconds, per priority class.
+		admitted: Requests admitted, per priority class.
+		delayed: Requests that had to queue, per priority class.
+	"""
+
+	def __init__(self):
+		self._queues: dict[str, _ModelQueue] = {}
+		self._limits: dict[str, tuple[float | None, float | None]] = {}
+		self.waits: list[deque[float]] = [deque(maxlen=WAIT_WINDOW) for _ in PRIORITY_NAMES]
+		self.admitted = [0] * len(PRIORITY_NAMES)
+		self.delayed = [0] * len(PRIORITY_NAMES)
+
+	@staticmethod
+	def limits(model: str) -> tuple[float | None, float | None]:
+		"""Return (rpm, tpm) for a model from models.json; None means unlimited."""
+		defaults = MODELS.settings.get("llm", {})
+		info = MODELS.get(model)
+		options = info.options if info else {}
+		return options.get("rpm", defaults.get("rpm")), options.get("tpm", defaults.get("tpm"))
+
+	def _queue(self, model: str) -> _ModelQueue:
+		limits = self.limits(model)
+		if self._limits.get(model) != limits or model not in self._queues:
+			# New model, or its limits changed in models.json.
+			old = self._queues.get(model)
+			queue = _ModelQueue(*limits)
+			if old:
+				queue.waiting = old.waiting
+				queue.dispatcher = old.dispatcher
+			self._queues[model] = queue
+			self._limits[model] = limits
+		return self._queues[model]
+
+	async def acquire(self, model: str, tokens: int, priority: int = ACTION, channel: int = 0) -> float:
+		"""Wait until a request may be sent to `model`.
+
+		Cancelling the caller (e.g. when its deadline runs out) removes the
+		request from the queue.
+
+		Args:
+			model: The model the request is for.
+			tokens: Estimated prompt + completion tokens.
+			priority: SPEECH, ACTION or BACKGROUND.
+			channel: Channel ID of the game, for fair queueing.
+
+		Returns:
+			Seconds spent waiting.
+		"""
+		queue = self._queue(model)
+		self.admitted[priority] += 1
+		if not queue.has_waiters() and queue.wait_time(tokens) == 0:
+			queue.take(tokens)
+			self.waits[priority].append(0.0)
+			return 0.0
+
+		self.delayed[priority] += 1
+		waiter = _Waiter(asyncio.get_running_loop().create_future(), tokens, priority)
+		queue.waiting[priority].setdefault(channel, deque()).append(waiter)
+		if queue.dispatcher is None or queue.dispatcher.done():
+			queue.dispatcher = asyncio.create_task(self._dispatch(model))
+
+		await waiter.future
+		waited = time.monotonic() - waiter.queued_at
+		self.waits[priority].append(waited)
+		if waited > 1:
+			logger.debug("%s request for %s waited %.1fs for admission", PRIORITY_NAMES[priority], model, waited)
+		return waited
+
+	async def _dispatch(self, model: str):
+		"""Admit waiting requests for a model as its buckets refill."""
+		while True:
+			queue = self._queue(model)
+			waiter = queue.peek()
+			if waiter is None:
+				return
+			wait = queue.wait_time(waiter.tokens)
+			if wait > 0:
+				# Sleep, then look again: a more urgent request may have arrived.
+				await asyncio.sleep(wait)
+				continue
+			queue.pop(waiter)
+			queue.take(waiter.tokens)
+			waiter.future.set_result(None)
+
+	def metrics(self) -> dict[str, dict[str, float]]:
+		"""Return queue wait statistics per priority class."""
+		result = {}
+		for priority, name in enumerate(PRIORITY_NAMES):
+			waits = sorted(self.waits[priority])
+			result[name] = {
+				"admitted": self.admitted[priority],
+				"delayed": self.delayed[priority],
+				"mean_wait_s": sum(waits) / len(waits) if waits else 0.0,
+				"p95_wait_s": waits[min(len(waits) - 1, int(0.95 * len(waits)))] if waits else 0.0,
+				"max_wait_s": waits[-1] if waits else 0.0,
+			}
+		return result
+
+	def report(self) -> str:
+		"""Summarise queue waits per priority class on one line."""
+		return ", ".join(
+			f"{name} {m['delayed']}/{m['admitted']} queued (mean {m['mean_wait_s']:.1f}s, p95 {m['p95_wait_s']:.1f}s)"
+			for name, m in self.metrics().items()
+		)
+
+# Shared by every game in the process.
+ADMISSION = AdmissionController()
@@ -0,0 +1,190 @@
+"""Local, rule-based mention analysis for day discussion.
+
+After every discussion speech, TurnManager needs to know which alive
+players were named and how urgently each should respond.  The
+LocalMentionAnalyser answers that without a model call: a single compiled
+pattern finds every player name and alias in the message, and keyword and
+question heuristics assign the same priority levels the discussion
+analyser model uses.
+
+Each result carries a confidence flag.  Messages the heuristics can't
+settle (role claims, accusations aimed at several players, negated
+accusations, role mentions with no name) are marked unconfident so the
+caller can escalate them to the model (see TurnManager.get_next_speaker).
+"""
+
+import logging, re
+from typing import Iterable, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# Priority levels, lowest = most urgent.  Shared with the LLM analyser.
+PRIORITIES = ("COUNTERCLAIM", "ACCUSED", "ASKED", "ROLE", "CASUAL")
+COUNTERCLAIM, ACCUSED, ASKED, ROLE, CASUAL = range(len(PRIORITIES))
+
+# Aliases shorter than this (e.g. "Al" from "Al Smith") are too likely to
+# match ordinary words.
+MIN_ALIAS_LENGTH = 3
+
+ACCUSE_WORDS = re.compile(r"\b(mafia|scum|sus|suspicious|sketchy|lying|liar|lie|lies|evil|guilty|lynch|vote (?:out|for)|hang|eliminate|fake)\b", re.I)
+ROLE_WORDS = re.compile(r"\b(sheriff|doctor|doc|vigilante|vigi|vig|jester|cop|investigator|medic|townie|townsperson)\b", re.I)
+CLAIM_WORDS = re.compile(r"\b(i'?m|i am|i was|claim(?:ing|ed)?|counter ?claim)\b[^.!?]*\b(sheriff|doctor|doc|vigilante|vigi|vig|jester|cop|investigator|medic|townie|townsperson)\b", re.I)
+NEGATION_WORDS = re.compile(r"\b(not|isn'?t|aren'?t|wasn'?t|don'?t|doesn'?t|never|no way|trust|innocent|clear(?:ed)?)\b", re.I)
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+
+class Analysis(NamedTuple):
+	"""Result of analysing one message.
+
+	Attributes:
+		mentions: (player name, priority level) pairs, most urgent first.
+		confident: False if the message should be escalated to the model.
+		reason: Why the analysis isn't confident, for logging ('' if it is).
+	"""
+	mentions: list[tuple[str, int]]
+	confident: bool
+	reason: str = ""
+
+def default_aliases(names: Iterable[str]) -> dict[str, str]:
+	"""Map each full name, and each unambiguous first word of a name, to its player.
+
+	e.g. 'Qwen 3' is also matched by 'Qwen', but 'ChatGPT 4o' and
+	'ChatGPT 5.2' are not matched by 'ChatGPT', since it could be either.
+	"""
+	names = list(names)
+	aliases = {name.lower(): name for name in names}
+	first_words: dict[str, set[str]] = {}
+	for name in names:
+		word = name.split()[0].lower() if name.split() else ""
+		if len(word) >= MIN_ALIAS_LENGTH and word != name.lower():
+			first_words.setdefault(word, set()).add(name)
+	for word, owners in first_words.items():
+		if len(owners) == 1 and word not in aliases:
+			aliases[word] = next(iter(owners))
+	return aliases
+
+class LocalMentionAnalyser:
+	"""Finds player mentions and their priority with a compiled name matcher.
+
+	Attributes:
+		names: The player names the matcher was built for.
+		aliases: Lowercase alias -> player name.
+		pattern: Compiled alternation over every alias, longest first, or
+			None if there are no players.
+	"""
+
+	def __init__(self):
+		self.names: tuple[str, ...] = ()
+		self.aliases: dict[str, str] = {}
+		self.pattern: re.Pattern | None = None
+
+	def update(self, names: Iterable[str], extra_aliases: dict[str, Iterable[str]] | None = None):
+		"""Rebuild the matcher for a new set of players, if it changed.
+
+		Args:
+			names: Names of the alive players.
+			extra_aliases: Additional aliases per player name (e.g. from the
+				'aliases' key of a model in models.json).  Aliases claimed by
+				more than one player are ignored.
+		"""
+		names = tuple(names)
+		if names == self.names and self.pattern is not None:
+			return
+
+		aliases = default_aliases(names)
+		claimed: dict[str, set[str]] = {}
+		for name, extras in (extra_aliases or {}).items():
+			if name not in names:
+				continue
+			for alias in extras:
+				claimed.setdefault(alias.lower(), set()).add(name)
+		for alias, owners in claimed.items():
+			if len(owners) == 1 and len(alias) >= MIN_ALIAS_LENGTH and alias not in aliases:
+				aliases[alias] = next(iter(owners))
+
+		self.names = names
+		self.aliases = aliases
+		if aliases:
+			alternation = "|".join(re.escape(a) for a in sorted(aliases, key=len, reverse=True))
+			self.pattern = re.compile(rf"(?<!\w)(?:{alternation})(?!\w)", re.I)
+		else:
+			self.pattern = None
+
+	def analyse(self, text: str, speaker: str) -> Analysis:
+		"""Find the players mentioned in a message and how urgently they should reply.
+
+		Args:
+			text: The message that was just spoken.
+			speaker: Name of the player who spoke (excluded from results).
+
+		Returns:
+			An Analysis.  Priorities follow the LLM analyser: the player a
+			question is addressed to is ASKED, players named alongside an
+			accusation are ACCUSED, players named with a role are ROLE, and
+			anyone else named is CASUAL.
+		"""
+		if CLAIM_WORDS.search(text):
+			return Analysis([], False, "role claim")
+
+		levels: dict[str, int] = {}
+		order: list[str] = []
+		for sentence in SENTENCE_SPLIT.split(text.strip()):
+			found = self._mentions(sentence, speaker)
+			if not found:
+				if ROLE_WORDS.search(sentence):
+					return Analysis([], False, "role mentioned without a name")
+				continue
+
+			accusing = ACCUSE_WORDS.search(sentence)
+			if accusing and NEGATION_WORDS.search(sentence):
+				return Analysis([], False, "negated accusation")
+			if accusing and len(found) > 1:
+				return Analysis([], False, "accusation with several names")
+
+			addressee = self._addressee(sentence, found)
+			for name, _ in found:
+				if name == addressee:
+					level = ASKED
+				elif accusing:
+					level = ACCUSED
+				elif ROLE_WORDS.search(sentence):
+					level = ROLE
+				else:
+					level = CASUAL
+				if name not in levels:
+					order.append(name)
+				levels[name] = min(level, levels.get(name, CASUAL))
+
+		mentions = sorted(((name, levels[name]) for name in order), key=lambda m: m[1])
+		return Analysis(mentions, True)
+
+	def _mentions(self, sentence: str, speaker: str) -> list[tuple[str, re.Match]]:
+		"""Return (player name, match) for each distinct player named in a sentence."""
+		if self.pattern is None:
+			return []
+		found = {}
+		for match in self.pattern.finditer(sentence):
+			name = self.aliases[match.group(0).lower()]
+			if name != speaker and name not in found:
+				found[name] = match
+		return list(found.items())
+
+	@staticmethod
+	def _addressee(sentence: str, found: list[tuple[str, re.Match]]) -> str | None:
+		"""Return the player a question is addressed to, if any.
+
+		A question is addressed to a player named at the start ('Qwen, what
+		do you think?') or the end ('what do you think, Qwen?') of the
+		sentence, or to the only player named in it.
+		"""
+		if not sentence.rstrip().endswith("?"):
+			return None
+		for name, match in found:
+			before = sentence[:match.start()].strip()
+			after = sentence[match.end():].strip()
+			if not before and after[:1] in (",", ":"):
+				return name
+			if before.endswith(",") and after in ("?", ""):
+				return name
+		if len(found) == 1:
+			return found[0][0]
+		return None
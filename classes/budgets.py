@@ -0,0 +1,232 @@
+"""Completion token budgets per model and call type, and token accounting.
+
+Each kind of call the game makes gets its own completion budget, so a
+speech can't be starved and a vote can't ramble.  Defaults can be changed
+under the top-level 'budgets' key of models.json and overridden per model:
+
+	"budgets": {"speech": 100, "vote": 24, "night": 48},
+	"models": [{"model": "deepseek-r1", ..., "budgets": {"reasoning": 1024}}]
+
+'reasoning' is extra room for models that think before answering, either
+hidden (reported by the provider as reasoning_tokens) or inline in
+<think> tags.  Without it, the thinking eats the whole budget and the
+visible answer comes back empty.  Models with a reasoning allowance are
+sent max_completion_tokens (which covers reasoning); others max_tokens.
+Only models known not to reason ("reasoning": 0) get the bare caps: a
+model that doesn't say either way gets DEFAULT_REASONING, so a thinking
+model missing from models.json still has room to answer.  The helper
+calls (analysis and summaries) are the exception: they go to small
+models picked for speed, so they keep tight caps unless their model
+sets an allowance.
+
+Every completion's usage is recorded in a UsageLedger by model and call
+type, with reasoning tokens counted separately: as reported by the
+provider, or else estimated from the <think> block.  Prompt tokens the
+provider served from its prompt cache are counted too, along with the
+latency of calls with and without a cache hit.
+"""
+
+import copy, logging
+from typing import Any
+
+from classes.context import estimate_tokens
+from classes.registry import MODELS
+
+logger = logging.getLogger(__name__)
+
+# Call types and their default completion budgets in tokens.
+DEFAULT_BUDGETS = {
+	"speech": 100,    # Discussion messages
+	"vote": 24,       # One option name
+	"night": 48,      # Night action choice
+	"analysis": 150,  # Mention list from the discussion analyser
+	"summary": 400,   # Context summaries
+}
+
+# Extra allowance for thinking, added to the budgets above, for models
+# whose 'reasoning' allowance isn't set.
+DEFAULT_REASONING = 1024
+
+# Call types made to the small helper models, which get no reasoning
+# allowance by default.
+HELPER_PURPOSES = ("analysis", "summary")
+
+def budgets(model: str) -> dict[str, int]:
+	"""Return the merged budgets for a model (defaults < top level < model).
+
+	'reasoning' is only included if models.json sets it.
+	"""
+	info = MODELS.get(model)
+	merged = {**DEFAULT_BUDGETS, **MODELS.settings.get("budgets", {})}
+	if info:
+		merged.update(info.options.get("budgets", {}))
+	return {key: int(value) for key, value in merged.items()}
+
+def limit_kwargs(model: str, purpose: str) -> dict[str, int]:
+	"""Return the completion limit argument for one call.
+
+	Args:
+		model: The model the request is sent to.
+		purpose: A call type from DEFAULT_BUDGETS.  Anything else gets no limit.
+
+	Returns:
+		{'max_tokens': n} for models with no reasoning allowance,
+		{'max_completion_tokens': n} for the rest, or {} for unknown call
+		types.
+	"""
+	merged = budgets(model)
+	if purpose not in merged or purpose == "reasoning":
+		return {}
+	reasoning = merged.get("reasoning", 0 if purpose in HELPER_PURPOSES else DEFAULT_REASONING)
+	if reasoning > 0:
+		return {"max_completion_tokens": merged[purpose] + reasoning}
+	return {"max_tokens": merged[purpose]}
+
+class CallUsage:
+	"""Token totals for one (model, call type).
+
+	Attributes:
+		calls: Completions recorded.
+		prompt_tokens: Prompt tokens sent.
+		completion_tokens: Completion tokens received, including reasoning.
+		reasoning_tokens: The part of completion_tokens spent reasoning.
+		cached_tokens: The part of prompt_tokens read from the prompt cache.
+		truncated: Completions cut off by the budget (finish_reason 'length').
+		hit_latency: Total latency of timed calls with cached tokens.
+		hits: Number of timed calls with cached tokens.
+		miss_latency: Total latency of timed calls without.
+		misses: Number of timed calls without.
+	"""
+
+	def __init__(self):
+		self.calls = 0
+		self.prompt_tokens = 0
+		self.completion_tokens = 0
+		self.reasoning_tokens = 0
+		self.cached_tokens = 0
+		self.truncated = 0
+		self.hit_latency = 0.0
+		self.hits = 0
+		self.miss_latency = 0.0
+		self.misses = 0
+
+class UsageLedger:
+	"""Token usage per call type and model, shared by every game."""
+
+	def __init__(self):
+		self.usage: dict[tuple[str, str], CallUsage] = {}
+
+	@staticmethod
+	def _inline_reasoning(content: str | None) -> int:
+		"""Estimate the tokens of a leading <think> block (the whole text if it never closed)."""
+		if not content or "<think>" not in content:
+			return 0
+		return estimate_tokens(content.split("<think>", 1)[1].split("</think>", 1)[0])
+
+	def record(self, model: str, purpose: str, usage: Any, finish_reason: str | None = None, content: str | None = None, latency: float | None = None):
+		"""Add one completion's usage.
+
+		Args:
+			model: The model that answered.
+			purpose: The call type.
+			usage: The response's usage object (None if not reported).
+			finish_reason: The choice's finish_reason.
+			content: The raw completion text, to estimate inline reasoning
+				when the provider doesn't report it.
+			latency: Seconds the request took, if known.
+		"""
+		entry = self.usage.setdefault((purpose, model), CallUsage())
+		entry.calls += 1
+		if usage is not None:
+			entry.prompt_tokens += getattr(usage, "prompt_tokens", 0) or 0
+			entry.completion_tokens += getattr(usage, "completion_tokens", 0) or 0
+		details = getattr(usage, "completion_tokens_details", None)
+		reported = getattr(details, "reasoning_tokens", None)
+		entry.reasoning_tokens += reported if reported else self._inline_reasoning(content)
+		cached = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None) or 0
+		entry.cached_tokens += cached
+		if latency is not None:
+			if cached:
+				entry.hits += 1
+				entry.hit_latency += latency
+			else:
+				entry.misses += 1
+				entry.miss_latency += latency
+		if finish_reason == "length":
+			entry.truncated += 1
+			logger.debug("%s completion from %s hit its token budget", purpose, model)
+
+	def record_response(self, model: str, purpose: str, response: Any, latency: float | None = None):
+		"""Record a (non-streamed) chat completion response."""
+		choices = getattr(response, "choices", None)
+		choice = choices[0] if choices else None
+		content = getattr(getattr(choice, "message", None), "content", None)
+		self.record(model, purpose, getattr(response, "usage", None), getattr(choice, "finish_reason", None), content, latency)
+
+	def snapshot(self) -> dict[tuple[str, str], CallUsage]:
+		"""Return a copy of the totals so far, e.g. to report one game's share later."""
+		return copy.deepcopy(self.usage)
+
+	def metrics(self) -> dict[str, dict[str, dict[str, int]]]:
+		"""Return usage as {call type: {model: totals}}."""
+		result: dict[str, dict[str, dict[str, int]]] = {}
+		for (purpose, model), u in sorted(self.usage.items()):
+			result.setdefault(purpose, {})[model] = {
+				"calls": u.calls,
+				"prompt_tokens": u.prompt_tokens,
+				"completion_tokens": u.completion_tokens,
+				"reasoning_tokens": u.reasoning_tokens,
+				"cached_tokens": u.cached_tokens,
+				"truncated": u.truncated,
+			}
+		return result
+
+	def cache_metrics(self, since: dict[tuple[str, str], CallUsage] | None = None) -> dict[str, dict[str, float]]:
+		"""Return prompt cache statistics per model.
+
+		Args:
+			since: A snapshot() to subtract, for the usage since it was taken.
+		"""
+		since = since or {}
+		totals: dict[str, CallUsage] = {}
+		for (purpose, model), u in self.usage.items():
+			before = since.get((purpose, model), CallUsage())
+			total = totals.setdefault(model, CallUsage())
+			for field in ("prompt_tokens", "cached_tokens", "hits", "hit_latency", "misses", "miss_latency"):
+				setattr(total, field, getattr(total, field) + getattr(u, field) - getattr(before, field))
+
+		result = {}
+		for model, t in sorted(totals.items()):
+			if not t.prompt_tokens:
+				continue
+			result[model] = {
+				"prompt_tokens": t.prompt_tokens,
+				"cached_tokens": t.cached_tokens,
+				"cached_share": t.cached_tokens / t.prompt_tokens,
+				"hit_latency_s": t.hit_latency / t.hits if t.hits else None,
+				"miss_latency_s": t.miss_latency / t.misses if t.misses else None,
+			}
+		return result
+
+	def cache_report(self, since: dict[tuple[str, str], CallUsage] | None = None) -> str:
+		"""Summarise prompt caching per model on one line each."""
+		lines = []
+		for model, m in self.cache_metrics(since).items():
+			line = f"{model}: {m['cached_tokens']}/{m['prompt_tokens']} prompt tokens cached ({m['cached_share']:.0%})"
+			if m["hit_latency_s"] is not None and m["miss_latency_s"] is not None:
+				line += f", {m['hit_latency_s']:.2f}s with a cache hit vs {m['miss_latency_s']:.2f}s without"
+			lines.append(line)
+		return "\n".join(lines)
+
+	def report(self) -> str:
+		"""Summarise usage per call type on one line each."""
+		lines = []
+		for purpose, models in self.metrics().items():
+			calls = sum(m["calls"] for m in models.values())
+			prompt = sum(m["prompt_tokens"] for m in models.values())
+			completion = sum(m["completion_tokens"] for m in models.values())
+			reasoning = sum(m["reasoning_tokens"] for m in models.values())
+			cached = sum(m["cached_tokens"] for m in models.values())
+			truncated = sum(m["truncated"] for m in models.values())
+			lines.append(f"{purpose}: {calls} calls, {prompt} prompt ({cached} cached) + {completion} completion tokens ({reasoning} reasoning), {truncated} truncated")
+		return "\n".join(lines)
@@ -0,0 +1,100 @@
+"""Structured output for AI votes and night actions.
+
+By default an AI's vote or target is free text, parsed with
+extract_choice.  Models flagged in models.json with
+
+	"structured": "json_schema"    (response_format with a JSON schema)
+	"structured": "tool"           (one forced tool call)
+
+are instead asked for {"choice": <one of the options>}, with the options
+as an enum, so the answer is always a valid option and costs a handful
+of tokens.  A model whose provider rejects the structured output request
+itself (e.g. a gateway without JSON schema support) is remembered and
+goes back to free text.  Other rejections (context length, content
+filters) are left to the caller.
+"""
+
+import json, logging
+from typing import Any
+
+import openai
+
+from classes.registry import MODELS
+
+logger = logging.getLogger(__name__)
+
+STRUCTURED_MODES = ("json_schema", "tool")
+
+# Name of the schema / tool, which models see.
+CHOICE_NAME = "choose"
+
+# Models found not to support their configured mode, until restart.
+_unsupported: set[str] = set()
+
+# Request parameters (and words in error messages) that mark a rejection
+# as being about structured output.
+STRUCTURED_PARAMS = ("response_format", "json_schema", "tools", "tool_choice")
+
+def structured_mode(model: str) -> str | None:
+	"""Return the structured mode to use for a model, or None for free text."""
+	info = MODELS.get(model)
+	mode = info and info.options.get("structured")
+	if mode not in STRUCTURED_MODES or model in _unsupported:
+		return None
+	return mode
+
+def is_unsupported_error(exc: BaseException) -> bool:
+	"""Whether an error means the provider rejected structured output itself."""
+	if not isinstance(exc, openai.BadRequestError):
+		return False
+	param = str(getattr(exc, "param", "") or "")
+	if param.split(".")[0].split("[")[0] in STRUCTURED_PARAMS:
+		return True
+	text = f"{getattr(exc, 'code', '') or ''} {exc}".lower()
+	return any(name in text for name in STRUCTURED_PARAMS)
+
+def mark_unsupported(model: str, exc: BaseException):
+	"""Stop using structured output for a model whose provider rejected it."""
+	if model not in _unsupported:
+		logger.warning("Structured output failed for %s, using free text from now on: %s", model, exc)
+		_unsupported.add(model)
+
+def _schema(options: list[str]) -> dict[str, Any]:
+	return {
+		"type": "object",
+		"properties": {"choice": {"type": "string", "enum": options}},
+		"required": ["choice"],
+		"additionalProperties": False,
+	}
+
+def request_kwargs(mode: str, options: list[str]) -> dict[str, Any]:
+	"""Return the completion arguments asking for one of `options`."""
+	if mode == "tool":
+		return {
+			"tools": [{"type": "function", "function": {
+				"name": CHOICE_NAME,
+				"description": "Submit your choice.",
+				"parameters": _schema(options),
+			}}],
+			"tool_choice": {"type": "function", "function": {"name": CHOICE_NAME}},
+		}
+	return {"response_format": {"type": "json_schema", "json_schema": {"name": CHOICE_NAME, "strict": True, "schema": _schema(options)}}}
+
+def parse(response: Any, mode: str, options: list[str]) -> str | None:
+	"""Return the option chosen in a structured response, or None if there isn't a valid one."""
+	message = response.choices[0].message
+	if mode == "tool":
+		calls = message.tool_calls or []
+		raw = calls[0].function.arguments if calls else None
+	else:
+		raw = message.content
+	if not raw:
+		return None
+	try:
+		# Reasoning models may still prefix a <think> block.
+		choice = json.loads(raw[raw.find("{"):]).get("choice")
+	except (ValueError, AttributeError):
+		return None
+	if not isinstance(choice, str):
+		return None
+	return next((o for o in options if o.casefold() == choice.strip().casefold()), None)
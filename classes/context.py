@@ -0,0 +1,215 @@
+"""Game transcript and token-budgeted chat history for AI players.
+
+Everything the AI players hear or say is appended once to a shared
+Transcript, tagged with who may see it.  Each AI player's history is an
+AIContext: the system prompt, a running summary of older events, and the
+indices of the transcript entries it has seen.  Completion payloads are
+built from those indices on demand.
+
+When a history grows past its budget, the oldest entries can be folded
+into the summary by a cheap model in the background (see
+TurnManager.start_summarising), so it never delays a turn.
+
+Payloads are laid out for provider prompt caching, which reuses the
+longest byte-identical prefix of a previous request: the system prompt,
+then the summary, then the append-only history, with one-off
+instructions (vote options, night prompts) only ever sent as a tail that
+isn't kept.  The prefix changes only when a summary is folded in or when
+trimming moves its cut point, which it does in large steps rather than
+one message per turn.
+"""
+
+import logging
+from typing import Literal, NamedTuple
+
+from classes.conversation import ConversationState
+from classes.registry import MODELS
+
+logger = logging.getLogger(__name__)
+
+# Rough characters-per-token ratio used for budgeting.  Close enough for
+# English chat; it only needs to be in the right ballpark.
+CHARS_PER_TOKEN = 4
+
+# Default prompt budget (in tokens) for models that don't set
+# 'context_budget' in models.json.
+DEFAULT_CONTEXT_BUDGET = 6000
+
+# Number of most recent messages that are never summarised.
+KEEP_RECENT = 16
+
+# When the history has to be trimmed, trim it to this fraction of the
+# budget, so the cut point (and with it the cached prefix) stays put for
+# a while instead of moving every turn.
+TRIM_TARGET = 0.75
+
+SUMMARY_PREFIX = "Summary of earlier events in this game:\n"
+
+def estimate_tokens(text: str) -> int:
+	"""Estimate the token count of a message, including per-message overhead."""
+	return len(text) // CHARS_PER_TOKEN + 4
+
+Visibility = Literal["public", "mafia", "private"]
+
+class Entry(NamedTuple):
+	"""One immutable transcript event.
+
+	Attributes:
+		role: 'user' for things the player hears, 'assistant' for things
+			it said itself.
+		content: The message text.
+		visibility: 'public' (main channel), 'mafia' (Mafia chat) or
+			'private' (a prompt to, or reply from, a single player).
+		player: Name of the player a private entry belongs to.
+		tokens: Estimated token count, computed once.
+	"""
+	role: str
+	content: str
+	visibility: Visibility
+	player: str | None
+	tokens: int
+
+class Transcript:
+	"""Append-only log of game events shared by every AIContext.
+
+	Entries are never modified, so a snapshot is just a copy of the list
+	and a game can be replayed from it.
+	"""
+
+	def __init__(self):
+		self.entries: list[Entry] = []
+
+	def add(self, role: str, content: str, visibility: Visibility = "public", player: str | None = None) -> int:
+		"""Append an event and return its index."""
+		self.entries.append(Entry(role, content, visibility, player, estimate_tokens(content)))
+		return len(self.entries) - 1
+
+	def __getitem__(self, index: int) -> Entry:
+		return self.entries[index]
+
+	def __len__(self) -> int:
+		return len(self.entries)
+
+	def snapshot(self) -> list[Entry]:
+		"""Return a copy of every entry so far."""
+		return list(self.entries)
+
+def context_budget(model: str) -> int:
+	"""Return the prompt token budget for a model, from models.json if set."""
+	info = MODELS.get(model)
+	if info and "context_budget" in info.options:
+		return int(info.options["context_budget"])
+	return int(MODELS.settings.get("context_budget", DEFAULT_CONTEXT_BUDGET))
+
+class AIContext:
+	"""Rolling view of the transcript for one AI player.
+
+	Attributes:
+		system: The system prompt, always sent first.
+		summary: Running summary of entries that were folded away.
+		transcript: The shared Transcript the history points into.
+		player: Name of the AI player, used to tag its private entries.
+		history: Indices of the transcript entries seen since the last
+			fold, oldest first.
+		budget: Prompt token budget for this player's model.
+		summarising: True while a background summary is in flight.
+		version: Incremented whenever the history or summary changes, so
+			callers can tell whether a prompt built earlier is still current.
+		state: Server-side conversation state, for stateful models.
+	"""
+
+	def __init__(self, system: str, budget: int = DEFAULT_CONTEXT_BUDGET, keep_recent: int = KEEP_RECENT, transcript: Transcript | None = None, player: str | None = None):
+		self.system = system
+		self.summary = ""
+		self.transcript = transcript if transcript is not None else Transcript()
+		self.player = player
+		self.history: list[int] = []
+		self.budget = budget
+		self.keep_recent = keep_recent
+		self.summarising = False
+		self.version = 0
+		self.state = ConversationState()
+		# History entries before this index are left out of payloads.
+		self._trimmed = 0
+
+	def append(self, role: str, content: str):
+		"""Record a private message (a prompt to, or reply from, this player)."""
+		self.history.append(self.transcript.add(role, content, "private", self.player))
+		self.version += 1
+		self.state.appended(len(self.history), role, content)
+
+	def see(self, index: int):
+		"""Add an existing transcript entry (e.g. a broadcast) to the history."""
+		self.history.append(index)
+		self.version += 1
+		entry = self.transcript[index]
+		self.state.appended(len(self.history), entry.role, entry.content)
+
+	def tokens(self) -> int:
+		"""Estimate the token count of the full prompt."""
+		total = estimate_tokens(self.system) + sum(self.transcript[i].tokens for i in self.history)
+		if self.summary:
+			total += estimate_tokens(SUMMARY_PREFIX + self.summary)
+		return total
+
+	def messages(self, tail: list[dict] | None = None) -> list[dict]:
+		"""Build the completion payload, trimmed to the token budget.
+
+		The system prompt and summary are always included.  If the history
+		still doesn't fit (e.g. a summary hasn't landed yet), the oldest
+		messages are left out, down to TRIM_TARGET of the budget so the
+		same ones stay left out for the next few turns.
+
+		Args:
+			tail: One-off messages to send after the history without
+				recording them (e.g. vote instructions).
+		"""
+		tail = tail or []
+		head = [{"role": "system", "content": self.system}]
+		if self.summary:
+			head.append({"role": "user", "content": SUMMARY_PREFIX + self.summary})
+
+		fixed = sum(estimate_tokens(m["content"]) for m in head + tail)
+		if fixed + sum(self.transcript[i].tokens for i in self.history[self._trimmed:]) > self.budget:
+			remaining = int(self.budget * TRIM_TARGET) - fixed
+			start = len(self.history)
+			while start > self._trimmed:
+				cost = self.transcript[self.history[start - 1]].tokens
+				if cost > remaining:
+					break
+				remaining -= cost
+				start -= 1
+			logger.debug("Trimmed %i messages over the %i token budget", start, self.budget)
+			if start != self._trimmed:
+				# The server's copy still has the trimmed messages; start a new one.
+				self.state.reset()
+			self._trimmed = start
+
+		return head + [self._message(i) for i in self.history[self._trimmed:]] + tail
+
+	def new_messages(self) -> list[dict]:
+		"""Return the messages the server-side conversation state doesn't have yet."""
+		return [self._message(i) for i in self.history[self.state.synced:]]
+
+	def _message(self, index: int) -> dict:
+		entry = self.transcript[index]
+		return {"role": entry.role, "content": entry.content}
+
+	def foldable(self) -> list[dict]:
+		"""Return the messages that should be summarised, or [] if none.
+
+		Summarising starts once the prompt reaches half its budget, and
+		always leaves the most recent keep_recent messages verbatim.
+		"""
+		if self.summarising or self.tokens() < self.budget // 2:
+			return []
+		return [self._message(i) for i in self.history[:max(0, len(self.history) - self.keep_recent)]]
+
+	def fold(self, count: int, summary: str):
+		"""Replace the oldest `count` history messages with a new summary."""
+		self.summary = summary
+		del self.history[:count]
+		self._trimmed = max(0, self._trimmed - count)
+		self.version += 1
+		# The server's copy still has the folded messages; start a new one.
+		self.state.reset()
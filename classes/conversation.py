@@ -0,0 +1,158 @@
+"""Stateful conversations through the Responses API.
+
+Normally every call resends an AI's whole history, so requests (and time
+to first token) grow through the game.  Models flagged with
+
+	"stateful": true
+
+in models.json are instead called through the Responses API, which keeps
+each conversation on the server: a call sends only the messages added
+since that AI's previous turn, plus the previous response's ID.  If the
+provider has lost that state (or the history changed under it: it was
+folded into a summary, or trimmed to fit the budget) the full history is
+sent again and a fresh chain started, so the server's copy never grows
+past what AIContext.messages() would send.
+
+A reply only moves the chain on if the server's copy then matches the
+history exactly: the call had no one-off tail, and the caller recorded
+the reply verbatim.  Otherwise the next call builds on the previous
+response, sending what the history recorded instead.
+
+Responses are wrapped in ChatView / chat-style chunks, so callers read
+them exactly like chat completions.
+"""
+
+import logging
+from typing import Any, AsyncIterator
+
+import openai
+
+from classes.registry import MODELS
+
+logger = logging.getLogger(__name__)
+
+def is_stateful(model: str) -> bool:
+	"""Whether a model should be called through the Responses API."""
+	info = MODELS.get(model)
+	return bool(info and info.options.get("stateful"))
+
+def is_lost_state(exc: BaseException) -> bool:
+	"""Whether an error means the provider no longer has the previous response."""
+	if not isinstance(exc, (openai.NotFoundError, openai.BadRequestError)):
+		return False
+	return "previous_response" in str(getattr(exc, "code", "") or "") or "previous response" in str(exc).lower()
+
+class ConversationState:
+	"""Server-side state of one AI's conversation.
+
+	Attributes:
+		response_id: ID of the last response the server holds, or None to
+			send the full history next time.
+		synced: How many of the AIContext's history entries it covers.
+		endpoint: (base_url, api_key) of the endpoint holding it.
+	"""
+
+	def __init__(self):
+		self.response_id: str | None = None
+		self.synced = 0
+		self.endpoint: tuple[str | None, str | None] | None = None
+		# (response ID, endpoint, history length when the call was made,
+		# reply text) of the latest reply, until the caller records it.
+		self._pending: tuple[str, tuple[str | None, str | None] | None, int, str | None] | None = None
+
+	def reset(self):
+		"""Forget the server-side state, so the next call resends everything."""
+		self.response_id = None
+		self.synced = 0
+		self.endpoint = None
+		self._pending = None
+
+	def replied(self, response_id: str, endpoint: tuple[str | None, str | None] | None, history_length: int, reply: str | None):
+		"""Note a reply, to be adopted once it's appended to the history.
+
+		Args:
+			reply: The reply text the server stored, or None if the server
+				also stored messages the history won't have (a tail).
+		"""
+		self._pending = (response_id, endpoint, history_length, reply)
+
+	def appended(self, history_length: int, role: str, content: str):
+		"""Called by AIContext after each history entry is added.
+
+		The server's state includes its own reply, so the AI's reply being
+		recorded verbatim, straight after the prompts it answered, moves the
+		state on.  Anything else (e.g. a broadcast arriving while it was
+		thinking, or a reply recorded as the choice parsed from it) is
+		simply sent as new messages next time.
+		"""
+		if self._pending and role == "assistant" and self._pending[2] == history_length - 1 and self._pending[3] == content:
+			self.response_id, self.endpoint, _, _ = self._pending
+			self.synced = history_length
+		self._pending = None
+
+def request_kwargs(kwargs: dict[str, Any]) -> dict[str, Any]:
+	"""Translate chat completion arguments to their Responses API equivalents."""
+	result: dict[str, Any] = {}
+	for key, value in kwargs.items():
+		if key in ("max_tokens", "max_completion_tokens"):
+			result["max_output_tokens"] = value
+		elif key == "response_format" and value.get("type") == "json_schema":
+			result["text"] = {"format": {"type": "json_schema", **value["json_schema"]}}
+		elif key == "tools":
+			result["tools"] = [{"type": "function", **tool["function"]} for tool in value]
+		elif key == "tool_choice" and isinstance(value, dict):
+			result["tool_choice"] = {"type": "function", "name": value["function"]["name"]}
+		elif key == "stream_options":
+			continue
+		else:
+			result[key] = value
+	return result
+
+class _Namespace:
+	def __init__(self, **kwargs):
+		self.__dict__.update(kwargs)
+
+def _usage(usage: Any) -> Any:
+	"""Chat-style usage from Responses API usage."""
+	if usage is None:
+		return None
+	input_details = getattr(usage, "input_tokens_details", None)
+	output_details = getattr(usage, "output_tokens_details", None)
+	return _Namespace(
+		prompt_tokens=usage.input_tokens,
+		completion_tokens=usage.output_tokens,
+		total_tokens=usage.total_tokens,
+		prompt_tokens_details=_Namespace(cached_tokens=getattr(input_details, "cached_tokens", 0)),
+		completion_tokens_details=_Namespace(reasoning_tokens=getattr(output_details, "reasoning_tokens", 0)),
+	)
+
+class ChatView:
+	"""A Responses API response, readable like a chat completion."""
+
+	def __init__(self, response: Any):
+		self.id = response.id
+		self.response = response
+		calls = [
+			_Namespace(id=item.call_id, type="function", function=_Namespace(name=item.name, arguments=item.arguments))
+			for item in response.output if item.type == "function_call"
+		]
+		incomplete = getattr(response, "incomplete_details", None)
+		finish_reason = "length" if incomplete and incomplete.reason == "max_output_tokens" else "tool_calls" if calls else "stop"
+		message = _Namespace(role="assistant", content=response.output_text, tool_calls=calls or None)
+		self.choices = [_Namespace(index=0, message=message, finish_reason=finish_reason)]
+		self.usage = _usage(response.usage)
+
+async def chat_chunks(stream: AsyncIterator[Any], on_completed) -> AsyncIterator[Any]:
+	"""Turn a Responses API event stream into chat-style chunks.
+
+	on_completed is called with the final response, before the last
+	(usage-only) chunk is yielded.
+	"""
+	async for event in stream:
+		if event.type == "response.output_text.delta":
+			yield _Namespace(choices=[_Namespace(index=0, delta=_Namespace(content=event.delta), finish_reason=None)], usage=None)
+		elif event.type in ("response.completed", "response.incomplete"):
+			view = ChatView(event.response)
+			on_completed(event.response)
+			yield _Namespace(choices=[_Namespace(index=0, delta=_Namespace(content=None), finish_reason=view.choices[0].finish_reason)], usage=None)
+			yield _Namespace(choices=[], usage=view.usage)
@@ -0,0 +1,130 @@
+"""Coalescing edits of one Discord message.
+
+Live messages (the vote poll, the lobby embed, the settings panel) can be
+updated by many things at once: ten AIs finishing their votes together,
+several players joining, an owner clicking through settings.  Editing the
+message for each of them gets it throttled by Discord, and the last edits
+queue behind rate limit sleeps.  A MessageEditor instead keeps only the
+newest state and applies it at most once per `interval` seconds, skipping
+edits that wouldn't change anything.
+"""
+
+import asyncio, logging, os, time
+from typing import Any
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between two edits of the same message.
+EDIT_INTERVAL = float(os.getenv("MESSAGE_EDIT_INTERVAL", "1"))
+
+def _fingerprint(value: Any) -> Any:
+	"""Return a comparable snapshot of an edit field's current value."""
+	if isinstance(value, discord.Embed):
+		return value.to_dict()
+	if isinstance(value, discord.ui.View):
+		return value.to_components()
+	return value
+
+class MessageEditor:
+	"""Applies the latest state of a message, at most once per interval.
+
+	update() can be called as often as the state changes: the first edit
+	goes out straight away, and any updates during the following interval
+	are merged into one edit at its end.  Fields are passed as for
+	discord.Message.edit (content, embed, view, ...), and only fields that
+	differ from what the message shows are sent.
+
+	Attributes:
+		message: The message to edit.  Updates made while it's None are
+			dropped (e.g. before it has been sent, or once it's deleted).
+		interval: Minimum seconds between two edits.
+		edits: Number of edits made.
+		skipped: Number of edits skipped because nothing had changed.
+	"""
+
+	def __init__(self, message: discord.Message | discord.InteractionMessage | None = None, interval: float = EDIT_INTERVAL):
+		self.interval = interval
+		self.edits = 0
+		self.skipped = 0
+		self.last_edit = 0.0
+		self._pending: dict[str, Any] = {}
+		self._shown: dict[str, Any] = {}
+		self._task: asyncio.Task | None = None
+		self._lock = asyncio.Lock()
+		self.message = message
+
+	@property
+	def message(self) -> discord.Message | discord.InteractionMessage | None:
+		return self._message
+
+	@message.setter
+	def message(self, message: discord.Message | discord.InteractionMessage | None):
+		self._message = message
+		self._shown = {"content": message.content} if message else {}
+
+	def update(self, **fields: Any):
+		"""Set the fields the message should show, editing it soon.
+
+		Side effects:
+			Starts a background task applying the edit, if one isn't pending.
+		"""
+		self._pending.update(fields)
+		if self._task is None or self._task.done():
+			self._task = asyncio.create_task(self._run())
+
+	async def flush(self, **fields: Any):
+		"""Apply any pending update (merged with `fields`) now, ignoring the interval.
+
+		Use this for a final state, e.g. removing the poll's select menu
+		when the vote ends.
+		"""
+		self._pending.update(fields)
+		await self._apply()
+
+	def discard(self):
+		"""Drop any pending update and stop editing, e.g. before deleting the message.
+
+		Side effects:
+			Cancels the background task, if one is waiting to edit.
+		"""
+		self._pending = {}
+		if self._task is not None and not self._task.done():
+			self._task.cancel()
+		self._task = None
+		self.message = None
+
+	async def _run(self):
+		while self._pending:
+			delay = self.last_edit + self.interval - time.monotonic()
+			if delay > 0:
+				await asyncio.sleep(delay)
+			await self._apply()
+
+	async def _apply(self):
+		async with self._lock:
+			fields, self._pending = self._pending, {}
+			if not fields or self._message is None:
+				return
+
+			snapshots = {name: _fingerprint(value) for name, value in fields.items()}
+			changed = {name: fields[name] for name in fields if name not in self._shown or self._shown[name] != snapshots[name]}
+			if not changed:
+				self.skipped += 1
+				return
+
+			self.last_edit = time.monotonic()
+			try:
+				await self._message.edit(**changed)
+			except discord.NotFound:
+				# Deleted under us: later updates have nothing to edit.
+				logger.debug("Message %s is gone, dropping its edits", self._message.id)
+				self._pending = {}
+				self.message = None
+				return
+			except discord.HTTPException as exc:
+				logger.warning("Failed to edit message %s: %s", self._message.id, exc)
+				return
+			self.edits += 1
+			self._shown.update({name: snapshots[name] for name in changed})
@@ -0,0 +1,169 @@
+"""Routing requests for a model across several OpenAI-compatible endpoints.
+
+By default every model is served by OPENAI_BASE_URL / OPENAI_API_KEY.  A
+model in models.json (or the top level, as a default for all models) can
+instead list several endpoints, e.g. two gateways, or one gateway with
+several keys:
+
+	"endpoints": [
+		{"base_url": "https://gateway-a.example/v1", "api_key_env": "GATEWAY_A_KEY", "weight": 2},
+		{"base_url": "https://gateway-b.example/v1", "api_key_env": "GATEWAY_B_KEY"},
+		{"base_url": "http://localhost:8088/v1", "api_key": "test"}
+	]
+
+Keys are normally read from the environment variable named by
+'api_key_env', so they stay out of models.json; 'api_key' can be used for
+local stand-in servers (see standin_server.py).  Omitted fields fall back
+to OPENAI_BASE_URL / OPENAI_API_KEY.
+
+Each request picks an endpoint at random, weighted by its configured
+weight divided by its observed latency and error rate (both EWMAs), so
+load spreads across keys but favours the faster, healthier endpoints.
+An endpoint that keeps failing is evicted for a while.
+"""
+
+import logging, os, random, time
+from typing import Any
+
+from classes.registry import MODELS
+
+logger = logging.getLogger(__name__)
+
+# Smoothing factor for the latency and error-rate EWMAs.
+EWMA_ALPHA = 0.2
+
+# Latency assumed for an endpoint that hasn't answered yet, so new
+# endpoints get tried rather than starved.
+INITIAL_LATENCY = 1.0
+
+# An endpoint is evicted after this many consecutive failures, or once its
+# error rate passes EVICT_ERROR_RATE, and readmitted after EVICT_SECONDS.
+EVICT_FAILURES = 3
+EVICT_ERROR_RATE = 0.5
+EVICT_SECONDS = 30.0
+
+class Endpoint:
+	"""One base URL + API key serving a model, with its observed health.
+
+	Attributes:
+		base_url: API base URL (None for the SDK default).
+		api_key: API key (None to use OPENAI_API_KEY).
+		weight: Configured share of the traffic.
+		latency: EWMA of successful request latency in seconds.
+		error_rate: EWMA of failures (0 = healthy, 1 = always failing).
+		failures: Consecutive failures.
+		requests: Requests sent.
+		evicted_until: time.monotonic() until which the endpoint is skipped.
+	"""
+
+	def __init__(self, base_url: str | None, api_key: str | None, weight: float = 1.0):
+		self.base_url = base_url
+		self.api_key = api_key
+		self.weight = weight
+		self.latency = INITIAL_LATENCY
+		self.error_rate = 0.0
+		self.failures = 0
+		self.requests = 0
+		self.evicted_until = 0.0
+
+	@property
+	def label(self) -> str:
+		return self.base_url or "default"
+
+	@property
+	def healthy(self) -> bool:
+		return time.monotonic() >= self.evicted_until
+
+	def score(self) -> float:
+		"""Relative preference: weight over latency, penalised by errors."""
+		return self.weight / max(self.latency, 0.01) * (1.0 - self.error_rate) ** 2
+
+	def record(self, ok: bool, latency: float | None = None):
+		"""Update the EWMAs after a request, evicting the endpoint if it looks unhealthy."""
+		self.error_rate = (1 - EWMA_ALPHA) * self.error_rate + EWMA_ALPHA * (0.0 if ok else 1.0)
+		if ok:
+			self.failures = 0
+			if latency is not None:
+				self.latency = (1 - EWMA_ALPHA) * self.latency + EWMA_ALPHA * latency
+			return
+
+		self.failures += 1
+		if not self.healthy:
+			# Requests that were already in flight when it was evicted.
+			return
+		if self.failures >= EVICT_FAILURES or self.error_rate >= EVICT_ERROR_RATE:
+			self.evicted_until = time.monotonic() + EVICT_SECONDS
+			logger.warning("Evicting endpoint %s for %.0fs (error rate %.0f%%)", self.label, EVICT_SECONDS, self.error_rate * 100)
+			# Start afresh when it comes back, rather than being evicted again at once.
+			self.failures = 0
+			self.error_rate = EVICT_ERROR_RATE / 2
+
+class EndpointRouter:
+	"""Picks an Endpoint for each request to a model.
+
+	Endpoints are tracked per model, since latency differs a lot between
+	models on the same gateway.
+	"""
+
+	def __init__(self):
+		self._endpoints: dict[tuple[str, str | None, str | None], Endpoint] = {}
+
+	@staticmethod
+	def _configured(model: str) -> list[dict[str, Any]]:
+		info = MODELS.get(model)
+		if info and info.options.get("endpoints"):
+			return list(info.options["endpoints"])
+		return list(MODELS.settings.get("endpoints") or [{}])
+
+	def endpoints(self, model: str) -> list[Endpoint]:
+		"""Return the model's endpoints as currently configured in models.json."""
+		result = []
+		for entry in self._configured(model):
+			base_url = entry.get("base_url") or os.getenv("OPENAI_BASE_URL")
+			api_key = entry.get("api_key") or (os.getenv(entry["api_key_env"]) if entry.get("api_key_env") else None) or os.getenv("OPENAI_API_KEY")
+			key = (model, base_url, api_key)
+			if key not in self._endpoints:
+				self._endpoints[key] = Endpoint(base_url, api_key)
+			endpoint = self._endpoints[key]
+			endpoint.weight = float(entry.get("weight", 1.0))
+			result.append(endpoint)
+		return result
+
+	def pick(self, model: str, prefer: tuple[str | None, str | None] | None = None) -> Endpoint:
+		"""Choose an endpoint for the next request to a model.
+
+		Healthy endpoints are chosen at random in proportion to their score.
+		If every endpoint is evicted, the one due back soonest is used.
+
+		Args:
+			model: The model the request is for.
+			prefer: (base_url, api_key) of an endpoint to use if it is
+				healthy, e.g. one holding a conversation's state.
+		"""
+		endpoints = self.endpoints(model)
+		healthy = [e for e in endpoints if e.healthy and e.weight > 0]
+		preferred = [e for e in healthy if (e.base_url, e.api_key) == prefer]
+		if preferred:
+			endpoint = preferred[0]
+		elif not healthy:
+			endpoint = min(endpoints, key=lambda e: e.evicted_until)
+		elif len(healthy) == 1:
+			endpoint = healthy[0]
+		else:
+			endpoint = random.choices(healthy, weights=[e.score() for e in healthy])[0]
+		endpoint.requests += 1
+		return endpoint
+
+	def metrics(self) -> dict[str, list[dict[str, Any]]]:
+		"""Return per-model endpoint health, e.g. for the debugging hook."""
+		result: dict[str, list[dict[str, Any]]] = {}
+		for (model, _, _), e in self._endpoints.items():
+			result.setdefault(model, []).append({
+				"endpoint": e.label,
+				"weight": e.weight,
+				"requests": e.requests,
+				"latency_s": e.latency,
+				"error_rate": e.error_rate,
+				"healthy": e.healthy,
+			})
+		return result
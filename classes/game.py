@@ -8,12 +8,21 @@ and special actions.
 from classes.player import Player, AIAbstraction
 from classes.scheduler import MafiaSchedulerConfig
 from classes.turnmanager import TurnManager
-from classes.views import SpecialActionsView
-from openai import AsyncOpenAI
+from classes.views import SpecialActionsView, HUMAN_ACTION_TIMEOUT
+from classes.llm import LLM, LLMClient, Deadline
+from classes.admission import ADMISSION
 import logging, discord, asyncio, time
 
 logger = logging.getLogger(__name__)
 
+# Time budgets (in seconds) for the AI calls of a night and of a vote.
+# Every AI call gets whatever is left of its budget; see Deadline.  Time
+# spent waiting on humans doesn't count, and humans get their own fixed
+# windows: HUMAN_ACTION_TIMEOUT for night actions, VOTE_BUDGET for votes.
+# Day discussion turns are only bounded by the per-call timeout.
+NIGHT_BUDGET = 180.0
+VOTE_BUDGET = 120.0
+
 # These are never read anywhere.
 sheriff_already_done = False
 doctor_already_done = False
@@ -32,6 +41,8 @@ class MafiaGame():
 			(e.g. 'mafia_kill', 'saves', 'kills').  Cleared after resolution.
 		config: Shared settings dict from MafiaScheduler/SettingsView.
 		turns: TurnManager instance (created on first run).
+		vote_deadline: The Deadline for the day's AI votes, started when
+			they are prepared at the end of the discussion, if they were.
 	"""
 
 	def __init__(self, abstractor, scheduler, config: MafiaSchedulerConfig):
@@ -51,8 +62,9 @@ class MafiaGame():
 		self.running = False
 
 		self.turns: TurnManager | None = None
+		self.vote_deadline: Deadline | None = None
 		self.bot: discord.Client = abstractor.bot
-		self.generator: AsyncOpenAI = AsyncOpenAI()
+		self.generator: LLMClient = LLM
 		self.scheduler = scheduler
 
 	def get_alive_players(self) -> list[Player]:
@@ -102,6 +114,7 @@ class MafiaGame():
 		"""
 		assert self.channel is not None
 		self.running = True
+		usage_at_start = self.generator.usage.snapshot()
 		self.turns = TurnManager(
 			self.players,
 			self.channel,
@@ -122,6 +135,14 @@ class MafiaGame():
 
 		winner = self.is_game_over() or "No one"
 		self.turns.broadcast(f"**GAME OVER!** {winner} wins!")
+		if self.turns.speculative:
+			logger.info("Speculative turns: %s", self.turns.speculation_report())
+		if self.turns.mention_analyser != "llm":
+			logger.info("Mention analysis: %s", self.turns.analyser_report())
+		logger.info("LLM calls so far:\n%s", self.generator.report())
+		logger.info("LLM token usage so far:\n%s", self.generator.usage.report())
+		logger.info("Prompt caching this game:\n%s", self.generator.usage.cache_report(since=usage_at_start))
+		logger.info("LLM admission waits so far: %s", ADMISSION.report())
 		return winner
 
 	async def run_night_phase(self):
@@ -148,12 +169,13 @@ class MafiaGame():
 
 		roles = list(set(p.role_or_die.name for p in special_players))
 
-		tasks = [self.mafia_choose_target()]
+		deadline = Deadline(NIGHT_BUDGET, "night")
+		tasks = [self.mafia_choose_target(deadline)]
 
 		assert self.turns is not None
 		actions_view = SpecialActionsView(alive_players, self.turns, self)
 
-		timeout_at = int(time.time() + 180)
+		timeout_at = int(time.time() + HUMAN_ACTION_TIMEOUT)
 		assert self.mafia_chat is not None
 		message = f"## Night Actions\nMafia, talk in {self.mafia_chat.jump_url}."
 		if roles:
@@ -163,7 +185,7 @@ class MafiaGame():
 
 		for player in special_players:
 			if isinstance(player.user, AIAbstraction):
-				tasks.append(actions_view.handle_ai_special_action(player))
+				tasks.append(actions_view.handle_ai_special_action(player, deadline))
 
 		await asyncio.gather(*tasks)
 
@@ -207,8 +229,11 @@ class MafiaGame():
 		if not self.get_alive_players():
 			return
 
+		started = time.monotonic()
 		await self.discussion_phase()
+		discussed = time.monotonic()
 		victim = await self.voting_phase()
+		logger.info("Day %i took %.1fs: discussion %.1fs, vote %.1fs", self.day_number, time.monotonic() - started, discussed - started, time.monotonic() - discussed)
 
 		if victim:
 			# voting_phase also sets this.
@@ -227,13 +252,17 @@ class MafiaGame():
 			assert self.turns is not None
 			self.turns.broadcast(message)
 
-	async def mafia_choose_target(self):
+	async def mafia_choose_target(self, deadline: Deadline | None = None):
 		"""Run the mafia night discussion and kill vote.
 
 		Switches the TurnManager to the mafia private thread, lets mafia
 		players discuss (one round per mafia member), then runs a vote.
 		If the vote is inconclusive, a random non-mafia target is chosen.
 
+		Args:
+			deadline: The night's Deadline, for the AIs' discussion turns.
+				The kill vote has its own window.
+
 		Side effects:
 			Sets self.night_actions['mafia_kill'] to the chosen target.
 			Restores TurnManager to the main channel and full player list.
@@ -250,7 +279,7 @@ class MafiaGame():
 		mafia_names = [p.name for p in mafia]
 		self.turns.broadcast(f"You are part of the Mafia! Your team consists of: {', '.join(mafia_names)}. Choose wisely who to eliminate.")
 
-		await self.turns.run_round(rounds=len(mafia))
+		await self.turns.run_round(rounds=len(mafia), deadline=deadline)
 
 		targets = [p for p in alive if p.role != MAFIA]
 		kill = await self.turns.run_vote(
@@ -290,7 +319,20 @@ class MafiaGame():
 		self.turns.broadcast(f"Day {self.day_number} has begun. Alive players: {', '.join(alive_names)}. It's discussion time. Pay close attention to what others say and how they behave - look for suspicious activity or patterns.")
 
 		await self.channel.send(f"**Day {self.day_number} begins...**")
-		await self.turns.run_round(analyse=True)
+		turns = self.turns
+
+		def prepare_vote():
+			# With 'speculative_votes' on, the AI votes start as soon as the
+			# last speech is heard, while it's posted and the poll set up.
+			# The poll's AI votes share their deadline.
+			if turns.speculative_votes:
+				self.vote_deadline = Deadline(VOTE_BUDGET, "vote")
+				turns.prepare_vote(self.get_alive_players(), self._vote_message(), allow_abstain=True, deadline=self.vote_deadline)
+
+		await turns.run_round(analyse=True, on_last_speech=prepare_vote)
+
+	def _vote_message(self) -> str:
+		return f"Day {self.day_number}: Vote to eliminate a player."
 
 	async def voting_phase(self):
 		"""Kick off the voting phase and handle its results.
@@ -304,14 +346,17 @@ class MafiaGame():
 		assert self.turns is not None
 		alive = self.get_alive_players()
 		self.turns.set_participants(alive)
+		deadline, self.vote_deadline = self.vote_deadline or Deadline(VOTE_BUDGET, "vote"), None
 
 		victim = await self.turns.run_vote(
 			candidates=alive,
-			message=f"Day {self.day_number}: Vote to eliminate a player.",
+			message=self._vote_message(),
 			placeholder="Vote for a player...",
 			emoji="🗳️",
+			timeout_s=VOTE_BUDGET,
 			allow_abstain=True,
-			require_majority=True
+			require_majority=True,
+			deadline=deadline
 		)
 
 		if victim:
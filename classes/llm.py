@@ -0,0 +1,509 @@
+"""Resilient wrapper around the OpenAI chat completions API.
+
+Every completion the game makes goes through LLMClient.create, which adds:
+
+- **Retries**: connection errors, timeouts, rate limits and 5xx responses
+  are retried with jittered exponential backoff (honouring Retry-After),
+  so a transient provider hiccup doesn't count as a player failure.
+- **Circuit breakers**: a model that keeps failing is skipped for a while
+  (its 'fallback' model from models.json is used instead, if set) rather
+  than being sent full-size contexts that will fail anyway.
+- **Hedging**: if a model has a 'fallback' and a request runs longer than
+  its usual latency (a percentile of recent calls), the same request is
+  also sent to the fallback and whichever answers first wins.
+- **Deadlines**: each call is cancelled when its phase's Deadline
+  (or the per-call timeout) runs out, raising CompletionTimeout rather
+  than hanging the game.
+- **Endpoints**: each attempt is sent to one of the model's endpoints
+  (see classes.endpoints), chosen by weight, latency and error rate.
+- **Admission**: every attempt first waits its turn in the process-wide
+  AdmissionController, which enforces per-model rate limits by priority.
+- **Budgets**: calls made for a purpose ('speech', 'vote', ...) get that
+  purpose's completion budget for the model that answers, and their token
+  usage is recorded (see classes.budgets).
+- **Stateful conversations**: models flagged 'stateful' are called
+  through the Responses API with only the messages that are new since
+  the AI's last turn (see classes.conversation).
+- **Metrics**: per-model success, retry, latency and breaker state.
+
+Tuning lives under the 'llm' key of models.json (see DEFAULTS).
+"""
+
+import asyncio, contextlib, logging, random, time
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+import openai
+from openai import AsyncOpenAI
+
+from classes.admission import ADMISSION, ACTION, AdmissionController
+from classes.budgets import UsageLedger, limit_kwargs
+from classes.context import estimate_tokens
+from classes.conversation import ChatView, chat_chunks, is_lost_state, is_stateful, request_kwargs
+from classes.endpoints import Endpoint, EndpointRouter
+from classes.pool import POOL
+from classes.registry import MODELS
+
+if TYPE_CHECKING:
+	from classes.context import AIContext
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the 'llm' section of models.json.
+DEFAULTS = {
+	"retries": 2,               # Extra attempts after the first
+	"backoff": 0.5,             # Base backoff in seconds, doubled per attempt
+	"max_backoff": 8.0,         # Cap on a single backoff
+	"breaker_threshold": 5,     # Consecutive failures before the breaker opens
+	"breaker_reset": 30.0,      # Seconds before an open breaker lets a trial call through
+	"hedge_percentile": 0.95,   # Latency percentile after which to hedge
+	"hedge_min_samples": 20,    # Calls needed before hedging a model
+	"call_timeout": 60.0,       # Longest any single call may take, deadline or not
+}
+
+# How many recent latencies are kept per model.
+LATENCY_WINDOW = 200
+
+# Errors that mean this endpoint (rather than the request) is at fault,
+# e.g. a revoked key on one of several gateways.
+ENDPOINT_ERRORS = (openai.AuthenticationError, openai.PermissionDeniedError, openai.NotFoundError)
+
+# Completion tokens assumed for admission when a request sets no limit.
+DEFAULT_COMPLETION_ESTIMATE = 256
+
+RETRYABLE_ERRORS = (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
+
+class CircuitOpenError(Exception):
+	"""Raised when a model's circuit breaker is open and it has no fallback."""
+
+class CompletionTimeout(Exception):
+	"""Raised when a completion runs out of time (as opposed to failing or coming back empty)."""
+
+class Deadline:
+	"""Time budget shared by every AI call in one game phase.
+
+	Created by MafiaGame for the night's AI calls and each vote's AI calls,
+	and passed down to each completion, which gets whatever time is left.
+	It only bounds AI calls: time spent waiting on humans is taken off the
+	clock with paused(), and humans' own windows are fixed.
+
+	Attributes:
+		phase: Name of the phase, for logging.
+		expires_at: time.monotonic() when the budget runs out.
+	"""
+
+	def __init__(self, seconds: float, phase: str = "phase"):
+		self.phase = phase
+		self.expires_at = time.monotonic() + seconds
+
+	def remaining(self) -> float:
+		"""Seconds left, never negative."""
+		return max(0.0, self.expires_at - time.monotonic())
+
+	@property
+	def expired(self) -> bool:
+		return self.remaining() <= 0
+
+	@contextlib.contextmanager
+	def paused(self):
+		"""Stop the clock for the duration of the block (e.g. a human's turn).
+
+		Calls already running keep the time they were given.
+		"""
+		started = time.monotonic()
+		try:
+			yield
+		finally:
+			self.expires_at += time.monotonic() - started
+
+def _setting(key: str):
+	return MODELS.settings.get("llm", {}).get(key, DEFAULTS[key])
+
+def is_retryable(exc: BaseException) -> bool:
+	"""Whether an error is worth retrying (transient network or provider trouble)."""
+	if isinstance(exc, RETRYABLE_ERRORS):
+		return True
+	return isinstance(exc, openai.APIStatusError) and exc.status_code >= 500
+
+class CircuitBreaker:
+	"""Per-model circuit breaker.
+
+	Closed: calls go through.  After breaker_threshold consecutive failures
+	it opens and calls are refused.  After breaker_reset seconds it goes
+	half-open and lets one trial call through, which closes it on success
+	or re-opens it on failure.
+
+	Attributes:
+		model: The model this breaker guards.
+		state: 'closed', 'open' or 'half-open'.
+		failures: Consecutive failures so far.
+		opened_at: time.monotonic() when the breaker last opened or let a
+			trial call through.
+	"""
+
+	def __init__(self, model: str):
+		self.model = model
+		self.state = "closed"
+		self.failures = 0
+		self.opened_at = 0.0
+
+	def allow(self) -> bool:
+		"""Return True if a call may be made now."""
+		if self.state == "closed":
+			return True
+		# A trial call that never reported back (e.g. it was cancelled)
+		# doesn't block the model forever; another is allowed after a reset period.
+		if time.monotonic() - self.opened_at >= _setting("breaker_reset"):
+			self.state = "half-open"
+			self.opened_at = time.monotonic()
+			return True
+		return False
+
+	def record_success(self):
+		self.state = "closed"
+		self.failures = 0
+
+	def record_failure(self):
+		self.failures += 1
+		if self.state == "half-open" or self.failures >= _setting("breaker_threshold"):
+			if self.state != "open":
+				logger.warning("Circuit breaker for %s opened after %i failures", self.model, self.failures)
+			self.state = "open"
+			self.opened_at = time.monotonic()
+
+class ModelMetrics:
+	"""Call statistics for one model.
+
+	Attributes:
+		calls: Requests made (not counting retries).
+		successes: Requests that returned a response.
+		failures: Requests that failed after all retries.
+		retries: Retry attempts made.
+		rejected: Requests refused by an open breaker.
+		timeouts: Requests cancelled because they ran out of time.
+		hedges: Requests that were also sent to the fallback model.
+		fallback_wins: Hedged or redirected requests the fallback answered.
+		full_sends: Stateful calls that sent the whole history.
+		delta_sends: Stateful calls that sent only new messages.
+		lost_state: Stateful calls whose server-side state had been lost.
+		latencies: Recent successful request latencies in seconds.
+	"""
+
+	def __init__(self):
+		self.calls = 0
+		self.successes = 0
+		self.failures = 0
+		self.retries = 0
+		self.rejected = 0
+		self.timeouts = 0
+		self.hedges = 0
+		self.fallback_wins = 0
+		self.full_sends = 0
+		self.delta_sends = 0
+		self.lost_state = 0
+		self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+	def percentile(self, p: float) -> float | None:
+		"""Return the p-th (0-1) percentile of recent latencies, or None if there are none."""
+		if not self.latencies:
+			return None
+		ordered = sorted(self.latencies)
+		return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+class LLMClient:
+	"""AsyncOpenAI wrapper with retries, circuit breakers and hedging.
+
+	Attributes:
+		admission: AdmissionController every attempt waits on.
+		router: Picks an endpoint per attempt.  Unused when a client was
+			passed in explicitly.
+		breakers: Per-model CircuitBreaker.
+		stats: Per-model ModelMetrics.
+		usage: Token usage per call type and model.
+	"""
+
+	def __init__(self, client: AsyncOpenAI | Any | None = None, admission: AdmissionController = ADMISSION):
+		self._client = client
+		self.admission = admission
+		self.router = EndpointRouter()
+		self.breakers: dict[str, CircuitBreaker] = {}
+		self.stats: dict[str, ModelMetrics] = {}
+		self.usage = UsageLedger()
+
+	def _client_for(self, model: str, prefer: tuple[str | None, str | None] | None = None) -> tuple[AsyncOpenAI, Endpoint | None]:
+		"""Return the client to use for the next attempt, and its endpoint if routed.
+
+		Routed clients come from the shared pool, one per endpoint.  `prefer`
+		is passed on to EndpointRouter.pick.
+		"""
+		if self._client is not None:
+			return self._client, None
+		endpoint = self.router.pick(model, prefer)
+		return POOL.get(endpoint.base_url, endpoint.api_key), endpoint
+
+	async def warm(self):
+		"""Create and warm a pooled client for every configured endpoint."""
+		if self._client is None:
+			for info in MODELS.all():
+				for endpoint in self.router.endpoints(info.model):
+					try:
+						POOL.get(endpoint.base_url, endpoint.api_key)
+					except Exception as exc:
+						logger.warning("Could not create a client for %s: %s", endpoint.label, exc)
+		await POOL.warm()
+
+	def _breaker(self, model: str) -> CircuitBreaker:
+		if model not in self.breakers:
+			self.breakers[model] = CircuitBreaker(model)
+		return self.breakers[model]
+
+	def _metrics(self, model: str) -> ModelMetrics:
+		return self.stats.setdefault(model, ModelMetrics())
+
+	@staticmethod
+	def _fallback(model: str) -> str | None:
+		info = MODELS.get(model)
+		fallback = info and info.options.get("fallback")
+		return fallback if fallback and fallback != model else None
+
+	@staticmethod
+	def timeout_for(deadline: Deadline | None) -> float:
+		"""Seconds a call may take: the per-call timeout, or less if the deadline is nearer."""
+		timeout = float(_setting("call_timeout"))
+		return min(timeout, deadline.remaining()) if deadline else timeout
+
+	async def create(self, model: str, messages: list[dict], deadline: Deadline | None = None, priority: int = ACTION, channel: int = 0, purpose: str | None = None, conversation: "AIContext | None" = None, tail: list[dict] | None = None, **kwargs) -> Any:
+		"""Create a chat completion, retrying, hedging or falling back as needed.
+
+		Takes the same arguments as client.chat.completions.create.  With
+		stream=True the stream is returned once it opens; it isn't hedged,
+		and reading it is up to the caller to bound (see timeout_for).
+
+		Args:
+			deadline: The phase's Deadline.  The call, including retries and
+				time queued for admission, is cancelled when it (or
+				call_timeout) runs out.
+			priority: Admission priority class (see classes.admission).
+			channel: Channel ID of the calling game, for fair queueing.
+			purpose: Call type from classes.budgets.DEFAULT_BUDGETS.  Sets
+				the completion limit (unless one is passed explicitly) and
+				the bucket its usage is recorded under.  Streamed usage is
+				left to the caller to record.
+			conversation: The AIContext `messages` was built from.  Stateful
+				models then get only its new messages where they can.
+			tail: The one-off messages `messages` ends with, which aren't
+				in the conversation's history (see AIContext.messages).
+
+		Raises:
+			CompletionTimeout: If the call ran out of time.
+			CircuitOpenError: If the model's breaker is open and it has no
+				fallback model.
+			openai.OpenAIError: If the request failed after all retries.
+		"""
+		timeout = self.timeout_for(deadline)
+		if timeout <= 0:
+			self._metrics(model).timeouts += 1
+			raise CompletionTimeout(f"No time left for {model}")
+		try:
+			return await asyncio.wait_for(self._create(model, messages, kwargs, (priority, channel), purpose, (conversation, tail or []) if conversation else None), timeout)
+		except TimeoutError:
+			self._metrics(model).timeouts += 1
+			raise CompletionTimeout(f"{model} did not answer within {timeout:.0f}s") from None
+
+	async def _create(self, model: str, messages: list[dict], kwargs: dict, admit: tuple[int, int], purpose: str | None, conversation: "tuple[AIContext, list[dict]] | None") -> Any:
+		fallback = self._fallback(model)
+		if not self._breaker(model).allow():
+			self._metrics(model).rejected += 1
+			if fallback and self._breaker(fallback).allow():
+				logger.info("Circuit for %s is open, using fallback %s", model, fallback)
+				self._metrics(model).fallback_wins += 1
+				return await self._attempt(fallback, messages, kwargs, admit, purpose, conversation)
+			raise CircuitOpenError(f"Circuit breaker for {model} is open")
+
+		metrics = self._metrics(model)
+		threshold = metrics.percentile(_setting("hedge_percentile"))
+		if not fallback or kwargs.get("stream") or threshold is None or len(metrics.latencies) < _setting("hedge_min_samples"):
+			return await self._attempt(model, messages, kwargs, admit, purpose, conversation)
+		return await self._hedged(model, fallback, threshold, messages, kwargs, admit, purpose, conversation)
+
+	async def _hedged(self, model: str, fallback: str, threshold: float, messages: list[dict], kwargs: dict, admit: tuple[int, int], purpose: str | None, conversation: "tuple[AIContext, list[dict]] | None") -> Any:
+		"""Send to `model`, and also to `fallback` if it takes longer than threshold."""
+		primary = asyncio.create_task(self._attempt(model, messages, kwargs, admit, purpose, conversation))
+		pending = {primary}
+		try:
+			done, _ = await asyncio.wait(pending, timeout=threshold)
+			if done or not self._breaker(fallback).allow():
+				return await primary
+
+			self._metrics(model).hedges += 1
+			logger.debug("Hedging %s to %s after %.1fs", model, fallback, threshold)
+			secondary = asyncio.create_task(self._attempt(fallback, messages, kwargs, admit, purpose, conversation))
+			pending = {primary, secondary}
+			while pending:
+				done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+				for task in done:
+					if task.exception() is None:
+						if task is secondary:
+							self._metrics(model).fallback_wins += 1
+						return task.result()
+			# Both failed: report the primary model's error.
+			return primary.result()
+		finally:
+			for task in pending:
+				task.cancel()
+
+	async def _attempt(self, model: str, messages: list[dict], kwargs: dict, admit: tuple[int, int], purpose: str | None, conversation: "tuple[AIContext, list[dict]] | None") -> Any:
+		"""Call one model, retrying transient errors with jittered backoff.
+
+		Each attempt is admitted separately, since retries count against
+		the provider's rate limits too, and may go to a different endpoint.
+		"""
+		if purpose and "max_tokens" not in kwargs and "max_completion_tokens" not in kwargs:
+			# Budgets are per model, so a fallback gets its own.
+			kwargs = {**limit_kwargs(model, purpose), **kwargs}
+		metrics = self._metrics(model)
+		breaker = self._breaker(model)
+		metrics.calls += 1
+		retries = int(_setting("retries"))
+		tokens = self._estimate(messages, kwargs)
+		# Only stateful models make use of the conversation.
+		context, tail = conversation if conversation and is_stateful(model) else (None, [])
+		for attempt in range(retries + 1):
+			await self.admission.acquire(model, tokens, *admit)
+			client, endpoint = self._client_for(model, context.state.endpoint if context else None)
+			started = time.monotonic()
+			try:
+				if context:
+					response = await self._respond(client, endpoint, model, messages, context, tail, kwargs)
+				else:
+					response = await client.chat.completions.create(model=model, messages=messages, **kwargs)
+			except Exception as exc:
+				if endpoint:
+					endpoint.record(not (is_retryable(exc) or isinstance(exc, ENDPOINT_ERRORS)))
+				if isinstance(exc, ENDPOINT_ERRORS) and attempt < retries and len(self.router.endpoints(model)) > 1:
+					# Another endpoint may well work.
+					metrics.retries += 1
+					logger.warning("Endpoint %s rejected %s (%s), trying another", endpoint.label if endpoint else "default", model, exc.__class__.__name__)
+					continue
+				if not is_retryable(exc):
+					# The provider answered, so the model is up; the request was bad.
+					breaker.record_success()
+					metrics.failures += 1
+					raise
+				# With other healthy endpoints left, one bad endpoint isn't the model's fault.
+				if not endpoint or not any(e.healthy for e in self.router.endpoints(model) if e is not endpoint):
+					breaker.record_failure()
+				if attempt == retries or breaker.state == "open":
+					metrics.failures += 1
+					raise
+				metrics.retries += 1
+				delay = self._backoff(attempt, exc)
+				logger.warning("Completion for %s failed (%s), retrying in %.1fs", model, exc.__class__.__name__, delay)
+				await asyncio.sleep(delay)
+				continue
+
+			latency = time.monotonic() - started
+			if endpoint:
+				endpoint.record(True, latency)
+			breaker.record_success()
+			metrics.successes += 1
+			metrics.latencies.append(latency)
+			if purpose and not kwargs.get("stream"):
+				self.usage.record_response(model, purpose, response, latency)
+			return response
+
+	async def _respond(self, client: AsyncOpenAI, endpoint: Endpoint | None, model: str, messages: list[dict], conversation: "AIContext", tail: list[dict], kwargs: dict) -> Any:
+		"""Call a stateful model through the Responses API.
+
+		Sends only the conversation's new messages (and the tail) if the
+		server has its earlier state (on this endpoint), else the full
+		`messages`.
+		"""
+		state = conversation.state
+		metrics = self._metrics(model)
+		key = (endpoint.base_url, endpoint.api_key) if endpoint else None
+		history_length = len(conversation.history)
+		args = request_kwargs(kwargs)
+		new = conversation.new_messages() + tail
+
+		response = None
+		if state.response_id and state.endpoint == key and new:
+			try:
+				response = await client.responses.create(model=model, input=new, previous_response_id=state.response_id, **args)
+				metrics.delta_sends += 1
+			except Exception as exc:
+				if not is_lost_state(exc):
+					raise
+				logger.info("%s lost the conversation state for %s, resending the full history", endpoint.label if endpoint else "The provider", conversation.player)
+				metrics.lost_state += 1
+				state.reset()
+		if response is None:
+			response = await client.responses.create(model=model, input=messages, **args)
+			metrics.full_sends += 1
+
+		# The server also keeps the tail, which the history never will.
+		if kwargs.get("stream"):
+			return chat_chunks(response, lambda final: state.replied(final.id, key, history_length, None if tail else final.output_text))
+		state.replied(response.id, key, history_length, None if tail else response.output_text)
+		return ChatView(response)
+
+	@staticmethod
+	def _estimate(messages: list[dict], kwargs: dict) -> int:
+		"""Estimate the prompt + completion tokens of a request, for admission."""
+		completion = kwargs.get("max_completion_tokens") or kwargs.get("max_tokens") or DEFAULT_COMPLETION_ESTIMATE
+		return sum(estimate_tokens(str(m.get("content") or "")) for m in messages) + completion
+
+	@staticmethod
+	def _backoff(attempt: int, exc: BaseException) -> float:
+		"""Full-jitter exponential backoff, or the server's Retry-After if given."""
+		response = getattr(exc, "response", None)
+		retry_after = response.headers.get("retry-after") if response is not None else None
+		if retry_after:
+			try:
+				return min(float(retry_after), _setting("max_backoff"))
+			except ValueError:
+				pass
+		return random.uniform(0, min(_setting("max_backoff"), _setting("backoff") * 2 ** attempt))
+
+	def metrics(self) -> dict[str, dict[str, Any]]:
+		"""Return per-model metrics, e.g. for the debugging hook."""
+		result = {}
+		for model, m in self.stats.items():
+			result[model] = {
+				"calls": m.calls,
+				"successes": m.successes,
+				"failures": m.failures,
+				"retries": m.retries,
+				"rejected": m.rejected,
+				"timeouts": m.timeouts,
+				"hedges": m.hedges,
+				"fallback_wins": m.fallback_wins,
+				"delta_sends": m.delta_sends,
+				"full_sends": m.full_sends,
+				"lost_state": m.lost_state,
+				"p50_s": m.percentile(0.5),
+				"p95_s": m.percentile(0.95),
+				"breaker": self._breaker(model).state,
+			}
+		return result
+
+	def report(self) -> str:
+		"""Summarise per-model metrics on one line each."""
+		lines = []
+		for model, m in self.metrics().items():
+			p50 = f"{m['p50_s']:.1f}s" if m["p50_s"] is not None else "-"
+			p95 = f"{m['p95_s']:.1f}s" if m["p95_s"] is not None else "-"
+			line = f"{model}: {m['successes']}/{m['calls']} ok, {m['retries']} retries, {m['timeouts']} timeouts, {m['hedges']} hedged, p50 {p50}, p95 {p95}, breaker {m['breaker']}"
+			if m["delta_sends"] or m["full_sends"]:
+				line += f", {m['delta_sends']} incremental / {m['full_sends']} full sends, {m['lost_state']} lost state"
+			lines.append(line)
+		for model, endpoints in self.router.metrics().items():
+			if len(endpoints) > 1:
+				lines.append(f"{model} endpoints: " + ", ".join(
+					f"{e['endpoint']} {e['requests']} reqs, {e['latency_s']:.1f}s, {e['error_rate']:.0%} errors{'' if e['healthy'] else ' (evicted)'}"
+					for e in endpoints
+				))
+		return "\n".join(lines)
+
+# Shared by every game, so breaker state and metrics outlive a single game.
+LLM = LLMClient()
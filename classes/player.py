@@ -7,7 +7,9 @@ create_ai_players() to build the AI player list from models.json.
 
 from typing import Any, Literal
 
-import discord, json
+import discord
+
+from classes.registry import MODELS
 
 class AIAbstraction:
 	"""Representation of an AI player. Partially compatible with Player.
@@ -61,10 +63,9 @@ class Player:
 		return self.role
 
 def create_ai_players(selected_models: list[str] | None = None) -> list[Player]:
-	"""Create AI Player instances from models.json.
+	"""Create AI Player instances from the model registry.
 
-	Reads the models list and avatar template from models.json.  If
-	selected_models is provided, only creates players for models in
+	If selected_models is provided, only creates players for models in
 	that list; otherwise creates players for all models.
 
 	Args:
@@ -75,16 +76,10 @@ def create_ai_players(selected_models: list[str] | None = None) -> list[Player]:
 		List of Player instances (accessible via ai_abstraction.player).
 	"""
 	players = []
-	with open("models.json") as f:
-		data = json.load(f)
-		models = data["models"]
-		avatar_format = data["avatar_template"]
-
-	for m in models:
-		if selected_models is not None and m["model"] not in selected_models:
+	for m in MODELS.all():
+		if selected_models is not None and m.model not in selected_models:
 			continue
-		avatar = m.get("avatar") or m.get("avatar_url")
-		model = AIAbstraction(m["model"], m.get("name", "Unknown"), avatar_format.format(avatar))
+		model = AIAbstraction(m.model, m.name, m.avatar_url)
 		players.append(model.player)
 
 	return players
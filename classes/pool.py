@@ -0,0 +1,147 @@
+"""Shared, pooled OpenAI clients.
+
+Every game talks to the same provider, so instead of each building its own
+AsyncOpenAI (with its own connection pool, TLS handshakes and DNS lookups)
+they share one client per (base URL, API key) from the ClientPool.  The
+underlying httpx client keeps connections alive between turns, uses
+HTTP/2 when the optional 'h2' package is installed, and counts how often
+requests reuse an existing connection.
+
+The pool is created at bot startup, warmed when a lobby countdown starts
+(so the first AI turn doesn't pay for the handshake) and closed on
+shutdown.
+"""
+
+import importlib.util, logging, os
+from typing import Any
+
+from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+# Connection pool tuning.  Games make short bursts of parallel requests
+# (e.g. every AI voting at once), then go quiet between turns.
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY = 120.0
+
+# Per-request timeout; phase deadlines usually cut calls off sooner.
+REQUEST_TIMEOUT = 120.0
+
+class ConnectionStats:
+	"""Counts requests and new connections using httpcore's trace extension.
+
+	Attributes:
+		requests: Requests sent.
+		connections: New TCP connections opened.
+		tls_handshakes: TLS handshakes performed.
+		http2_requests: Requests sent over HTTP/2.
+	"""
+
+	def __init__(self):
+		self.requests = 0
+		self.connections = 0
+		self.tls_handshakes = 0
+		self.http2_requests = 0
+
+	async def on_request(self, request):
+		"""httpx request event hook: attach the trace callback."""
+		self.requests += 1
+		request.extensions["trace"] = self._trace
+
+	async def _trace(self, event: str, info: dict):
+		if event == "connection.connect_tcp.complete":
+			self.connections += 1
+		elif event == "connection.start_tls.complete":
+			self.tls_handshakes += 1
+		elif event == "http2.send_request_headers.started":
+			self.http2_requests += 1
+
+	def as_dict(self) -> dict[str, Any]:
+		reused = max(0, self.requests - self.connections)
+		return {
+			"requests": self.requests,
+			"connections": self.connections,
+			"tls_handshakes": self.tls_handshakes,
+			"http2_requests": self.http2_requests,
+			"reuse_rate": reused / self.requests if self.requests else 0.0,
+		}
+
+class ClientPool:
+	"""One AsyncOpenAI client per (base URL, API key), shared process-wide.
+
+	Attributes:
+		clients: (base_url, api_key) -> AsyncOpenAI.
+		stats: (base_url, api_key) -> ConnectionStats.
+	"""
+
+	def __init__(self):
+		self.clients: dict[tuple[str | None, str | None], AsyncOpenAI] = {}
+		self.stats: dict[tuple[str | None, str | None], ConnectionStats] = {}
+
+	def get(self, base_url: str | None = None, api_key: str | None = None) -> AsyncOpenAI:
+		"""Return the shared client for a base URL and key, creating it if needed.
+
+		Both default to OPENAI_BASE_URL / OPENAI_API_KEY from the environment.
+		The SDK's own retries are turned off, since LLMClient retries itself.
+		"""
+		base_url = base_url or os.getenv("OPENAI_BASE_URL")
+		api_key = api_key or os.getenv("OPENAI_API_KEY")
+		key = (base_url, api_key)
+		if key not in self.clients:
+			import httpx
+			stats = ConnectionStats()
+			http2 = importlib.util.find_spec("h2") is not None
+			http_client = httpx.AsyncClient(
+				http2=http2,
+				limits=httpx.Limits(
+					max_connections=MAX_CONNECTIONS,
+					max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+					keepalive_expiry=KEEPALIVE_EXPIRY,
+				),
+				timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=10.0),
+				event_hooks={"request": [stats.on_request]},
+			)
+			self.clients[key] = AsyncOpenAI(base_url=base_url, api_key=api_key, http_client=http_client, max_retries=0)
+			self.stats[key] = stats
+			logger.info("Created pooled OpenAI client for %s (HTTP/2 %s)", base_url or "the default endpoint", "on" if http2 else "off")
+		return self.clients[key]
+
+	async def warm(self):
+		"""Open a connection for every client with a cheap request.
+
+		Failures are only logged; the real requests will retry anyway.
+		"""
+		if not self.clients:
+			try:
+				self.get()
+			except Exception as exc:
+				logger.warning("Could not create the OpenAI client: %s", exc)
+				return
+		for (base_url, _), client in list(self.clients.items()):
+			try:
+				await client.models.list()
+			except Exception as exc:
+				logger.debug("Warming connection to %s failed: %s", base_url or "the default endpoint", exc)
+
+	async def close(self):
+		"""Close every client and its connections."""
+		for client in self.clients.values():
+			try:
+				await client.close()
+			except Exception:
+				logger.exception("Failed to close OpenAI client")
+		self.clients.clear()
+
+	def connection_stats(self) -> dict[str, dict[str, Any]]:
+		"""Return connection reuse statistics per base URL."""
+		return {base_url or "default": stats.as_dict() for (base_url, _), stats in self.stats.items()}
+
+	def report(self) -> str:
+		"""Summarise connection reuse per base URL on one line each."""
+		return "\n".join(
+			f"{url}: {s['requests']} requests over {s['connections']} connections ({s['reuse_rate']:.0%} reused, {s['http2_requests']} over HTTP/2)"
+			for url, s in self.connection_stats().items()
+		)
+
+POOL = ClientPool()
@@ -0,0 +1,124 @@
+"""Shared registry of the AI models listed in models.json.
+
+models.json is parsed once into immutable ModelInfo records and re-read
+only when the file's modification time changes, so views and the game
+engine can look models up without touching the disk.
+"""
+
+import json, logging, os, time
+from types import MappingProxyType
+from typing import Any, Mapping, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+MODELS_FILE = "models.json"
+
+# How often (in seconds) to stat models.json for changes.
+RELOAD_CHECK_INTERVAL = 5.0
+
+# How many models are enabled by default in a new lobby.
+DEFAULT_MODEL_COUNT = 10
+
+class ModelInfo(NamedTuple):
+	"""One entry from models.json.
+
+	Attributes:
+		model: The OpenAI model identifier (e.g. 'gpt-4o').
+		name: Display name shown in Discord.
+		avatar_url: Webhook avatar URL, already formatted from the template.
+		emoji: Custom emoji markup (e.g. '<:gpt4o:123>'), or None.
+		analyser: Model used to analyse discussion after this model speaks.
+		options: The raw entry, read-only, for per-model settings.
+	"""
+	model: str
+	name: str
+	avatar_url: str | None
+	emoji: str | None
+	analyser: str | None
+	options: Mapping[str, Any]
+
+class ModelRegistry:
+	"""Parsed, hot-reloading view of models.json.
+
+	Attributes:
+		path: Path to models.json.
+		discussion_analyser: Default model for discussion analysis.
+		avatar_template: Format string used to build avatar URLs.
+		settings: Read-only top-level keys of models.json (other than 'models').
+	"""
+
+	def __init__(self, path: str = MODELS_FILE):
+		self.path = path
+		self.discussion_analyser: str | None = None
+		self.avatar_template = "{}"
+		self.settings: Mapping[str, Any] = MappingProxyType({})
+		self._models: tuple[ModelInfo, ...] = ()
+		self._by_id: dict[str, ModelInfo] = {}
+		self._mtime: float | None = None
+		self._checked_at = 0.0
+
+	def _maybe_reload(self):
+		"""Re-parse models.json if it changed, checking at most every RELOAD_CHECK_INTERVAL seconds."""
+		now = time.monotonic()
+		if self._mtime is not None and now - self._checked_at < RELOAD_CHECK_INTERVAL:
+			return
+		self._checked_at = now
+
+		try:
+			mtime = os.stat(self.path).st_mtime
+		except OSError:
+			logger.exception("Could not stat %s", self.path)
+			return
+		if mtime == self._mtime:
+			return
+
+		try:
+			with open(self.path) as f:
+				raw = json.load(f)
+		except Exception:
+			logger.exception("Failed to load %s, keeping %i previously loaded models", self.path, len(self._models))
+			return
+
+		self._load(raw)
+		self._mtime = mtime
+		logger.info("Loaded %i models from %s", len(self._models), self.path)
+
+	def _load(self, raw: dict):
+		self.avatar_template = raw.get("avatar_template", "{}")
+		self.discussion_analyser = raw.get("discussion_analyser")
+		self.settings = MappingProxyType({k: v for k, v in raw.items() if k != "models"})
+
+		models = []
+		for m in raw.get("models", []):
+			avatar = m.get("avatar") or m.get("avatar_url")
+			models.append(ModelInfo(
+				model=m["model"],
+				name=m.get("name", "Unknown"),
+				avatar_url=self.avatar_template.format(avatar) if avatar else None,
+				emoji=m.get("emoji"),
+				analyser=m.get("analyser", self.discussion_analyser),
+				options=MappingProxyType(dict(m)),
+			))
+		self._models = tuple(models)
+		self._by_id = {m.model: m for m in self._models}
+
+	def all(self) -> tuple[ModelInfo, ...]:
+		"""Return every model, in models.json order."""
+		self._maybe_reload()
+		return self._models
+
+	def get(self, model: str) -> ModelInfo | None:
+		"""Look up a model by its identifier."""
+		self._maybe_reload()
+		return self._by_id.get(model)
+
+	def default_ids(self) -> list[str]:
+		"""Return the identifiers of the models enabled in a new lobby."""
+		return [m.model for m in self.all()[:DEFAULT_MODEL_COUNT]]
+
+	def get_analyser(self) -> str | None:
+		"""Return the default discussion analyser model."""
+		self._maybe_reload()
+		return self.discussion_analyser
+
+MODELS = ModelRegistry()
@@ -18,6 +18,7 @@ from classes.turnmanager import extract_choice
 
 if TYPE_CHECKING:
 	from classes.game import MafiaGame
+	from classes.llm import Deadline
 	from classes.player import Player
 	from classes.views import SpecialActionsView
 	# PYREX NOTE: discord.types.interactions is _explicitly_
@@ -110,7 +111,7 @@ class Role:
 		"""Called after night resolution.  Used by roles that track state across nights."""
 		pass
 
-	async def night_action_ai(self, game: "MafiaGame", player: "Player"):
+	async def night_action_ai(self, game: "MafiaGame", player: "Player", deadline: "Deadline | None" = None):
 		"""Execute the night action for an AI player.  No-op for base Role."""
 		pass
 
@@ -198,16 +199,14 @@ class SelectRole(Role):
 		if selection == "abstain":
 			await interaction.response.edit_message(content=f"You chose to abstain.", view=None)
 			if action_view:
-				action_view.acted_players.add(interaction.user.id)
-				action_view.pending_humans.discard(interaction.user.id)
+				action_view.inputs.mark(interaction.user.id)
 			return
 
 		user = options[int(selection)]
 		await self.handle_selection(game, player, user)
 		await interaction.response.edit_message(content=f"You chose to {self.action_label} {user.name}.", view=None)
 		if action_view:
-			action_view.acted_players.add(interaction.user.id)
-			action_view.pending_humans.discard(interaction.user.id)
+			action_view.inputs.mark(interaction.user.id)
 
 	async def handle_selection(self, game: "MafiaGame", player: "Player", user: "Player") -> None:
 		"""Apply the role's effect to the chosen target.  Override in subclasses.
@@ -216,8 +215,11 @@ class SelectRole(Role):
 		"""
 		pass
 
-	async def night_action_ai(self, game: "MafiaGame", player: "Player") -> None:
-		"""Prompt the AI to choose a target and apply the role's effect."""
+	async def night_action_ai(self, game: "MafiaGame", player: "Player", deadline: "Deadline | None" = None) -> None:
+		"""Prompt the AI to choose a target and apply the role's effect.
+
+		The completion gets whatever is left of the night's deadline.
+		"""
 
 		options = self.get_options(game, player)
 		opt_names = [p.name for p in options]
@@ -228,10 +230,9 @@ class SelectRole(Role):
 		prompt = f"NIGHT: {self.name.upper()} {self.action_label.upper()}\n> {self.get_prompt()}\n"
 		if self.skippable:
 			prompt += "Note: You are NOT required to act. If you don't have a strong suspicion, you should 'abstain' to avoid hurting your team.\n"
-		prompt += "Available options:\n" + "\n".join([f"- {name}" for name in prompt_options])
 
 		assert game.turns is not None
-		choice_text = await game.turns.create_ai_completion(player, prompt)
+		choice_text = await game.turns.create_ai_completion(player, prompt, deadline, prompt_options)
 
 		if not choice_text:
 			return
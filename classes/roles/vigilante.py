@@ -36,7 +36,7 @@ class Vigilante(KillRole):
 		if not self.can_act(player):
 			await interaction.response.send_message("You have already used your shot!", ephemeral=True)
 			if action_view:
-				action_view.pending_humans.discard(interaction.user.id)
+				action_view.inputs.skip(interaction.user.id)
 			return
 		await super().handle_button_click(game, player, interaction, action_view)
 
@@ -0,0 +1,74 @@
+"""Channel-indexed message routing.
+
+Contains MessageRouter, which maps Discord channel IDs (game channels and
+Mafia private threads) to the GameAbstractor that owns them, so that an
+incoming message can be dispatched with a single dict lookup instead of
+asking every abstractor in turn.
+"""
+
+import discord, logging
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from classes.abstractor import GameAbstractor
+
+logger = logging.getLogger(__name__)
+
+class MessageRouter:
+	"""Maps channel IDs to their GameAbstractor.
+
+	Game channels are registered when the abstractor is created (on startup
+	and by /setup).  Mafia chat threads are registered when start_game
+	creates them and unregistered once they are locked.
+
+	Attributes:
+		routes: Dict of channel/thread ID -> GameAbstractor.
+		routed: Number of messages handed to an abstractor.
+		dropped: Number of messages that matched no registered channel.
+	"""
+
+	def __init__(self):
+		self.routes: dict[int, "GameAbstractor"] = {}
+		self.routed = 0
+		self.dropped = 0
+
+	def register(self, channel_id: int, abstractor: "GameAbstractor"):
+		"""Route messages from channel_id to abstractor, replacing any previous entry."""
+		self.routes[channel_id] = abstractor
+		logger.debug("Registered route %s -> %s", channel_id, abstractor.channel)
+
+	def unregister(self, channel_id: int):
+		"""Stop routing messages from channel_id.  Unknown IDs are ignored."""
+		if self.routes.pop(channel_id, None) is not None:
+			logger.debug("Unregistered route %s", channel_id)
+
+	def get(self, channel_id: int) -> "GameAbstractor | None":
+		"""Return the abstractor registered for channel_id, or None."""
+		return self.routes.get(channel_id)
+
+	def route(self, message: discord.Message) -> bool:
+		"""Queue a message on the inbox of the abstractor that owns its channel.
+
+		Doesn't wait for the message to be handled; each abstractor drains
+		its own inbox (see GameAbstractor.submit).
+
+		Returns:
+			True if an abstractor received the message, False if it was
+			dropped because its channel isn't registered.
+		"""
+		abstractor = self.routes.get(message.channel.id)
+		if abstractor is None:
+			self.dropped += 1
+			return False
+
+		self.routed += 1
+		abstractor.submit(message)
+		return True
+
+	def stats(self) -> dict[str, int]:
+		"""Return routing counters, e.g. for the debugging hook."""
+		return {"routes": len(self.routes), "routed": self.routed, "dropped": self.dropped}
+
+	def queue_depths(self) -> dict[int, int]:
+		"""Return the inbox depth of every registered game channel."""
+		return {abstractor.channel: abstractor.queue_depth() for abstractor in set(self.routes.values())}
@@ -9,6 +9,8 @@ from typing import TypedDict
 from classes.roles import Alignment, TOWN, MAFIA
 from classes.player import Player, AIAbstraction
 from classes.views import JoinGameView
+from classes.llm import LLM
+from classes.edits import MessageEditor
 import asyncio, time, discord, random, data, logging, traceback
 
 logger = logging.getLogger(__name__)
@@ -48,7 +50,10 @@ class MafiaSheduler:
 		self.abstractor = abstractor
 		self.lobby: JoinGameView = lobby
 		self.message: discord.Message = message
+		# Lobby embed updates (joins, settings changes) go through this.
+		self.editor = MessageEditor(message)
 		self.start_job: asyncio.Task | None = None
+		self.warm_job: asyncio.Task | None = None
 		self.attempts = 0
 		total_players = len(self.abstractor.players)
 		mafia = max(1, total_players // 3)
@@ -70,6 +75,8 @@ class MafiaSheduler:
 		Creates an asyncio task that sleeps until start_at, then calls
 		start_game().  If there aren't enough players, retries up to 3
 		times with a 5-minute delay.  After 3 failures, cancels the game.
+		Also warms the OpenAI connection pool so the first AI turn
+		doesn't wait for a handshake, unless a warm-up is still running.
 
 		Args:
 			start_at: Unix timestamp when the game should start.
@@ -80,6 +87,8 @@ class MafiaSheduler:
 				self.attempts += 1
 				if self.attempts >= 3:
 					await self.message.channel.send("Not enough players to start the game!\nPlease restart with more players.")
+					self.stop_warming()
+					self.editor.discard()
 					await self.message.delete()
 					self.abstractor.running = False
 					data.update_game_status(self.abstractor.bot)
@@ -89,11 +98,19 @@ class MafiaSheduler:
 
 				await self.message.channel.send("Not enough players to start the game!")
 				self.lobby.start_at = int(time.time()) + 60 * 5
-				await self.message.edit(embed=self.lobby.generate_embed())
+				self.editor.update(embed=self.lobby.generate_embed())
 				self.schedule(self.lobby.start_at)
 
 		new_task = asyncio.create_task(task())
 		self.start_job = new_task
+		if self.warm_job is None or self.warm_job.done():
+			self.warm_job = asyncio.create_task(LLM.warm())
+
+	def stop_warming(self):
+		"""Cancel the connection pool warm-up, if it's still running."""
+		if self.warm_job is not None and not self.warm_job.done():
+			self.warm_job.cancel()
+		self.warm_job = None
 
 	async def start_game(self):
 		"""Set up permissions, assign roles, run the game, and clean up.
@@ -117,7 +134,6 @@ class MafiaSheduler:
 		player_role: discord.Role | None = None
 		original_overwrites = None
 
-		config = data.load()
 		maybe_channel = self.message.channel
 		assert isinstance(maybe_channel, discord.TextChannel)  # PYREX NOTE: TEXTUAL_CHANNEL is not specific enough; Thread doesn't have overwrites_for
 		channel: discord.TextChannel = maybe_channel
@@ -126,12 +142,12 @@ class MafiaSheduler:
 
 		try:
 			self.game.config = self.config
-			await self.message.edit(view=None, embed=self.lobby.generate_embed(show_starting_soon=False))
+			await self.editor.flush(view=None, embed=self.lobby.generate_embed(show_starting_soon=False))
 
 			await channel.send("Starting game...")
 
 			self.setup_roles()
-			player_role = guild.get_role(config["guilds"][str(guild.id)]["player_role"])
+			player_role = guild.get_role(data.get_guild(guild.id)["player_role"])
 			assert player_role is not None
 
 			original_overwrites = channel.overwrites_for(guild.default_role)
@@ -176,6 +192,7 @@ class MafiaSheduler:
 					logger.warning(f"User is of type {type(user)}?!?!?!?!?!??!?! What is this?!?!?!??!?!?!")
 
 			mafia_chat = await channel.create_thread(name="Mafia Private Chat", invitable=False)
+			self.abstractor.attach_thread(mafia_chat.id)
 			self.game.mafia_chat = mafia_chat
 			self.game.channel = channel
 
@@ -217,7 +234,11 @@ class MafiaSheduler:
 			except (discord.errors.HTTPException, RuntimeError):
 				# Session might be closed during shutdown or thread doesn't exist
 				logger.warn("Could not lock mafia chat thread during cleanup")
+			finally:
+				if mafia_chat:
+					self.abstractor.detach_thread(mafia_chat.id)
 
+			self.stop_warming()
 			self.abstractor.reset()
 			self.abstractor.running = False
 			data.update_game_status(self.abstractor.bot)
@@ -0,0 +1,111 @@
+"""Unit tests for abstractor.py."""
+
+import asyncio, types
+import pytest
+import data
+from .abstractor import GameAbstractor, LobbyBumper
+
+def message(author_id, message_id=0):
+    return types.SimpleNamespace(id=message_id, channel=types.SimpleNamespace(id=10), author=types.SimpleNamespace(id=author_id))
+
+@pytest.fixture
+def abstractor(tmp_path, monkeypatch):
+    monkeypatch.setattr(data, "store", data.ConfigStore(data.JSONBackend(str(tmp_path / "data.json"))))
+    game = GameAbstractor(10, types.SimpleNamespace())
+    game.handled = []
+    async def on_message(message):
+        game.handled.append(message)
+    game.on_message = on_message
+    return game
+
+def test_lobby_triggers_coalesce_until_the_queued_one_is_taken(abstractor):
+    async def run():
+        assert abstractor.submit(message(1))
+        assert not abstractor.submit(message(2))
+        # The game starts before the worker takes the trigger.
+        abstractor.running = True
+        abstractor.players = {1: None}
+        await asyncio.sleep(0)
+        abstractor.running = False
+        assert abstractor.submit(message(3))
+        await asyncio.sleep(0)
+        await abstractor.close()
+    asyncio.run(run())
+    assert [m.author.id for m in abstractor.handled] == [1, 3]
+    assert abstractor.inbox_stats["coalesced"] == 1
+
+def test_full_inbox_drops_chatter_but_keeps_player_messages(abstractor):
+    async def run():
+        abstractor.running = True
+        abstractor.players = {1: None}
+        abstractor.inbox_size = 2
+        abstractor.submit(message(2, 1))
+        abstractor.submit(message(1, 2))
+        assert not abstractor.submit(message(2, 3))
+        assert abstractor.submit(message(1, 4))
+        assert abstractor.submit(message(1, 5))
+        ids = [m.id for m in abstractor.inbox]
+        await abstractor.close()
+        return ids
+    assert asyncio.run(run()) == [2, 4, 5]
+    assert abstractor.inbox_stats["dropped"] == 2
+
+class FakeLobby:
+    def __init__(self):
+        self.running = False
+        self.channel = 10
+        self.last_lobby_id = None
+        self.posts = []
+        self.posting_time = 0.0
+        self.bot = types.SimpleNamespace(get_channel=lambda _: types.SimpleNamespace(last_message_id=self.newest))
+        self.newest = None
+
+    async def post_lobby(self):
+        await asyncio.sleep(self.posting_time)
+        self.last_lobby_id = self.newest = len(self.posts) + 1
+        self.posts.append(asyncio.get_running_loop().time())
+
+def test_bumps_wait_for_quiet_and_keep_their_interval():
+    async def run():
+        lobby = FakeLobby()
+        bumper = LobbyBumper(lobby, quiet_period=0.05, min_interval=0.2)
+        start = asyncio.get_running_loop().time()
+        for _ in range(3):
+            bumper.trigger()
+            await asyncio.sleep(0.02)
+        await asyncio.sleep(0.1)
+        first = list(lobby.posts)
+        lobby.newest = None  # someone chatted below the lobby
+        bumper.trigger()
+        await asyncio.sleep(0.3)
+        return start, first, lobby.posts
+    start, first, posts = asyncio.run(run())
+    assert len(first) == 1 and first[0] - start >= 0.08
+    assert len(posts) == 2 and posts[1] - posts[0] >= 0.18
+
+def test_bump_is_skipped_when_the_lobby_is_already_newest():
+    async def run():
+        lobby = FakeLobby()
+        bumper = LobbyBumper(lobby, quiet_period=0, min_interval=0)
+        await bumper.bump()
+        await bumper.bump()
+        await bumper.bump(force=True)
+        return len(lobby.posts), bumper.skipped
+    assert asyncio.run(run()) == (2, 1)
+
+def test_cancel_drops_a_waiting_bump_but_not_one_being_posted():
+    async def run():
+        lobby = FakeLobby()
+        bumper = LobbyBumper(lobby, quiet_period=0.05, min_interval=0)
+        bumper.trigger()
+        await asyncio.sleep(0.01)
+        bumper.cancel()
+        await asyncio.sleep(0.1)
+        cancelled = len(lobby.posts)
+        lobby.posting_time = 0.05
+        bumper.trigger()
+        await asyncio.sleep(0.07)
+        bumper.cancel()
+        await asyncio.sleep(0.1)
+        return cancelled, len(lobby.posts)
+    assert asyncio.run(run()) == (0, 1)
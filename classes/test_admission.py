@@ -0,0 +1,39 @@
+"""Unit tests for admission.py."""
+
+import asyncio
+from .admission import AdmissionController, SPEECH, ACTION, BACKGROUND
+
+def limited(monkeypatch, rpm):
+    monkeypatch.setattr(AdmissionController, "limits", staticmethod(lambda model: (rpm, None)))
+
+def test_unlimited_models_are_admitted_immediately(monkeypatch):
+    limited(monkeypatch, None)
+    controller = AdmissionController()
+
+    async def run():
+        return [await controller.acquire("m", 100) for _ in range(50)]
+    assert asyncio.run(run()) == [0.0] * 50
+    assert controller.metrics()["action"]["delayed"] == 0
+
+def test_queued_requests_go_by_priority_then_channel(monkeypatch):
+    """Speech beats actions beats background; channels take turns within a class."""
+    limited(monkeypatch, 600)  # One request every 0.1s once the burst is used up
+    controller = AdmissionController()
+    order = []
+
+    async def request(name, priority, channel):
+        await controller.acquire("m", 1, priority, channel)
+        order.append(name)
+
+    async def run():
+        for _ in range(600):
+            await controller.acquire("m", 1)
+        await asyncio.gather(
+            request("bg", BACKGROUND, 1),
+            request("a1", ACTION, 1),
+            request("a2", ACTION, 1),
+            request("b1", ACTION, 2),
+            request("speech", SPEECH, 2),
+        )
+    asyncio.run(run())
+    assert order == ["speech", "a1", "b1", "a2", "bg"]
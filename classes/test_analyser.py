@@ -0,0 +1,40 @@
+"""Unit tests for analyser.py."""
+
+import pytest
+from .analyser import LocalMentionAnalyser, ACCUSED, ASKED, CASUAL
+
+NAMES = ["Qwen 3", "Gemini", "GLM", "Kimi", "ChatGPT 4o", "ChatGPT 5.2", "Claudia Haiku 4.5"]
+
+@pytest.fixture
+def analyser():
+    a = LocalMentionAnalyser()
+    a.update(NAMES, {"Claudia Haiku 4.5": ["Claude"]})
+    return a
+
+@pytest.mark.parametrize("text, expected", [
+    ("Qwen, what's your read on Gemini? She's defending GLM.", [("Qwen 3", ASKED), ("Gemini", CASUAL), ("GLM", CASUAL)]),
+    ("Kimi is definitely Mafia, she's been too quiet", [("Kimi", ACCUSED)]),
+    ("What do you think, Claude?", [("Claudia Haiku 4.5", ASKED)]),
+    ("I agree with what ChatGPT 4o said earlier", [("ChatGPT 4o", CASUAL)]),
+    ("We need to be more careful", []),
+])
+def test_confident_mentions(analyser, text, expected):
+    """Unambiguous messages are resolved locally with the LLM's priority levels."""
+    result = analyser.analyse(text, "Speaker")
+    assert result.confident
+    assert result.mentions == expected
+
+@pytest.mark.parametrize("text", [
+    "I'm the sheriff, I investigated Kimi last night and got Mafia.",
+    "I think the doctor saved themselves last night",
+    "Kimi and Gemini are both mafia",
+    "Kimi is not mafia",
+])
+def test_unclear_messages_escalate(analyser, text):
+    """Role claims and ambiguous accusations are left to the LLM."""
+    assert not analyser.analyse(text, "Speaker").confident
+
+def test_ambiguous_aliases_and_speaker_are_ignored(analyser):
+    """'ChatGPT' could be either model, and speakers never mention themselves."""
+    assert analyser.analyse("ChatGPT is quiet today", "Speaker").mentions == []
+    assert analyser.analyse("Qwen here, Kimi seems fine", "Qwen 3").mentions == [("Kimi", CASUAL)]
@@ -0,0 +1,47 @@
+"""Unit tests for budgets.py."""
+
+import types
+from .budgets import DEFAULT_BUDGETS, DEFAULT_REASONING, UsageLedger, limit_kwargs
+
+def test_reasoning_models_get_room_to_think(monkeypatch):
+    models = {
+        "thinker": types.SimpleNamespace(options={"budgets": {"reasoning": 1000}}),
+        "plain": types.SimpleNamespace(options={"budgets": {"reasoning": 0}}),
+        "unflagged": types.SimpleNamespace(options={}),
+    }
+    registry = types.SimpleNamespace(settings={"budgets": {"vote": 10}}, get=models.get)
+    monkeypatch.setattr("classes.budgets.MODELS", registry)
+
+    assert limit_kwargs("plain", "vote") == {"max_tokens": 10}
+    assert limit_kwargs("thinker", "vote") == {"max_completion_tokens": 1010}
+    assert limit_kwargs("plain", "unknown") == {}
+
+def test_unflagged_models_are_not_capped_like_plain_ones(monkeypatch):
+    """A model that may think, but isn't marked as doing so, still has room to answer."""
+    registry = types.SimpleNamespace(settings={}, get=lambda model: types.SimpleNamespace(options={}) if model == "unflagged" else None)
+    monkeypatch.setattr("classes.budgets.MODELS", registry)
+
+    assert limit_kwargs("unflagged", "vote") == {"max_completion_tokens": DEFAULT_BUDGETS["vote"] + DEFAULT_REASONING}
+    assert limit_kwargs("unregistered", "night") == {"max_completion_tokens": DEFAULT_BUDGETS["night"] + DEFAULT_REASONING}
+
+def test_reasoning_is_counted_reported_or_inline():
+    ledger = UsageLedger()
+    reported = types.SimpleNamespace(prompt_tokens=50, completion_tokens=300, completion_tokens_details=types.SimpleNamespace(reasoning_tokens=290))
+    inline = types.SimpleNamespace(prompt_tokens=50, completion_tokens=60, completion_tokens_details=None)
+    ledger.record("a", "vote", reported, "stop", "Alice")
+    ledger.record("b", "vote", inline, "length", "<think>" + "hmm " * 50)
+
+    votes = ledger.metrics()["vote"]
+    assert votes["a"]["reasoning_tokens"] == 290
+    assert votes["b"]["reasoning_tokens"] > 40
+    assert votes["b"]["truncated"] == 1
+
+def test_helper_calls_keep_tight_caps(monkeypatch):
+    """The analyser and summariser models aren't in models.json, but aren't given room to think."""
+    thinker = types.SimpleNamespace(options={"budgets": {"reasoning": 200}})
+    registry = types.SimpleNamespace(settings={}, get=lambda model: thinker if model == "thinker" else None)
+    monkeypatch.setattr("classes.budgets.MODELS", registry)
+
+    assert limit_kwargs("ministral-3-3b", "analysis") == {"max_tokens": DEFAULT_BUDGETS["analysis"]}
+    assert limit_kwargs("ministral-3-3b", "summary") == {"max_tokens": DEFAULT_BUDGETS["summary"]}
+    assert limit_kwargs("thinker", "summary") == {"max_completion_tokens": DEFAULT_BUDGETS["summary"] + 200}
@@ -0,0 +1,42 @@
+"""Unit tests for choices.py."""
+
+import json, types
+import openai
+import pytest
+from . import choices
+
+def response(content=None, arguments=None):
+    calls = [types.SimpleNamespace(function=types.SimpleNamespace(arguments=arguments))] if arguments else None
+    message = types.SimpleNamespace(content=content, tool_calls=calls)
+    return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+@pytest.mark.parametrize("mode", choices.STRUCTURED_MODES)
+def test_request_offers_options_as_an_enum(mode):
+    kwargs = choices.request_kwargs(mode, ["Alice", "Bob"])
+    assert '"enum": ["Alice", "Bob"]' in json.dumps(kwargs)
+
+@pytest.mark.parametrize("resp, mode, expected", [
+    (response(content='{"choice": "alice"}'), "json_schema", "Alice"),
+    (response(content='<think>Bob is odd</think>{"choice": "Bob"}'), "json_schema", "Bob"),
+    (response(arguments='{"choice": "Bob"}'), "tool", "Bob"),
+    (response(content='{"choice": "Carol"}'), "json_schema", None),
+    (response(content="Bob"), "json_schema", None),
+    (response(content="Bob"), "tool", None),
+])
+def test_parse(resp, mode, expected):
+    assert choices.parse(resp, mode, ["Alice", "Bob"]) == expected
+
+def bad_request(message, code=None, param=None):
+    response = types.SimpleNamespace(status_code=400, headers={}, request=None)
+    return openai.BadRequestError(message, response=response, body={"message": message, "code": code, "param": param})
+
+@pytest.mark.parametrize("exc, expected", [
+    (bad_request("Invalid schema for response_format 'choose'", param="response_format"), True),
+    (bad_request("'tool_choice' is not supported with this model"), True),
+    (bad_request("This model does not support json_schema"), True),
+    (bad_request("This model's maximum context length is 8192 tokens", code="context_length_exceeded", param="messages"), False),
+    (bad_request("The response was filtered due to the prompt triggering content management policy", code="content_filter"), False),
+    (bad_request("Unsupported value: 'temperature'", code="unsupported_value", param="temperature"), False),
+])
+def test_only_structured_output_rejections_count(exc, expected):
+    assert choices.is_unsupported_error(exc) is expected
@@ -0,0 +1,104 @@
+"""Unit tests for context.py."""
+
+from .context import AIContext, Transcript, SUMMARY_PREFIX, estimate_tokens
+
+def test_messages_keep_system_prompt_and_fit_budget():
+    """Old messages are left out once the history exceeds the budget."""
+    context = AIContext("system prompt", budget=60)
+    for i in range(20):
+        context.append("user", f"message number {i}")
+
+    messages = context.messages()
+    assert messages[0] == {"role": "system", "content": "system prompt"}
+    assert messages[-1]["content"] == "message number 19"
+    assert sum(estimate_tokens(m["content"]) for m in messages) <= 60
+    assert len(messages) < 21
+
+def test_fold_replaces_oldest_messages_with_summary():
+    """Folding keeps the recent messages verbatim and sends the summary first."""
+    context = AIContext("system prompt", budget=100, keep_recent=2)
+    for i in range(10):
+        context.append("user", f"message number {i}")
+
+    old = context.foldable()
+    assert len(old) == 8
+    context.append("user", "arrived while summarising")
+    context.fold(len(old), "a summary")
+
+    messages = context.messages()
+    assert messages[1] == {"role": "user", "content": SUMMARY_PREFIX + "a summary"}
+    assert [m["content"] for m in messages[2:]] == ["message number 8", "message number 9", "arrived while summarising"]
+
+def test_nothing_to_fold_under_half_budget():
+    """Short histories are left alone."""
+    context = AIContext("system prompt", budget=10000)
+    context.append("user", "hello")
+    assert context.foldable() == []
+
+def test_shared_transcript_stores_each_broadcast_once():
+    """Contexts share one transcript and only keep indices into it."""
+    transcript = Transcript()
+    alice = AIContext("alice prompt", transcript=transcript, player="Alice")
+    bob = AIContext("bob prompt", transcript=transcript, player="Bob")
+
+    index = transcript.add("user", "Day 1 has begun.")
+    alice.see(index)
+    bob.see(index)
+    alice.append("assistant", "Hi all")
+
+    assert len(transcript) == 2
+    assert transcript[1].visibility == "private" and transcript[1].player == "Alice"
+    assert [m["content"] for m in alice.messages()] == ["alice prompt", "Day 1 has begun.", "Hi all"]
+    assert [m["content"] for m in bob.messages()] == ["bob prompt", "Day 1 has begun."]
+
+def test_server_state_covers_history_up_to_the_recorded_reply():
+    """Only messages after the adopted reply are new; a fold starts over."""
+    context = AIContext("system prompt")
+    context.append("user", "your turn")
+    context.state.replied("resp_1", None, len(context.history), "hello")
+    context.append("assistant", "hello")
+    context.append("user", "Alice: hi")
+    assert context.state.response_id == "resp_1"
+    assert context.new_messages() == [{"role": "user", "content": "Alice: hi"}]
+
+    # A reply overtaken by another message isn't adopted.
+    context.state.replied("resp_2", None, len(context.history), "hi both")
+    context.append("user", "Carol: hey")
+    context.append("assistant", "hi both")
+    assert context.state.response_id == "resp_1"
+
+    # Nor is one the server stored differently (with a tail, or unparsed).
+    context.state.replied("resp_3", None, len(context.history), None)
+    context.append("assistant", "Alice")
+    context.state.replied("resp_4", None, len(context.history), "I vote Alice")
+    context.append("assistant", "Alice")
+    assert context.state.response_id == "resp_1"
+
+    context.fold(2, "summary")
+    assert context.state.response_id is None
+
+def test_trimming_starts_a_new_server_state():
+    """The server's copy would keep the trimmed messages, so it's dropped."""
+    context = AIContext("system prompt", budget=200)
+    context.append("user", "your turn")
+    context.state.replied("resp_1", None, len(context.history), "hello")
+    context.append("assistant", "hello")
+    context.messages()
+    assert context.state.response_id == "resp_1"
+    for i in range(40):
+        context.append("user", f"message number {i}")
+    context.messages()
+    assert context.state.response_id is None and context.state.synced == 0
+
+def test_trimming_keeps_the_prefix_stable_between_turns():
+    """Once trimmed, the same messages stay left out for a while, so the prefix can be cached."""
+    context = AIContext("system prompt", budget=200)
+    for i in range(40):
+        context.append("user", f"message number {i}")
+    first = context.messages()[1]
+    for i in range(3):
+        context.append("user", f"later message {i}")
+        assert context.messages()[1] == first
+    tail = [{"role": "user", "content": "OPTIONS: a, b"}]
+    assert context.messages(tail)[-1] == tail[0]
+    assert context.messages(tail)[1] == first
@@ -0,0 +1,67 @@
+"""Unit tests for conversation.py, against the stand-in server."""
+
+import asyncio, types
+from aiohttp import web
+from openai import AsyncOpenAI
+from standin_server import StandinServer
+from .context import AIContext, estimate_tokens
+from .llm import LLMClient
+
+BUDGET = 300
+
+def play(monkeypatch, turns, forget_rate=0.0):
+    """Run `turns` speech turns of a stateful AI against a local stand-in server.
+
+    Returns the server, the client and the context, plus the token count of
+    the largest conversation the server held at any point.
+    """
+    monkeypatch.setattr("classes.conversation.MODELS", types.SimpleNamespace(get=lambda model: types.SimpleNamespace(options={"stateful": True})))
+    server = StandinServer(latency=0, jitter=0, forget_rate=forget_rate)
+    context = AIContext("You are playing Mafia.", budget=BUDGET, player="Alice")
+    largest = 0
+
+    async def run():
+        nonlocal largest
+        runner = web.AppRunner(server.app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = runner.addresses[0][:2]
+        llm = LLMClient(AsyncOpenAI(base_url=f"http://{host}:{port}/v1", api_key="standin", max_retries=0))
+        try:
+            for i in range(turns):
+                context.see(context.transcript.add("user", f"Bob: I think Carol did it, turn {i}."))
+                if i % 5 == 4:
+                    # A vote: the options go in a tail and only the choice is kept.
+                    tail = [{"role": "user", "content": "Available options:\n- Bob\n- Carol"}]
+                    context.append("user", "Who do you vote for?")
+                    await llm.create("standin", context.messages(tail), purpose="vote", conversation=context, tail=tail)
+                    context.append("assistant", "Carol")
+                else:
+                    response = await llm.create("standin", context.messages(), purpose="speech", conversation=context)
+                    context.append("assistant", response.choices[0].message.content)
+                # Building the next payload may trim, which drops the state.
+                messages = context.messages()
+                if context.state.response_id:
+                    held = server.conversations[context.state.response_id]
+                    largest = max(largest, sum(estimate_tokens(m["content"]) for m in held))
+                    # The server holds exactly what the history says it does.
+                    assert held + context.new_messages() == messages
+            return llm
+        finally:
+            await runner.cleanup()
+
+    llm = asyncio.run(run())
+    return server, llm, context, largest
+
+def test_server_conversation_stays_within_the_budget(monkeypatch):
+    server, llm, context, largest = play(monkeypatch, 60)
+    metrics = llm.metrics()["standin"]
+    assert metrics["delta_sends"] > metrics["full_sends"] > 1
+    assert largest <= BUDGET
+
+def test_lost_state_is_resent_in_full(monkeypatch):
+    server, llm, context, largest = play(monkeypatch, 30, forget_rate=0.3)
+    metrics = llm.metrics()["standin"]
+    assert metrics["lost_state"] > 0
+    assert largest <= BUDGET
@@ -0,0 +1,65 @@
+"""Unit tests for edits.py."""
+
+import asyncio, types
+import discord
+from .edits import MessageEditor
+
+class FakeMessage:
+    id = 1
+    content = "Votes: none"
+
+    def __init__(self):
+        self.edits = []
+
+    async def edit(self, **fields):
+        self.edits.append(fields)
+
+
+class DeletedMessage(FakeMessage):
+    async def edit(self, **fields):
+        await super().edit(**fields)
+        raise discord.NotFound(types.SimpleNamespace(status=404, reason="Not Found"), "Unknown Message")
+
+def test_burst_of_updates_becomes_two_edits_showing_the_latest_state():
+    async def run():
+        message = FakeMessage()
+        editor = MessageEditor(message, interval=0.05)
+        for n in range(10):
+            editor.update(content=f"Votes: {n}")
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.1)
+        return message.edits
+    assert asyncio.run(run()) == [{"content": "Votes: 0"}, {"content": "Votes: 9"}]
+
+def test_unchanged_content_is_not_sent_and_flush_is_immediate():
+    async def run():
+        message = FakeMessage()
+        editor = MessageEditor(message, interval=10)
+        await editor.flush(content="Votes: none")
+        await editor.flush(content="Votes: done", view=None)
+        return message.edits, editor.skipped
+    assert asyncio.run(run()) == ([{"content": "Votes: done", "view": None}], 1)
+
+def test_discard_drops_pending_edits_of_a_deleted_message():
+    async def run():
+        message = FakeMessage()
+        editor = MessageEditor(message, interval=0.05)
+        editor.update(content="Players: 1")
+        await asyncio.sleep(0)
+        editor.update(content="Players: 0")
+        editor.discard()
+        await asyncio.sleep(0.1)
+        editor.update(content="Players: 2")
+        await asyncio.sleep(0.1)
+        return message.edits
+    assert asyncio.run(run()) == [{"content": "Players: 1"}]
+
+def test_edit_of_a_message_deleted_elsewhere_stops_editing():
+    async def run():
+        message = DeletedMessage()
+        editor = MessageEditor(message, interval=0)
+        await editor.flush(content="Players: 1")
+        editor.update(content="Players: 2")
+        await asyncio.sleep(0.01)
+        return message.edits, editor.message
+    assert asyncio.run(run()) == ([{"content": "Players: 1"}], None)
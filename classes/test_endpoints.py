@@ -0,0 +1,20 @@
+"""Unit tests for endpoints.py."""
+
+from .endpoints import Endpoint, EndpointRouter, EVICT_FAILURES
+
+def test_failing_endpoint_is_evicted_and_skipped(monkeypatch):
+    good, bad = Endpoint("https://a/v1", "k"), Endpoint("https://b/v1", "k")
+    monkeypatch.setattr(EndpointRouter, "endpoints", lambda self, model: [good, bad])
+    router = EndpointRouter()
+
+    for _ in range(EVICT_FAILURES):
+        bad.record(False)
+    assert not bad.healthy
+    assert all(router.pick("m") is good for _ in range(20))
+
+def test_faster_endpoint_is_preferred():
+    fast, slow = Endpoint("https://a/v1", "k"), Endpoint("https://b/v1", "k")
+    for _ in range(20):
+        fast.record(True, 0.1)
+        slow.record(True, 2.0)
+    assert fast.score() > 5 * slow.score()
@@ -0,0 +1,68 @@
+"""Unit tests for llm.py."""
+
+import asyncio, types
+import openai, pytest
+from .llm import LLMClient, CircuitOpenError, CompletionTimeout, Deadline
+
+class FakeCompletions:
+    def __init__(self, failures, delay=0):
+        self.failures = failures
+        self.delay = delay
+        self.models = []
+
+    async def create(self, model, messages, **kwargs):
+        self.models.append(model)
+        await asyncio.sleep(self.delay)
+        if self.failures.get(model, 0):
+            self.failures[model] -= 1
+            raise openai.APIConnectionError(request=None)
+        return model
+
+def make_client(failures, delay=0):
+    completions = FakeCompletions(failures, delay)
+    fake = types.SimpleNamespace(chat=types.SimpleNamespace(completions=completions))
+    return LLMClient(fake), completions
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(LLMClient, "_backoff", staticmethod(lambda attempt, exc: 0))
+
+def test_transient_errors_are_retried():
+    """A couple of connection errors don't surface to the caller."""
+    llm, completions = make_client({"a": 2})
+    assert asyncio.run(llm.create("a", [])) == "a"
+    assert completions.models == ["a", "a", "a"]
+    assert llm.metrics()["a"]["retries"] == 2
+    assert llm.metrics()["a"]["breaker"] == "closed"
+
+def test_breaker_opens_and_rejects(monkeypatch):
+    """A model that keeps failing stops being called until the breaker resets."""
+    monkeypatch.setattr("classes.llm._setting", lambda key: {"retries": 0, "breaker_threshold": 2, "breaker_reset": 60, "call_timeout": 60}.get(key, 0))
+    llm, completions = make_client({"a": 10})
+    for _ in range(2):
+        with pytest.raises(openai.APIConnectionError):
+            asyncio.run(llm.create("a", []))
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(llm.create("a", []))
+    assert completions.models == ["a", "a"]
+    assert llm.metrics()["a"]["breaker"] == "open"
+
+def test_deadline_cancels_slow_calls():
+    """A call that outlives the phase deadline raises CompletionTimeout instead of hanging."""
+    llm, completions = make_client({}, delay=10)
+    with pytest.raises(CompletionTimeout):
+        asyncio.run(llm.create("a", [], deadline=Deadline(0.05)))
+    with pytest.raises(CompletionTimeout):
+        asyncio.run(llm.create("a", [], deadline=Deadline(0)))
+    assert completions.models == ["a"]
+    assert llm.metrics()["a"]["timeouts"] == 2
+
+def test_paused_deadline_keeps_its_time():
+    """Time spent inside paused() (a human's turn) isn't taken off the budget."""
+    deadline = Deadline(0.1)
+    async def run():
+        with deadline.paused():
+            await asyncio.sleep(0.2)
+    asyncio.run(run())
+    assert not deadline.expired
+    assert deadline.remaining() > 0.05
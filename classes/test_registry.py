@@ -0,0 +1,50 @@
+"""Unit tests for registry.py."""
+
+import json, os
+from .registry import ModelRegistry
+
+def write_models(path, models, analyser="small-model"):
+    with open(path, "w") as f:
+        json.dump({"avatar_template": "https://example.com/{}.png", "models": models, "discussion_analyser": analyser}, f)
+
+def test_registry_parses_models(tmp_path):
+    """Avatar URLs are formatted once and models can be looked up by ID."""
+    path = tmp_path / "models.json"
+    write_models(path, [
+        {"model": "a", "name": "Model A", "avatar": "a", "emoji": "<:a:1>"},
+        {"model": "b", "name": "Model B", "avatar_url": "b", "analyser": "other"},
+    ])
+    registry = ModelRegistry(str(path))
+
+    assert [m.model for m in registry.all()] == ["a", "b"]
+    assert registry.get("a").avatar_url == "https://example.com/a.png"
+    assert registry.get("a").analyser == "small-model"
+    assert registry.get("b").analyser == "other"
+    assert registry.get("missing") is None
+    assert registry.get_analyser() == "small-model"
+
+def test_registry_reloads_on_mtime_change(tmp_path, monkeypatch):
+    """Editing models.json is picked up without restarting."""
+    monkeypatch.setattr("classes.registry.RELOAD_CHECK_INTERVAL", 0)
+    path = tmp_path / "models.json"
+    write_models(path, [{"model": "a", "name": "Model A"}])
+    registry = ModelRegistry(str(path))
+    assert [m.model for m in registry.all()] == ["a"]
+
+    write_models(path, [{"model": "a", "name": "Model A"}, {"model": "b", "name": "Model B"}])
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    assert [m.model for m in registry.all()] == ["a", "b"]
+
+def test_registry_keeps_models_on_bad_reload(tmp_path, monkeypatch):
+    """A broken edit doesn't wipe out the models already loaded."""
+    monkeypatch.setattr("classes.registry.RELOAD_CHECK_INTERVAL", 0)
+    path = tmp_path / "models.json"
+    write_models(path, [{"model": "a", "name": "Model A"}])
+    registry = ModelRegistry(str(path))
+    registry.all()
+
+    path.write_text("{not json")
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    assert [m.model for m in registry.all()] == ["a"]
@@ -1,7 +1,14 @@
 """Unit tests for turnmanager.py using pytest parametrization."""
 
-import pytest
-from .turnmanager import extract_choice
+import asyncio, types
+import openai, pytest
+import data
+from .player import Player, create_ai_players
+from .roles import TOWN
+from . import choices
+from .llm import Deadline
+from .turnmanager import extract_choice, ThinkStripper, TurnManager
+from .waiting import PendingInputs
 
 # Constants for test data options to avoid repetition
 FACTION_OPTIONS = ["Abstain", "Town", "Mafia"]
@@ -58,3 +65,179 @@ def test_extract_choice_no_match(input_text, options):
     can be found in the provided input text.
     """
     assert extract_choice(input_text, options) is None
+
+@pytest.mark.parametrize("raw", [
+    "Plain speech.",
+    "<think>reasoning</think>  I suspect Kimi.",
+    "<THINK>a</Think>Visible<think>b</think> text",
+    "Before <think>never closed",
+    "Less than < sign and <thin tag",
+    "  <think></think>\n",
+])
+@pytest.mark.parametrize("size", [1, 3, 7, 1000])
+def test_think_stripper_matches_clean_ai_content(raw, size):
+    """Streaming the text in chunks gives the same result as cleaning it whole."""
+    stripper = ThinkStripper()
+    for i in range(0, len(raw), size):
+        stripper.feed(raw[i:i + size])
+    assert stripper.finish() == TurnManager._clean_ai_content(None, raw)
+
+
+class FakeLLM:
+    """Answers every speech request with a numbered reply."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        n = self.calls
+        await asyncio.sleep(0)
+        message = types.SimpleNamespace(content=f"speech {n}", tool_calls=None)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)], usage=types.SimpleNamespace(total_tokens=10))
+
+
+@pytest.fixture
+def turns(tmp_path, monkeypatch):
+    monkeypatch.setattr(data, "store", data.ConfigStore(data.JSONBackend(str(tmp_path / "data.json"))))
+    players = create_ai_players()[:3]
+    for p in players:
+        p.role = TOWN
+    manager = TurnManager(players, types.SimpleNamespace(id=1), types.SimpleNamespace(), None)
+    manager.llm = FakeLLM()
+    manager.speculative = True
+    return manager, players
+
+
+def test_speculation_hit_uses_the_speech_generated_ahead(turns):
+    manager, (first, *_) = turns
+    async def run():
+        manager._start_speculation(first)
+        await asyncio.sleep(0.01)
+        return await manager._speech_for(first)
+    assert asyncio.run(run()) == ("speech 1", None)
+    assert manager.llm.calls == 1
+    assert manager.speculation_stats["hits"] == 1 and manager.speculation_stats["misses"] == 0
+
+
+def test_speculation_misses_when_the_context_changed(turns):
+    manager, (first, second, _) = turns
+    async def run():
+        manager._start_speculation(first)
+        await asyncio.sleep(0.01)
+        manager.broadcast(f"{second.name}: I suspect {first.name}.", second)
+        return await manager._speech_for(first)
+    assert asyncio.run(run()) == ("speech 2", None)
+    assert manager.speculation_stats == {"hits": 0, "misses": 1, "wasted_tokens": 10, "saved_s": 0.0}
+
+
+def test_speculation_for_another_player_is_discarded(turns):
+    manager, (first, second, _) = turns
+    async def run():
+        manager._start_speculation(first)
+        await asyncio.sleep(0.01)
+        text = await manager._speech_for(second)
+        await asyncio.sleep(0.01)
+        return text
+    assert asyncio.run(run()) == ("speech 2", None)
+    assert manager.speculation is None
+    assert manager.speculation_stats["misses"] == 1 and manager.speculation_stats["wasted_tokens"] == 10
+    assert manager.speculation_report() == "0/1 hits (0%), 10 wasted tokens, ~0.0s of generation overlapped"
+
+
+class PollMessage:
+    id = 1
+    content = ""
+
+    async def edit(self, **fields):
+        pass
+
+
+def with_poll_channel(manager):
+    async def send(content=None, **kwargs):
+        return PollMessage()
+    manager.channel = types.SimpleNamespace(id=1, send=send)
+
+
+def vote_history(manager, player):
+    context = manager._context_for(player.user)
+    return [context.transcript[i].content for i in context.history if context.transcript[i].visibility == "private"]
+
+
+def test_vote_keeps_the_full_human_window_after_a_slow_phase(turns, monkeypatch):
+    """An AI deadline used up by an earlier human turn doesn't shorten the poll."""
+    manager, players = turns
+    with_poll_channel(manager)
+    windows = []
+    async def wait(self, timeout):
+        windows.append(timeout)
+        return True
+    monkeypatch.setattr(PendingInputs, "wait", wait)
+    monkeypatch.setattr(manager, "start_summarising", lambda: None)
+    asyncio.run(manager.run_vote(players, "Vote!", timeout_s=120.0, break_ties_random=True, deadline=Deadline(0)))
+    assert windows == [120.0]
+
+
+def test_prepared_votes_are_recorded_once(turns, monkeypatch):
+    """An early vote that is used adds its question and answer once."""
+    manager, players = turns
+    with_poll_channel(manager)
+    monkeypatch.setattr(manager, "start_summarising", lambda: None)
+    manager.speculative_votes = True
+    deadline = Deadline(5)
+    async def run():
+        manager.prepare_vote(players, "Day 1: Vote.", deadline=deadline)
+        await asyncio.sleep(0.01)
+        return await manager.run_vote(players, "Day 1: Vote.", timeout_s=5, break_ties_random=True, deadline=deadline)
+    asyncio.run(run())
+    assert manager.llm.calls == 3
+    for player in players:
+        question, answer = vote_history(manager, player)
+        assert question == "Day 1: Vote." and answer in [p.name for p in players]
+
+
+def test_discarded_prepared_votes_leave_no_trace(turns, monkeypatch):
+    """Votes prepared for a different question are dropped without touching the contexts."""
+    manager, players = turns
+    with_poll_channel(manager)
+    monkeypatch.setattr(manager, "start_summarising", lambda: None)
+    manager.speculative_votes = True
+    async def run():
+        manager.prepare_vote(players, "Day 1: Vote.")
+        await asyncio.sleep(0.01)
+        return await manager.run_vote(players, "Day 1: Vote again.", timeout_s=5, break_ties_random=True)
+    asyncio.run(run())
+    assert manager.llm.calls == 6
+    for player in players:
+        question, _ = vote_history(manager, player)
+        assert question == "Day 1: Vote again."
+
+
+def test_humans_are_still_drawn_from_unsung_with_speculation_on(turns):
+    """The early draw covers humans too; it just doesn't speculate for them."""
+    manager, (current, *ais) = turns
+    human = Player(types.SimpleNamespace(name="Hugh", id=5))
+    human.role = TOWN
+    manager.participants.append(human)
+    picks = []
+    for _ in range(300):
+        predicted = manager._predict_next_speaker(current, {current}, {}, [])
+        picks.append(manager.drawn_speaker)
+        assert predicted is (None if manager.drawn_speaker is human else manager.drawn_speaker)
+    assert set(picks) == {human, *ais}
+    assert 60 < picks.count(human) < 140
+
+
+def test_context_length_error_keeps_structured_output(turns, monkeypatch):
+    """Only a rejection of the structured request itself turns it off for the model."""
+    manager, (player, *_) = turns
+    monkeypatch.setattr("classes.choices.MODELS", types.SimpleNamespace(get=lambda model: types.SimpleNamespace(options={"structured": "json_schema"})))
+    response = types.SimpleNamespace(status_code=400, headers={}, request=None)
+    class TooLong:
+        async def create(self, **kwargs):
+            raise openai.BadRequestError("maximum context length exceeded", response=response, body={"code": "context_length_exceeded", "param": "messages"})
+    manager.llm = TooLong()
+    context = manager._context_for(player.user)
+    with pytest.raises(openai.BadRequestError):
+        asyncio.run(manager._choose("standin", context, ["Alice", "Bob"], None, "vote", "OPTIONS:\nAlice\nBob"))
+    assert choices.structured_mode("standin") == "json_schema"
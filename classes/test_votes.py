@@ -0,0 +1,39 @@
+"""Unit tests for votes.py."""
+
+from .votes import VoteLedger, ABSTAIN, NO_VOTES
+
+NAMES = {1: "Ann", 2: "Ben", 3: "Cy", "ai": "Dee"}
+
+def test_changing_votes_keeps_tally_and_leader_in_step():
+    ledger = VoteLedger(["Alice", "Bob"], NAMES, allow_abstain=True)
+    assert ledger.tally() == NO_VOTES
+    assert ledger.cast(1, "Bob") and ledger.cast("ai", "Alice") and ledger.cast(2, "Bob")
+    assert ledger.leader() == "Bob" and ledger.top == 2
+    assert ledger.tally() == "- Alice: Dee (1)\n- Bob: Ann, Ben (2)"
+    assert not ledger.cast(2, "Bob")
+    assert not ledger.cast(2, "Carol")
+    ledger.cast(2, ABSTAIN)
+    assert ledger.is_tie() and ledger.leader() is None and ledger.top == 1
+    assert ledger.abstain_wins()
+    assert ledger.tally() == "- Alice: Dee (1)\n- Bob: Ann (1)\n- Abstain: Ben (1)"
+    ledger.cast(1, "Alice")
+    assert ledger.leader() == "Alice" and not ledger.abstain_wins()
+    assert ledger.tally() == "- Alice: Ann, Dee (2)\n- Abstain: Ben (1)"
+    assert 1 in ledger and 3 not in ledger and len(ledger) == 3
+
+def test_majority():
+    ledger = VoteLedger(["Alice", "Bob"], NAMES)
+    ledger.cast(1, "Alice")
+    ledger.cast(2, "Alice")
+    assert ledger.majority_reached(2) and not ledger.majority_reached(3)
+    assert not ledger.abstain_wins()
+
+def test_players_sharing_a_name_are_counted_separately():
+    ledger = VoteLedger(["Alice", "Bob"], {1: "Llama", 2: "Llama", 3: "Cy"})
+    ledger.cast(1, "Alice")
+    ledger.cast(2, "Alice")
+    assert ledger.counts["Alice"] == 2
+    assert ledger.tally() == "- Alice: Llama, Llama (2)"
+    ledger.cast(1, "Bob")
+    assert ledger.tally() == "- Alice: Llama (1)\n- Bob: Llama (1)"
+    assert ledger.voters["Alice"] == {2} and ledger.voters["Bob"] == {1}
@@ -0,0 +1,25 @@
+"""Unit tests for waiting.py."""
+
+import asyncio, time
+from .waiting import PendingInputs
+
+def test_wait_ends_as_soon_as_the_last_user_responds():
+    async def run():
+        inputs = PendingInputs({1, 2})
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.01, inputs.mark, 1)
+        loop.call_later(0.02, inputs.skip, 2)
+        started = time.monotonic()
+        assert await inputs.wait(5)
+        return time.monotonic() - started, inputs.received
+    elapsed, received = asyncio.run(run())
+    assert elapsed < 0.5
+    assert received == {1}
+
+def test_wait_times_out_with_users_still_pending():
+    async def run():
+        inputs = PendingInputs({1, 2})
+        inputs.mark(1)
+        return await inputs.wait(0.01), inputs.pending
+    assert asyncio.run(run()) == (False, {2})
+    assert asyncio.run(PendingInputs().wait(0))
@@ -3,22 +3,57 @@
 This module contains TurnManager, the central type for advancing the
 state of the game.  It orchestrates:
 
-- **Discussion rounds**: speaker ordering with an LLM-driven priority queue
-  that analyses each message to decide who should respond next.
+- **Discussion rounds**: speaker ordering with a priority queue that
+  analyses each message to decide who should respond next, locally where
+  the message is unambiguous and with an LLM otherwise.
 - **Voting**: parallel AI + human voting via Discord select menus, with
   timeouts and automatic failure tracking (modkill after two failures).
-- **AI context**: maintains per-AI-player chat history and sends completions
-  via the OpenAI SDK.
+- **AI context**: maintains per-AI-player chat history (see AIContext) and
+  sends completions via the OpenAI SDK.  Older history is summarised in
+  the background while votes are open.
 - **Human turns**: grants and revokes Discord send-message permissions to
   enforce turn-taking for human players equivalent to AI players.
+- **Streaming** (opt-in via 'stream_speech' in models.json, or 'stream'
+  per model): AI speech is posted as soon as the first visible tokens
+  arrive and edited as the rest streams in.
+- **Speculation** (opt-in via 'speculative_turns' in models.json): while
+  the analyser works out who speaks next, the likely next AI speaker's
+  reply is generated ahead of time and used only if its context hasn't
+  changed.  When the next speaker would be drawn at random, the draw
+  (from everyone, humans included) is made early and kept, so the odds
+  of being picked are the same as without speculation.
+  With 'speculative_votes', the AI votes likewise start as soon as the
+  discussion's last speech is heard, before the poll is posted.
 """
 
 from classes.player import Player, AIAbstraction
-import discord, random, asyncio, logging, data, json, re
+from classes.registry import MODELS
+from classes.context import AIContext, Transcript, context_budget
+from classes.analyser import LocalMentionAnalyser, PRIORITIES
+from classes.llm import LLM, LLMClient, CompletionTimeout, Deadline
+from classes.admission import SPEECH, ACTION, BACKGROUND
+from classes import choices
+from classes.waiting import PendingInputs
+from classes.votes import VoteLedger, ABSTAIN
+import discord, random, asyncio, contextlib, logging, data, re, time, openai
 from openai import AsyncOpenAI
 
 logger = logging.getLogger(__name__)
 
+# Valid values of 'mention_analyser' in models.json:
+#   local  - only the local analyser, never the LLM
+#   llm    - only the discussion analyser LLM
+#   hybrid - the local analyser, escalating unclear messages to the LLM
+MENTION_ANALYSER_MODES = ("local", "llm", "hybrid")
+
+# Fraction of confident local analyses that are also sent to the LLM in
+# the background (hybrid mode) to measure how often the two agree.
+DEFAULT_SHADOW_RATE = 0.1
+
+# Minimum seconds between edits of a streaming speech message.  Webhooks
+# allow about 5 requests per 2 seconds, shared by every message they send.
+STREAM_EDIT_INTERVAL = 1.5
+
 # --== Helper functions ==--
 
 def extract_choice(content: str, options: list[str]) -> str | None:
@@ -62,6 +97,104 @@ def extract_choice(content: str, options: list[str]) -> str | None:
 			best_start = idx
 	return best
 
+class ThinkStripper:
+	"""Incrementally strips <think>...</think> blocks from streamed text.
+
+	Gives the same result as TurnManager._clean_ai_content on the whole
+	text, but chunk by chunk: a tag split across chunks is held back until
+	it can be told apart from ordinary text, and an unclosed <think> hides
+	everything after it.
+
+	Attributes:
+		text: The visible text so far (not yet whitespace-trimmed).
+	"""
+	OPEN = "<think>"
+	CLOSE = "</think>"
+
+	def __init__(self):
+		self.text = ""
+		self._buffer = ""
+		self._thinking = False
+
+	@staticmethod
+	def _partial_tag(buffer: str, tag: str) -> int:
+		"""Return the length of the longest suffix of buffer that starts tag."""
+		lowered = buffer[-len(tag):].lower()
+		for size in range(min(len(lowered), len(tag) - 1), 0, -1):
+			if tag.startswith(lowered[-size:]):
+				return size
+		return 0
+
+	def feed(self, chunk: str) -> str:
+		"""Add a chunk of raw text and return the newly visible part."""
+		self._buffer += chunk
+		visible = ""
+		while self._buffer:
+			tag = self.CLOSE if self._thinking else self.OPEN
+			index = self._buffer.lower().find(tag)
+			if index != -1:
+				if not self._thinking:
+					visible += self._buffer[:index]
+				self._buffer = self._buffer[index + len(tag):]
+				self._thinking = not self._thinking
+				continue
+
+			keep = self._partial_tag(self._buffer, tag)
+			if not self._thinking:
+				visible += self._buffer[:len(self._buffer) - keep]
+			self._buffer = self._buffer[len(self._buffer) - keep:]
+			break
+
+		self.text += visible
+		return visible
+
+	def finish(self) -> str:
+		"""Flush any held-back text and return the final cleaned text."""
+		if not self._thinking:
+			self.text += self._buffer
+		self._buffer = ""
+		return self.text.strip()
+
+class Speculation:
+	"""A speech completion started before its player was picked to speak.
+
+	Attributes:
+		player: The AI player the speech is for.
+		version: The player's AIContext.version when it was started.
+		task: Task resolving to (text, total_tokens).
+		started: time.monotonic() when it was started.
+	"""
+
+	def __init__(self, player: Player, version: int, task: asyncio.Task, started: float):
+		self.player = player
+		self.version = version
+		self.task = task
+		self.started = started
+
+class PreparedVote:
+	"""AI vote completions, started before their poll was posted.
+
+	Attributes:
+		message: The vote question.
+		options: The option names offered, 'Abstain' last if allowed.
+		voters: The AI players voting.
+		tasks: One task per voter, resolving to (player, choice).
+		started: time.monotonic() when they were started.
+		landed: time.monotonic() when each voter's choice came back.
+	"""
+
+	def __init__(self, message: str, options: list[str], voters: list[Player]):
+		self.message = message
+		self.options = options
+		self.voters = voters
+		self.tasks: list[asyncio.Task] = []
+		self.started = time.monotonic()
+		self.landed: dict[Player, float] = {}
+
+	def cancel(self):
+		for task in self.tasks:
+			task.cancel()
+
 # --== TurnManager ==--
 
 class TurnManager:
@@ -73,9 +206,11 @@ class TurnManager:
 	set_channel() and set_participants().
 
 	Key state:
-		context: Per-AI-player OpenAI message history (system prompt +
-			conversation).  Keyed by AIAbstraction instance, values are
-			lists of message dicts.
+		transcript: Shared, append-only log of everything the AI players
+			have heard or said, tagged with its visibility.
+		context: Per-AI-player view of the transcript (system prompt,
+			summary of older events, indices of recent entries).  Keyed by
+			AIAbstraction instance, values are AIContext instances.
 		player_failures: Failure count per player.  Two failures = modkill.
 		webhook: If configured, AI messages are sent via webhook (allowing
 			custom name/avatar).  Otherwise they fall back to plain bold text.
@@ -102,11 +237,11 @@ class TurnManager:
 		content = re.sub(r'<think>.*?(?:</think>|$)', '', content, flags=re.DOTALL | re.IGNORECASE)
 		return content.strip()
 
-	def __init__(self, participants: list[Player], channel: discord.TextChannel | discord.Thread, bot: discord.Client, client: AsyncOpenAI | None = None):
+	def __init__(self, participants: list[Player], channel: discord.TextChannel | discord.Thread, bot: discord.Client, client: LLMClient | AsyncOpenAI | None = None):
 		"""Initialize the turn manager for a new game.
 
-		Loads the channel's webhook URL from data.json (if configured during
-		/setup) and builds initial AI context (system prompts) for every AI
+		Looks up the channel's webhook URL in the config store (if configured
+		during /setup) and builds initial AI context (system prompts) for every AI
 		participant.
 
 		Args:
@@ -114,25 +249,23 @@ class TurnManager:
 			channel: The Discord channel to send messages in.
 			bot: The Discord bot client, used for webhook construction and
 				channel permission management.
-			client: OpenAI-compatible async client.  Defaults to a new
-				AsyncOpenAI() instance using OPENAI_API_KEY / OPENAI_BASE_URL
-				from the environment.
+			client: LLMClient to send completions through, or an
+				OpenAI-compatible async client to wrap in one.  Defaults to
+				the shared LLM client, which uses OPENAI_API_KEY /
+				OPENAI_BASE_URL from the environment.
 
 		Side effects:
-			Reads data.json (via data.load()) to look up the webhook URL.
-			Reads models.json to get the discussion_analyser model name.
+			Looks up the discussion_analyser model name in the model registry.
 		"""
 		self.participants = participants
 		self.channel: discord.TextChannel | discord.Thread = channel
-		self.client = client or AsyncOpenAI()
-		config = data.load()
+		if isinstance(client, LLMClient):
+			self.llm = client
+		else:
+			self.llm = LLMClient(client) if client else LLM
 		self.bot = bot
 
-		webhook_url = None
-		try:
-			webhook_url = config["profiles"][str(self.channel.id)]["webhook"]
-		except Exception:
-			webhook_url = None
+		webhook_url = data.get_profile(self.channel.id).get("webhook")
 
 		self.webhook: discord.Webhook | None = None
 		if webhook_url:
@@ -140,13 +273,34 @@ class TurnManager:
 
 		self.running = False
 		self.message_queue = asyncio.Queue()
+		self.round_timings: dict[str, float] = {}
+		self.speculative = bool(MODELS.settings.get("speculative_turns", False))
+		self.speculation: Speculation | None = None
+		# The random draw for the next speaker, made early so speculation
+		# knows who it will be.  Used only if the draw is still random then.
+		self.drawn_speaker: Player | None = None
+		self.speculation_stats = {"hits": 0, "misses": 0, "wasted_tokens": 0, "saved_s": 0.0}
+		self.speculative_votes = bool(MODELS.settings.get("speculative_votes", False))
+		self.prepared_vote: PreparedVote | None = None
 		self.required_author = -1
 		self.last_speaker = None
-		self.context: dict[AIAbstraction, list] = self._initialize_ai_context(participants)
+		self.transcript = Transcript()
+		self.context: dict[AIAbstraction, AIContext] = self._initialize_ai_context(participants)
 		self.player_failures: dict[discord.Member | AIAbstraction, int] = {}
+		self._summary_task: asyncio.Task | None = None
+
+		self.DISCUSSION_ANALYSER = MODELS.get_analyser()
+		self.SUMMARISER = MODELS.settings.get("summariser") or self.DISCUSSION_ANALYSER
 
-		with open("models.json") as f:
-			self.DISCUSSION_ANALYSER = json.load(f)["discussion_analyser"]
+		self.mention_analyser = MODELS.settings.get("mention_analyser", "llm")
+		if self.mention_analyser not in MENTION_ANALYSER_MODES:
+			logger.warning("Unknown mention_analyser %r in models.json, using 'llm'", self.mention_analyser)
+			self.mention_analyser = "llm"
+		self.shadow_rate = float(MODELS.settings.get("mention_analyser_shadow", DEFAULT_SHADOW_RATE))
+		self.local_analyser = LocalMentionAnalyser()
+		self.analyser_stats = {"local": 0, "escalated": 0, "llm_calls": 0, "llm_s": 0.0, "shadowed": 0, "agreed": 0}
+		self._shadow_tasks: set[asyncio.Task] = set()
+		self.stream_speech = bool(MODELS.settings.get("stream_speech", False))
 
 	async def handle_player_failure(self, player: Player, message: discord.Message | None = None):
 		"""Record a player's failure to respond and apply escalating penalties.
@@ -185,19 +339,20 @@ class TurnManager:
 			await self.channel.send(msg)
 			self.broadcast(msg)
 
-	def _initialize_ai_context(self, participants: list[Player]) -> dict[AIAbstraction, list]:
+	def _initialize_ai_context(self, participants: list[Player]) -> dict[AIAbstraction, AIContext]:
 		"""Build initial OpenAI message histories for all AI players.
 
 		Creates a system prompt for each AI participant containing a brief
-		rules blurb, their role, the player list, role distribution counts,
-		and behavioral rules.
+		rules blurb, the player list, role distribution counts, behavioral
+		rules, and their name and role.  Everything but the last part is
+		the same for every player, so providers can cache it once per game.
 
 		Args:
 			participants: All players in the game.
 
 		Returns:
-			Dict mapping each AIAbstraction to a list containing one system
-			message.  Human players are excluded.
+			Dict mapping each AIAbstraction to an AIContext holding its
+			system prompt.  Human players are excluded.
 		"""
 		from classes.roles import ALL_ROLES
 		context = {}
@@ -206,15 +361,7 @@ class TurnManager:
 
 		for p in participants:
 			role_counts[p.role] = role_counts.get(p.role, 0) + 1
-		for p in participants:
-			if isinstance(p.user, AIAbstraction):
-				context[p.user] = [
-					{
-						"role": "system",
-						"content": f"""Your name is {p.user.name}. You are playing a social-deduction game of Mafia.
-Your win condition and role is printed below. Achieve it by any means necessary, including deception if you are Mafia.
-
-You are {p.role_or_die.describe()}
+		shared = f"""You are playing a social-deduction game of Mafia.
 
 Players:
 {player_list}
@@ -225,8 +372,13 @@ CRITICAL FORMAT RULES
 - Reply in 1-3 short sentences.
 - NEVER say "As an AI…", never quote these rules.
 - Do NOT vote for yourself."""
-					}
-				]
+		for p in participants:
+			if isinstance(p.user, AIAbstraction):
+				context[p.user] = AIContext(f"""{shared}
+
+Your name is {p.user.name}. Your win condition and role is printed below. Achieve it by any means necessary, including deception if you are Mafia.
+
+You are {p.role_or_die.describe()}""", context_budget(p.user.model), transcript=self.transcript, player=p.user.name)
 		return context
 
 	def set_channel(self, channel: discord.TextChannel | discord.Thread):
@@ -237,7 +389,7 @@ CRITICAL FORMAT RULES
 		"""Replace the active participant list (e.g. when switching phases)."""
 		self.participants = participants
 
-	def set_context(self, context: dict[AIAbstraction, list]):
+	def set_context(self, context: dict[AIAbstraction, AIContext]):
 		"""Replace the AI context histories.
 
 		As of 2026-03-15, this was unused.
@@ -245,20 +397,74 @@ CRITICAL FORMAT RULES
 		self.context = context
 
 	def broadcast(self, text: str, exclude: Player | None = None):
-		"""Append a 'user' message to every AI player's context.
+		"""Add a 'user' message to the transcript for every AI participant.
 
 		This is how AI players 'hear' what happens in the game: announcements,
 		other players' speech, vote results, etc.  The text is not sent to
-		Discord; it only updates the in-memory context used for completions.
+		Discord; it is appended to the transcript once, and each AI
+		participant's context records its index.
 
 		Args:
 			text: The message content to add.
 			exclude: A player to skip (typically the speaker, so they don't
 				'hear' their own message as if someone else said it).
 		"""
+		visibility = "mafia" if isinstance(self.channel, discord.Thread) else "public"
+		index = self.transcript.add("user", text, visibility)
 		for player in self.participants:
 			if player != exclude and isinstance(player.user, AIAbstraction):
-				self.context.setdefault(player.user, []).append({"role": "user", "content": text})
+				self._context_for(player.user).see(index)
+
+	def _context_for(self, user: AIAbstraction) -> AIContext:
+		"""Return an AI's context, creating an empty one if it has none."""
+		context = self.context.get(user)
+		if context is None:
+			context = self.context[user] = AIContext("", context_budget(user.model), transcript=self.transcript, player=user.name)
+		return context
+
+	def start_summarising(self):
+		"""Fold older history into each AI's summary, in the background.
+
+		Called while a vote is open, so the summarisation calls overlap
+		with waiting for votes instead of delaying a turn.  Does nothing
+		if a previous round of summaries is still running.
+		"""
+		if self._summary_task and not self._summary_task.done():
+			return
+		self._summary_task = asyncio.create_task(self._summarise_all())
+
+	async def _summarise_all(self):
+		tasks = [self._summarise(user, ctx) for user, ctx in self.context.items() if ctx.foldable()]
+		if tasks:
+			await asyncio.gather(*tasks)
+
+	async def _summarise(self, user: AIAbstraction, context: AIContext):
+		"""Summarise an AI's oldest messages with the cheap summariser model."""
+		old = context.foldable()
+		if not old:
+			return
+
+		context.summarising = True
+		try:
+			events = "\n".join(f"{'You' if m['role'] == 'assistant' else 'Game'}: {m['content']}" for m in old)
+			response = await self.llm.create(
+				model=self.SUMMARISER,
+				priority=BACKGROUND,
+				channel=self.channel.id,
+				purpose="summary",
+				messages=[
+					{"role": "system", "content": f"You summarise a game of Mafia from the point of view of the player {user.name}. Keep every role claim, accusation, vote, death and night result, and what {user.name} said. Reply with the summary only, in under 200 words."},
+					{"role": "user", "content": (f"Previous summary:\n{context.summary}\n\n" if context.summary else "") + f"New events:\n{events}"}
+				]
+			)
+			summary = (response.choices[0].message.content or "").strip()
+			if summary:
+				context.fold(len(old), summary)
+				logger.debug("Summarised %i messages for %s", len(old), user.name)
+		except Exception as exc:
+			logger.warning("Summarising context for %s with %s failed: %s", user.name, self.SUMMARISER, exc)
+		finally:
+			context.summarising = False
 
 	def get_context(self):
 		"""Return the full AI context dict.
@@ -303,41 +509,7 @@ CRITICAL FORMAT RULES
 
 		return None
 
-	def _format_vote_details(self, votes: dict[int, str], candidates: list[Player], voter_names: dict[int, str], allow_abstain: bool = False) -> str:
-		"""Format the current vote tally as a natural language string.
-
-		Args:
-			votes: Mapping of voter ID (user ID or name hash) to chosen name.
-			candidates: The players being voted on.
-			voter_names: Mapping of voter ID to display name.
-			allow_abstain: If True, includes 'Abstain' votes in the output.
-
-		Returns:
-			A newline-separated string like
-			'- PlayerName: Voter1, Voter2 (2)', or 'No votes yet.'
-			if no votes have been cast.
-		"""
-		from collections import defaultdict
-		vote_details = defaultdict(list)
-		for vid, choice in votes.items():
-			voter_name = voter_names.get(vid, "Unknown")
-			vote_details[choice].append(voter_name)
-
-		lines = []
-		for c in candidates:
-			voters = vote_details.get(c.name, [])
-			if voters:
-				lines.append(f"- {c.name}: {', '.join(sorted(voters))} ({len(voters)})")
-
-		if allow_abstain and "Abstain" in vote_details:
-			voters = vote_details["Abstain"]
-			lines.append(f"- Abstain: {', '.join(sorted(voters))} ({len(voters)})")
-
-		if not lines:
-			return "No votes yet."
-		return "\n".join(lines)
-
-	async def run_round(self, analyse=False, rounds=None):
+	async def run_round(self, analyse=False, rounds=None, deadline: Deadline | None = None, on_last_speech=None):
 		"""Run a discussion round where players take turns speaking.
 
 		This is the core discussion loop, used for both day discussion (with
@@ -362,6 +534,12 @@ CRITICAL FORMAT RULES
 				If False, use simple round-robin (mafia night chat).
 			rounds: Number of speaking turns.  Defaults to
 				int(alive_participants * 1.5).
+			deadline: The phase's Deadline.  AI calls get whatever time is
+				left, and no new turns start once it has run out.  Human
+				turns don't count against it.
+			on_last_speech: Called with no arguments as soon as the final
+				turn's speech has been broadcast, before it's posted and
+				analysed (e.g. to start the next vote early).
 
 		Side effects:
 			Sends messages to Discord (speech, turn prompts).
@@ -383,9 +561,15 @@ CRITICAL FORMAT RULES
 			random.shuffle(self.participants)
 
 		self.running = True
+		self.round_timings = {}
+		round_start = time.monotonic()
 		_ = 0
 		while _ < rounds:
+			if deadline and deadline.expired:
+				logger.info("The %s phase ran out of time after %i turns", deadline.phase, _)
+				break
 			text = ""
+			analysis_task: asyncio.Task | None = None
 			if not analyse:
 				alive_participants = [p for p in self.participants if p.alive]
 				if not alive_participants:
@@ -424,14 +608,19 @@ CRITICAL FORMAT RULES
 						speaker_queue = [(p, pr, ad) for p, pr, ad, ef in processed_queue]
 						player = urgent_speaker[0]
 
+				# When the choice is random, use the draw made early for
+				# speculation, if it was made from the same players.
+				drawn, self.drawn_speaker = self.drawn_speaker, None
 				if not urgent_speaker:
 					if unsung:
-						player = random.choice(unsung)
+						player = drawn if drawn in unsung else random.choice(unsung)
 					else:
 						if alive_participants:
 							# Pick whoever has spoken the least, with a bit of randomness among ties
 							alive_participants.sort(key=lambda p: (speech_counts.get(p, 0), random.random()))
 							player = alive_participants[0]
+							if drawn in alive_participants and speech_counts.get(drawn, 0) == speech_counts.get(player, 0):
+								player = drawn
 						else:
 							break
 
@@ -459,7 +648,8 @@ CRITICAL FORMAT RULES
 
 				self.required_author = player.user.id
 				try:
-					msg = await asyncio.wait_for(self.message_queue.get(), timeout=180.0)
+					with deadline.paused() if deadline else contextlib.nullcontext():
+						msg = await asyncio.wait_for(self.message_queue.get(), timeout=180.0)
 					text = msg.content or ""
 					self.player_failures[player.user] = 0
 				except asyncio.TimeoutError:
@@ -500,23 +690,33 @@ CRITICAL FORMAT RULES
 					)
 
 				self.broadcast(f"{player.name}: {text}", player)
+				if on_last_speech and _ + 1 >= rounds:
+					on_last_speech()
+				# Speculating while the human was still typing would be
+				# wasted: their message changes every AI's context.  Start
+				# now instead, overlapping the analysis below.
+				if analyse:
+					self._start_speculation(self._predict_next_speaker(player, spoken | {player}, speech_counts, speaker_queue), deadline)
 			elif isinstance(player.user, AIAbstraction):
-				status_msg = await self.channel.send(f"It's {player.user.name}'s turn to speak!")
-				messages = self.context.setdefault(player.user, [])
-				text = ""
+				# Pipeline: the completion starts alongside the status message,
+				# and the speech is posted while the analyser runs.
+				turn_start = time.monotonic()
+				timings: dict[str, float] = {}
+				status_task = asyncio.create_task(self._timed(timings, "status", self.channel.send(f"It's {player.user.name}'s turn to speak!")))
+				timed_out = False
 				try:
-					response = await self.client.chat.completions.create(
-						model=player.user.model,
-						messages=messages,
-						max_tokens=100
-					)
-					text = self._clean_ai_content(response.choices[0].message.content or "")
-				except Exception as exc:
-					logger.exception("OpenAI completion failed for model %s during AI speech: %s", player.user.model, exc)
-					text = ""
+					text, streamed = await self._timed(timings, "completion", self._speech_for(player, deadline))
+				except CompletionTimeout as exc:
+					logger.warning("AI speech for %s timed out: %s", player.name, exc)
+					text, streamed, timed_out = "", None, True
+				status_msg = await status_task
 
 				if not text:
-					await self.handle_player_failure(player, status_msg)
+					# Running out of time is the provider's fault, not the player's.
+					if timed_out:
+						await self.channel.send(f"{player.name} ran out of time to speak.")
+					else:
+						await self.handle_player_failure(player, status_msg)
 					speaker_queue = [item for item in speaker_queue if item[0] != player]
 					spoken.add(player)
 					speech_counts[player] = speech_counts.get(player, 0) + 1
@@ -525,26 +725,25 @@ CRITICAL FORMAT RULES
 					continue
 
 				self.player_failures[player.user] = 0
+				self.broadcast(f"{player.name}: {text}", player)
+				self._context_for(player.user).append("assistant", text)
+				if on_last_speech and _ + 1 >= rounds:
+					on_last_speech()
 
-				if self.webhook:
-					if isinstance(self.channel, discord.Thread):
-						await self.webhook.send(
-							username=player.name,
-							avatar_url=player.user.avatar,
-							content=text,
-							thread=self.channel
-						)
+				if analyse:
+					analysis_task = asyncio.create_task(self._timed(timings, "analysis", self.get_next_speaker(text, player, deadline)))
+					self._start_speculation(self._predict_next_speaker(player, spoken | {player}, speech_counts, speaker_queue), deadline)
+				try:
+					if streamed:
+						await self._timed(timings, "post", self._edit_speech(streamed, player, text))
 					else:
-						await self.webhook.send(
-							username=player.name,
-							avatar_url=player.user.avatar,
-							content=text
-						)
-				else:
-					await self.channel.send(f"**{player.name}:** {text}")
+						await self._timed(timings, "post", self._post_speech(player, text))
+				finally:
+					if analysis_task:
+						await analysis_task
 
-				self.broadcast(f"{player.name}: {text}", player)
-				self.context.setdefault(player.user, []).append({"role": "assistant", "content": text})
+				timings["wall"] = time.monotonic() - turn_start
+				self._log_turn_timings(player, timings)
 
 			spoken.add(player)
 			speech_counts[player] = speech_counts.get(player, 0) + 1
@@ -553,7 +752,10 @@ CRITICAL FORMAT RULES
 
 			if analyse:
 				# next_speakers is list[(Player, level)]
-				next_speakers = await self.get_next_speaker(text, player)
+				if analysis_task:
+					next_speakers = analysis_task.result()
+				else:
+					next_speakers = await self.get_next_speaker(text, player, deadline)
 
 				# Only take COUNTERCLAIM, ACCUSED, ASKED, ROLE (level < 4)
 				new_mentions = [(p, level) for p, level in next_speakers if level < 4]
@@ -574,15 +776,354 @@ CRITICAL FORMAT RULES
 
 			_ += 1
 
-	async def get_next_speaker(self, text: str, speaker: Player) -> list[tuple[Player, int]]:
-		"""Use an LLM to identify which players were mentioned in a message.
+		self._discard_speculation()
+		if self.round_timings:
+			ai_wall = self.round_timings.get("wall", 0.0)
+			sequential = sum(t for stage, t in self.round_timings.items() if stage != "wall")
+			logger.info(
+				"Discussion round took %.1fs (AI turns %.1fs, %.1fs if run sequentially, saved %.1fs). Stage totals: %s",
+				time.monotonic() - round_start, ai_wall, sequential, sequential - ai_wall,
+				", ".join(f"{stage} {t:.1f}s" for stage, t in self.round_timings.items() if stage != "wall")
+			)
+
+	async def _timed(self, timings: dict[str, float], stage: str, coro):
+		"""Await coro and record how long it took under timings[stage]."""
+		start = time.monotonic()
+		try:
+			return await coro
+		finally:
+			timings[stage] = time.monotonic() - start
+
+	def _log_turn_timings(self, player: Player, timings: dict[str, float]):
+		"""Log one AI turn's per-stage timings and add them to the round totals."""
+		logger.debug("AI turn for %s: %s", player.name, ", ".join(f"{stage} {t:.2f}s" for stage, t in timings.items()))
+		for stage, t in timings.items():
+			self.round_timings[stage] = self.round_timings.get(stage, 0.0) + t
+
+	async def _generate_speech(self, player: Player, deadline: Deadline | None = None) -> str:
+		"""Request an AI player's speech and return the cleaned text ('' on failure)."""
+		text, _ = await self._request_speech(player, deadline)
+		return text
+
+	async def _request_speech(self, player: Player, deadline: Deadline | None = None, priority: int = SPEECH) -> tuple[str, int]:
+		"""Request an AI player's speech.  Returns (cleaned text, total tokens used).
+
+		Speculative requests pass priority=BACKGROUND, so they never hold up
+		a speech that is actually needed.
+
+		Raises:
+			CompletionTimeout: If the deadline ran out first.
+		"""
+		assert isinstance(player.user, AIAbstraction)
+		context = self._context_for(player.user)
+		try:
+			response = await self.llm.create(
+				model=player.user.model,
+				messages=context.messages(),
+				deadline=deadline,
+				priority=priority,
+				channel=self.channel.id,
+				purpose="speech",
+				conversation=context
+			)
+			tokens = response.usage.total_tokens if response.usage else 0
+			return self._clean_ai_content(response.choices[0].message.content or ""), tokens
+		except CompletionTimeout:
+			raise
+		except Exception as exc:
+			logger.exception("OpenAI completion failed for model %s during AI speech: %s", player.user.model, exc)
+			return "", 0
+
+	def _predict_next_speaker(self, current: Player, spoken: set, speech_counts: dict, speaker_queue: list[tuple[Player, int, int]]) -> Player | None:
+		"""Guess which AI player will speak after `current`, ignoring mentions not yet analysed.
+
+		If nobody is queued, the next speaker will be drawn at random from
+		everyone who hasn't spoken (or has spoken least), humans included.
+		That draw is made now and kept in drawn_speaker for run_round, and
+		only an AI pick is returned.
+		"""
+		others = [p for p in self.participants if p.alive and p is not current]
+		if not others:
+			return None
+
+		queued = [item for item in speaker_queue if item[0] in others]
+		if queued:
+			player = min(queued, key=lambda x: (x[1], -x[2]))[0]
+			return player if isinstance(player.user, AIAbstraction) else None
+
+		unsung = [p for p in others if p not in spoken]
+		if unsung:
+			self.drawn_speaker = random.choice(unsung)
+		else:
+			self.drawn_speaker = min(others, key=lambda p: (speech_counts.get(p, 0), random.random()))
+		return self.drawn_speaker if isinstance(self.drawn_speaker.user, AIAbstraction) else None
+
+	def _start_speculation(self, player: Player | None, deadline: Deadline | None = None):
+		"""Start generating `player`'s next speech ahead of time, if speculation is on."""
+		if not self.speculative or player is None or not isinstance(player.user, AIAbstraction):
+			return
+		if self.speculation and self.speculation.player is player:
+			return
+		self._discard_speculation()
+		version = self._context_for(player.user).version
+		self.speculation = Speculation(player, version, asyncio.create_task(self._request_speech(player, deadline, BACKGROUND)), time.monotonic())
+
+	def _discard_speculation(self):
+		"""Drop the current speculation as a miss; its tokens count as wasted once it finishes."""
+		spec = self.speculation
+		if spec is None:
+			return
+		self.speculation = None
+		self.speculation_stats["misses"] += 1
+
+		def count_waste(task: asyncio.Task):
+			if not task.cancelled() and task.exception() is None:
+				self.speculation_stats["wasted_tokens"] += task.result()[1]
+		spec.task.add_done_callback(count_waste)
+
+	async def _speech_for(self, player: Player, deadline: Deadline | None = None) -> tuple[str, discord.Message | None]:
+		"""Return an AI player's speech, using the speculated one if it's still valid.
+
+		A speculation is only committed if it was for this player and no
+		new messages reached the player's context since it started.
+		Otherwise the speech is generated now, streamed if enabled.
+
+		Returns:
+			(cleaned text, message) where message is the already-posted
+			streaming message, or None if the speech still has to be posted.
+
+		Raises:
+			CompletionTimeout: If the deadline ran out first.
+		"""
+		assert isinstance(player.user, AIAbstraction)
+		spec = self.speculation
+		if spec and spec.player is player and spec.version == self._context_for(player.user).version:
+			self.speculation = None
+			waited = time.monotonic()
+			try:
+				text, _ = await spec.task
+			except CompletionTimeout:
+				text = ""
+			if text:
+				self.speculation_stats["hits"] += 1
+				self.speculation_stats["saved_s"] += waited - spec.started
+				return text, None
+			# A failed speculation is retried once for real.
+			self.speculation_stats["misses"] += 1
+		else:
+			self._discard_speculation()
+
+		if self._streams(player):
+			return await self._stream_speech(player, deadline)
+		return await self._generate_speech(player, deadline), None
+
+	def _streams(self, player: Player) -> bool:
+		"""Whether an AI player's speech should be streamed."""
+		assert isinstance(player.user, AIAbstraction)
+		info = MODELS.get(player.user.model)
+		if info and "stream" in info.options:
+			return bool(info.options["stream"])
+		return self.stream_speech
+
+	async def _stream_speech(self, player: Player, deadline: Deadline | None = None) -> tuple[str, discord.Message | None]:
+		"""Stream an AI player's speech, posting it once visible text arrives.
+
+		The message is edited at most every STREAM_EDIT_INTERVAL seconds
+		while the completion streams; the caller makes the final edit.
+		The returned text is identical to what _generate_speech would give
+		for the same completion.
+
+		Returns:
+			(cleaned text, posted message).  ('', None) on failure, in which
+			case any partial message is deleted.
+
+		Raises:
+			CompletionTimeout: If the deadline ran out before the stream
+				finished.  Any partial message is deleted.
+		"""
+		assert isinstance(player.user, AIAbstraction)
+		stripper = ThinkStripper()
+		message = None
+		last_edit = 0.0
+		raw: list[str] = []
+		usage = finish_reason = None
+		timeout = self.llm.timeout_for(deadline)
+		context = self._context_for(player.user)
+		try:
+			async with asyncio.timeout(timeout):
+				stream = await self.llm.create(
+					model=player.user.model,
+					messages=context.messages(),
+					deadline=deadline,
+					priority=SPEECH,
+					channel=self.channel.id,
+					purpose="speech",
+					conversation=context,
+					stream=True,
+					stream_options={"include_usage": True}
+				)
+				async for chunk in stream:
+					usage = getattr(chunk, "usage", None) or usage
+					if not chunk.choices:
+						continue
+					finish_reason = chunk.choices[0].finish_reason or finish_reason
+					delta = chunk.choices[0].delta.content or ""
+					raw.append(delta)
+					if not stripper.feed(delta):
+						continue
+					partial = stripper.text.strip()
+					if not partial:
+						continue
+					if message is None:
+						message = await self._post_speech(player, partial)
+						last_edit = time.monotonic()
+					elif time.monotonic() - last_edit >= STREAM_EDIT_INTERVAL:
+						await self._edit_speech(message, player, partial)
+						last_edit = time.monotonic()
+		except Exception as exc:
+			if isinstance(exc, (TimeoutError, CompletionTimeout)):
+				logger.warning("Streaming speech for %s timed out after %.0fs", player.name, timeout)
+			else:
+				logger.exception("OpenAI streaming completion failed for model %s during AI speech: %s", player.user.model, exc)
+			if message:
+				try:
+					await message.delete()
+				except discord.HTTPException:
+					pass
+			if isinstance(exc, (TimeoutError, CompletionTimeout)):
+				raise CompletionTimeout(f"{player.user.model} did not finish streaming within {timeout:.0f}s") from None
+			return "", None
+
+		self.llm.usage.record(player.user.model, "speech", usage, finish_reason, "".join(raw))
+		return stripper.finish(), message
+
+	def _speech_content(self, player: Player, text: str) -> str:
+		"""Format an AI player's speech as it appears in Discord."""
+		return text if self.webhook else f"**{player.name}:** {text}"
+
+	async def _edit_speech(self, message: discord.Message, player: Player, text: str):
+		"""Edit a posted speech, skipping the request if nothing changed."""
+		content = self._speech_content(player, text)
+		if message.content != content:
+			message.content = content
+			await message.edit(content=content)
+
+	def speculation_report(self) -> str:
+		"""Summarise speculation hit/miss rates and wasted tokens for this game."""
+		stats = self.speculation_stats
+		total = stats["hits"] + stats["misses"]
+		rate = stats["hits"] / total * 100 if total else 0.0
+		return f"{stats['hits']}/{total} hits ({rate:.0f}%), {stats['wasted_tokens']} wasted tokens, ~{stats['saved_s']:.1f}s of generation overlapped"
+
+	async def _post_speech(self, player: Player, text: str) -> discord.Message:
+		"""Send an AI player's speech to Discord, via the webhook if configured."""
+		assert isinstance(player.user, AIAbstraction)
+		if self.webhook:
+			if isinstance(self.channel, discord.Thread):
+				return await self.webhook.send(
+					username=player.name,
+					avatar_url=player.user.avatar,
+					content=text,
+					thread=self.channel,
+					wait=True
+				)
+			else:
+				return await self.webhook.send(
+					username=player.name,
+					avatar_url=player.user.avatar,
+					content=text,
+					wait=True
+				)
+		else:
+			return await self.channel.send(self._speech_content(player, text))
+
+	async def get_next_speaker(self, text: str, speaker: Player, deadline: Deadline | None = None) -> list[tuple[Player, int]]:
+		"""Identify which players were mentioned in a message.
 
 		Despite the method name, this does not make any final determination of
 		who speaks next.
 
+		Depending on 'mention_analyser' in models.json, the message is
+		analysed locally (see LocalMentionAnalyser), by the discussion
+		analyser LLM, or locally with unclear messages escalated to the LLM
+		(hybrid).  In hybrid mode a sample of confident local results is
+		also checked against the LLM in the background.
+
+		Priority levels (lower = more urgent):
+			0 = COUNTERCLAIM (someone needs to counter a role claim)
+			1 = ACCUSED (directly accused of being mafia)
+			2 = ASKED (target of a question)
+			3 = ROLE (mentioned in relation to a role)
+			4 = CASUAL (mentioned in passing)
+
+		Args:
+			text: The message that was just spoken.
+			speaker: The player who spoke (excluded from results).
+			deadline: The phase's Deadline, for the LLM call.
+
+		Returns:
+			List of (Player, priority_level) tuples, sorted by priority.
+		"""
+		if self.mention_analyser == "llm":
+			return await self._llm_mentions(text, speaker, deadline)
+
+		alive_participants = [p for p in self.participants if p.alive]
+		self.local_analyser.update([p.name for p in alive_participants], self._model_aliases(alive_participants))
+		analysis = self.local_analyser.analyse(text, speaker.name)
+
+		if not analysis.confident and self.mention_analyser == "hybrid":
+			self.analyser_stats["escalated"] += 1
+			logger.debug("Escalating mention analysis to the LLM (%s)", analysis.reason)
+			return await self._llm_mentions(text, speaker, deadline)
+
+		self.analyser_stats["local"] += 1
+		by_name = {p.name: p for p in alive_participants}
+		local = [(by_name[name], level) for name, level in analysis.mentions if name in by_name]
+
+		if self.mention_analyser == "hybrid" and random.random() < self.shadow_rate:
+			task = asyncio.create_task(self._shadow_check(text, speaker, local))
+			self._shadow_tasks.add(task)
+			task.add_done_callback(self._shadow_tasks.discard)
+		return local
+
+	def _model_aliases(self, players: list[Player]) -> dict[str, list[str]]:
+		"""Return the extra 'aliases' from models.json for each AI player."""
+		aliases = {}
+		for p in players:
+			if isinstance(p.user, AIAbstraction):
+				info = MODELS.get(p.user.model)
+				if info and info.options.get("aliases"):
+					aliases[p.name] = list(info.options["aliases"])
+		return aliases
+
+	async def _shadow_check(self, text: str, speaker: Player, local: list[tuple[Player, int]]):
+		"""Compare a local analysis with the LLM's, for the agreement rate."""
+		remote = await self._llm_mentions(text, speaker, priority=BACKGROUND)
+		self.analyser_stats["shadowed"] += 1
+		if set(local) == set(remote):
+			self.analyser_stats["agreed"] += 1
+		else:
+			logger.debug(
+				"Local mention analysis disagreed with the LLM for %r: %s vs %s", text,
+				[(p.name, PRIORITIES[level]) for p, level in local],
+				[(p.name, PRIORITIES[level]) for p, level in remote],
+			)
+
+	def analyser_report(self) -> str:
+		"""Summarise how many messages were analysed locally, agreement and time saved."""
+		stats = self.analyser_stats
+		total = stats["local"] + stats["escalated"]
+		llm_avg = stats["llm_s"] / stats["llm_calls"] if stats["llm_calls"] else 0.0
+		agreement = f"{stats['agreed'] / stats['shadowed'] * 100:.0f}% of {stats['shadowed']} sampled" if stats["shadowed"] else "not sampled"
+		return f"{stats['local']}/{total} analysed locally, agreement with LLM {agreement}, ~{stats['local'] * llm_avg:.1f}s of analyser calls saved"
+
+	async def _llm_mentions(self, text: str, speaker: Player, deadline: Deadline | None = None, priority: int = SPEECH) -> list[tuple[Player, int]]:
+		"""Use an LLM to identify which players were mentioned in a message.
+
 		Sends the message text and list of alive players to the discussion
-		analyser model, which returns a structured list of mentioned players
-		and their priority levels.
+		analyser model (the speaker's 'analyser' from models.json, if set),
+		which returns a structured list of mentioned players and their
+		priority levels.
 
 		Priority levels (lower = more urgent):
 			0 = COUNTERCLAIM (someone needs to counter a role claim)
@@ -594,13 +1135,21 @@ CRITICAL FORMAT RULES
 		Args:
 			text: The message that was just spoken.
 			speaker: The player who spoke (excluded from results).
+			deadline: The phase's Deadline.
+			priority: Admission priority (BACKGROUND for shadow checks).
 
 		Returns:
 			List of (Player, priority_level) tuples, sorted by priority.
-			Empty list if the LLM returns NONE or an error occurs.
+			Empty list if the LLM returns NONE, an error occurs or it times out.
 		"""
+		analyser = self.DISCUSSION_ANALYSER
+		if isinstance(speaker.user, AIAbstraction):
+			info = MODELS.get(speaker.user.model)
+			analyser = (info and info.analyser) or analyser
+
+		started = time.monotonic()
 		try:
-			response = await self.client.chat.completions.create(
+			response = await self.llm.create(
 				messages=[
 					{"role": "system", "content": """
 You are analysing Mafia game chat to identify which players are mentioned and should respond.
@@ -653,11 +1202,20 @@ Output: NONE"""},
 Speaker: {speaker.name}
 Message: '{text}'"""}
 				],
-				model=self.DISCUSSION_ANALYSER
+				model=analyser,
+				deadline=deadline,
+				priority=priority,
+				channel=self.channel.id,
+				purpose="analysis"
 			)
+		except CompletionTimeout as exc:
+			logger.warning("Speaker analysis with %s timed out: %s", analyser, exc)
+			return []
 		except Exception as exc:
-			logger.error("OpenAI completion failed for model %s during speaker analysis: %s", self.DISCUSSION_ANALYSER, exc)
+			logger.error("OpenAI completion failed for model %s during speaker analysis: %s", analyser, exc)
 			return []
+		self.analyser_stats["llm_calls"] += 1
+		self.analyser_stats["llm_s"] += time.monotonic() - started
 		choice = response.choices[0].message.content
 		assert isinstance(choice, str)
 		raw = choice.strip()
@@ -673,7 +1231,7 @@ Message: '{text}'"""}
 		for mention in raw.split(","):
 			tags = mention.split(":")
 			try:
-				mentions.append({"name": tags[0].strip(), "level": ["COUNTERCLAIM", "ACCUSED", "ASKED", "ROLE", "CASUAL"].index(tags[1].strip())})
+				mentions.append({"name": tags[0].strip(), "level": PRIORITIES.index(tags[1].strip())})
 			except (IndexError, ValueError):
 				continue
 
@@ -686,7 +1244,7 @@ Message: '{text}'"""}
 
 		return next_players
 
-	async def run_vote(self, candidates: list[Player], message, placeholder="Vote for a player...", emoji="🗳️", timeout_s=120.0, break_ties_random=False, allow_abstain=False, require_majority=False):
+	async def run_vote(self, candidates: list[Player], message, placeholder="Vote for a player...", emoji="🗳️", timeout_s=120.0, break_ties_random=False, allow_abstain=False, require_majority=False, deadline: Deadline | None = None):
 		"""Run a vote where all players (human + AI) vote in parallel.
 
 		Human players vote via a Discord select menu (VoteView); AI players
@@ -698,13 +1256,17 @@ Message: '{text}'"""}
 			message: Text displayed above the vote (e.g. 'Who should be eliminated?').
 			placeholder: Placeholder text in the select menu.
 			emoji: Emoji shown on the select menu.
-			timeout_s: Seconds before voting closes.  AI votes are also
-				capped at min(timeout_s, 60) to avoid blocking.
+			timeout_s: Seconds humans have to vote, counted from when the
+				poll is posted.
 			break_ties_random: If True, randomly pick among tied winners.
 			allow_abstain: If True, adds an 'Abstain' option.  If abstain
 				votes tie or beat all other options, returns None.
 			require_majority: If True, the winner must have >50%% of total
 				participants to win.  Otherwise returns None.
+			deadline: The Deadline for the AI votes (by default timeout_s
+				from now), the one given to prepare_vote if it was called.
+				AI votes that run out of time are cast randomly.
+				The vote ends once every vote is in or timeout_s has passed.
 
 		Returns:
 			The Player who won the vote, or None if there was a tie (and
@@ -714,159 +1276,219 @@ Message: '{text}'"""}
 		Side effects:
 			Sends and edits a Discord message with the live vote tally.
 			Updates AI contexts with vote prompts and responses.
+			Starts summarising older AI context in the background.
 			Tracks player failures for humans who don't vote in time.
 		"""
 		from classes.views import VoteView
-		votes: dict[int, str] = {}
+		if deadline is None:
+			deadline = Deadline(timeout_s, "vote")
 
-		voter_names = {}
-		for p in self.participants:
-			if isinstance(p.user, discord.Member):
-				voter_names[p.user.id] = p.name
-			elif isinstance(p.user, AIAbstraction):
-				voter_names[hash(p.name)] = p.name
+		# Humans are keyed by user ID; AIs (whose IDs are all -1) by themselves.
+		voter_names = {
+			p.user.id if isinstance(p.user, discord.Member) else p.user: p.name
+			for p in self.participants
+		}
+		ledger = VoteLedger([p.name for p in candidates], voter_names, allow_abstain)
 
 		ends_at = int(__import__("time").time() + timeout_s)
 		countdown = f"-# Voting ends <t:{ends_at}:R>."
 		base_message = message + "\n" + countdown
 
-		view = VoteView(
-			players=[p.name for p in candidates],
-			placeholder=placeholder,
-			emoji=emoji,
-			allow_abstain=allow_abstain,
-			voter_names=voter_names
-		)
-		view.votes = votes
+		view = VoteView(ledger, placeholder=placeholder, emoji=emoji)
 		view.allowed_voters = {
 			p.user.id for p in self.participants
 			if isinstance(p.user, discord.Member)
 		}
-		view.required_votes = len(view.allowed_voters)
+		view.inputs = PendingInputs(view.allowed_voters)
 		view.base_message = base_message
 
-		poll = await self.channel.send(
-			base_message + "\n\n**Votes:**\nNo votes yet.",
-			view=view
-		)
+		# AI votes run alongside posting the poll (or since the end of the
+		# discussion, if prepare_vote started them), but are only cast once
+		# the poll exists.
+		ai_votes = self._take_prepared_vote(message, list(ledger.counts)) or self._start_ai_votes(message, list(ledger.counts), deadline)
+		try:
+			view.editor.message = await self.channel.send(
+				base_message + "\n\n**Votes:**\nNo votes yet.",
+				view=view
+			)
+		except BaseException:
+			ai_votes.cancel()
+			raise
+		poll_posted = time.monotonic()
+		self.start_summarising()
 
-		candidate_names = [p.name for p in candidates]
-		if allow_abstain:
-			candidate_names.append("Abstain")
+		async def ai_voting_manager():
+			for completed in asyncio.as_completed(ai_votes.tasks):
+				ai_player, choice = await completed
+				self._record_vote(ai_player, message, choice)
+				if ledger.cast(ai_player.user, choice):
+					view.editor.update(content=base_message + "\n\n**Votes:**\n" + ledger.tally(), view=view)
 
-		options_block = "\n".join(candidate_names)
+		await asyncio.gather(ai_voting_manager(), view.inputs.wait(timeout_s))
+		self._log_vote_timings(ai_votes, poll_posted)
 
-		async def get_ai_vote(ai_player: Player):
-			prompt = "\n".join([
-				message,
-				"Vote by replying with EXACTLY ONE line containing EXACTLY ONE of the option names below.",
-				"Do not add punctuation, quotes, explanations, or multiple lines.",
-				"OPTIONS:",
-				options_block
-			])
+		for p in self.participants:
+			if isinstance(p.user, discord.Member) and p.user.id in view.allowed_voters:
+				if p.user.id not in ledger:
+					await self.handle_player_failure(p)
+				else:
+					self.player_failures[p.user] = 0
 
-			assert isinstance(ai_player.user, AIAbstraction)
-			self.context.setdefault(ai_player.user, []).append({
-				"role": "user",
-				"content": prompt
-			})
+		await view.editor.flush(content=base_message + "\n\n**Votes:**\n" + ledger.tally(), view=None)
 
-			try:
-				response = await asyncio.wait_for(
-					self.client.chat.completions.create(
-						model=ai_player.user.model,
-						messages=self.context[ai_player.user]
-					),
-					timeout=min(timeout_s, 60.0)
-				)
-				content = self._clean_ai_content(response.choices[0].message.content or "")
-				choice = extract_choice(content, candidate_names)
+		if ledger.abstain_wins() or not ledger.top:
+			return None
 
-				if not choice:
-					choice = random.choice(candidate_names)
+		winner = ledger.leader()
+		if winner is None:
+			# A tie between the leading candidates.
+			if break_ties_random:
+				return self._candidate_by_name(candidates, random.choice(sorted(ledger.leading)))
+			return None
 
-				self.player_failures[ai_player.user] = 0
-			except Exception as exc:
-				logger.exception("AI vote failed for %s: %s", ai_player.name, exc)
-				choice = random.choice(candidate_names)
-				self.context[ai_player.user].append({"role": "assistant", "content": choice})
-				return ai_player, choice
+		if require_majority and not ledger.majority_reached(len(self.participants) // 2 + 1):
+			return None
 
-			self.context[ai_player.user].append({"role": "assistant", "content": choice})
-			return ai_player, choice
+		return self._candidate_by_name(candidates, winner)
 
-		ai_players = [p for p in self.participants if isinstance(p.user, AIAbstraction)]
-		human_voters = [p.user for p in self.participants if isinstance(p.user, discord.Member)]
-		expected_human_votes = len(human_voters)
+	def prepare_vote(self, candidates: list[Player], message: str, allow_abstain: bool = False, deadline: Deadline | None = None):
+		"""Start the AI votes for an upcoming run_vote, if 'speculative_votes' is on.
 
-		async def ai_voting_manager():
-			if not ai_players:
-				return
+		Called as soon as the discussion ends, so the AI votes are being
+		generated while the poll is still being set up.  run_vote uses them
+		if it's called with the same message, options and voters, and
+		discards them otherwise.
 
-			tasks = [get_ai_vote(p) for p in ai_players]
-			for completed in asyncio.as_completed(tasks):
-				ai_player, choice = await completed
-				if choice:
-					votes[hash(ai_player.name)] = choice
-					tally = self._format_vote_details(votes, candidates, voter_names, allow_abstain)
-					try:
-						await poll.edit(content=base_message + "\n\n**Votes:**\n" + tally, view=view)
-					except Exception:
-						pass
-
-		async def wait_for_human_votes():
-			start = asyncio.get_event_loop().time()
-			while True:
-				got_human = sum(1 for uid in votes.keys() if uid in view.allowed_voters)
-				if got_human >= expected_human_votes:
-					return
-				if (asyncio.get_event_loop().time() - start) >= timeout_s:
-					return
-				await asyncio.sleep(1.0)
-
-		await asyncio.gather(ai_voting_manager(), wait_for_human_votes())
+		Args:
+			candidates: Players who will be voted for.
+			message: The question run_vote will ask.
+			allow_abstain: Whether run_vote will offer 'Abstain'.
+			deadline: The vote's Deadline, for the AI calls.  Pass the same
+				one to run_vote.
+		"""
+		if not self.speculative_votes:
+			return
+		self._discard_prepared_vote()
+		options = [p.name for p in candidates] + ([ABSTAIN] if allow_abstain else [])
+		self.prepared_vote = self._start_ai_votes(message, options, deadline)
+
+	def _take_prepared_vote(self, message: str, options: list[str]) -> PreparedVote | None:
+		"""Return the prepared AI votes if they match this vote, discarding them otherwise."""
+		prepared, self.prepared_vote = self.prepared_vote, None
+		if prepared is None:
+			return None
+		ai_players = [p for p in self.participants if isinstance(p.user, AIAbstraction)]
+		if (prepared.message, prepared.options, prepared.voters) != (message, options, ai_players):
+			logger.info("Discarding AI votes prepared for a different vote")
+			prepared.cancel()
+			return None
+		return prepared
+
+	def _discard_prepared_vote(self):
+		if self.prepared_vote:
+			self.prepared_vote.cancel()
+			self.prepared_vote = None
+
+	def _start_ai_votes(self, message: str, options: list[str], deadline: Deadline | None) -> PreparedVote:
+		"""Start one vote completion per AI participant."""
+		# The instructions and options are only sent with this request; the
+		# history keeps just the question and answer, so it stays short and
+		# its cached prefix stays valid.
+		instructions = "\n".join([
+			"Vote by replying with EXACTLY ONE line containing EXACTLY ONE of the option names below.",
+			"Do not add punctuation, quotes, explanations, or multiple lines.",
+			"OPTIONS:",
+			"\n".join(options)
+		])
+		ai_players = [p for p in self.participants if isinstance(p.user, AIAbstraction)]
+		vote = PreparedVote(message, options, ai_players)
+		for p in ai_players:
+			task = asyncio.create_task(self._ai_vote(p, message, options, instructions, deadline))
+			task.add_done_callback(lambda _, p=p: vote.landed.__setitem__(p, time.monotonic()))
+			vote.tasks.append(task)
+		return vote
+
+	async def _ai_vote(self, ai_player: Player, message: str, options: list[str], instructions: str, deadline: Deadline | None) -> tuple[Player, str]:
+		"""Ask one AI for its vote.  Returns (player, choice); the choice is random if it fails.
+
+		Nothing is recorded in the AI's context: a prepared vote may still
+		be discarded, so run_vote records the question and answer together
+		once it counts the vote (see _record_vote).
+		"""
+		assert isinstance(ai_player.user, AIAbstraction)
+		context = self._context_for(ai_player.user)
 
-		for p in self.participants:
-			if isinstance(p.user, discord.Member) and p.user.id in view.allowed_voters:
-				if p.user.id not in votes:
-					await self.handle_player_failure(p)
-				else:
-					self.player_failures[p.user] = 0
+		try:
+			choice, content = await self._choose(ai_player.user.model, context, options, deadline, "vote", instructions, prompt=message)
+			choice = choice or extract_choice(content, options)
 
-		tally = self._format_vote_details(votes, candidates, voter_names, allow_abstain)
-		await poll.edit(content=base_message + "\n\n**Votes:**\n" + tally, view=None)
+			if not choice:
+				choice = random.choice(options)
 
-		counts: dict[str, int] = {name: 0 for name in candidate_names}
-		for choice in votes.values():
-			if choice in counts:
-				counts[choice] += 1
+			self.player_failures[ai_player.user] = 0
+		except CompletionTimeout as exc:
+			logger.warning("AI vote for %s timed out, voting randomly: %s", ai_player.name, exc)
+			choice = random.choice(options)
+		except Exception as exc:
+			logger.exception("AI vote failed for %s: %s", ai_player.name, exc)
+			choice = random.choice(options)
 
-		if allow_abstain and "Abstain" in counts:
-			abstain_votes = counts["Abstain"]
-			non_abstain_max = max([n for name, n in counts.items() if name != "Abstain"], default=0)
-			if abstain_votes >= non_abstain_max:
-				return None
-			counts.pop("Abstain", None)
+		return ai_player, choice
 
-		if not any(counts.values()):
-			return None
+	def _record_vote(self, ai_player: Player, message: str, choice: str):
+		"""Add a counted vote's question and answer to the AI's context."""
+		assert isinstance(ai_player.user, AIAbstraction)
+		context = self._context_for(ai_player.user)
+		context.append("user", message)
+		context.append("assistant", choice)
+
+	def _log_vote_timings(self, ai_votes: PreparedVote, poll_posted: float):
+		"""Log when the AI votes started and landed, relative to the poll being posted."""
+		if not ai_votes.landed:
+			return
+		landed = [t - poll_posted for t in ai_votes.landed.values()]
+		logger.info(
+			"AI votes started %.1fs before the poll was posted; %i/%i were in before it, landing %+.1fs from it on average (last %+.1fs)",
+			poll_posted - ai_votes.started, sum(t <= 0 for t in landed), len(landed),
+			sum(landed) / len(landed), max(landed)
+		)
 
-		best = max(counts.values())
-		winners = [name for name, n in counts.items() if n == best]
-		if len(winners) != 1:
-			if break_ties_random and winners:
-				picked = random.choice(winners)
-				return self._candidate_by_name(candidates, picked)
-			return None
+	async def _choose(self, model: str, context: AIContext, options: list[str], deadline: Deadline | None, purpose: str, instructions: str, prompt: str | None = None) -> tuple[str | None, str]:
+		"""Ask a model to pick one of `options`, using structured output if it supports it.
 
-		if require_majority:
-			majority_threshold = len(self.participants) // 2 + 1
-			if best < majority_threshold:
-				return None
+		`instructions` (which should list the options) are sent after the
+		context's history but not recorded in it, as is `prompt` (the
+		question itself) if the caller records it later.
 
-		return self._candidate_by_name(candidates, winners[0])
+		Returns:
+			(option chosen through structured output or None, cleaned text
+			content for the caller to parse itself).
 
-	async def create_ai_completion(self, ai_player: Player, prompt: str) -> str:
+		Raises:
+			CompletionTimeout: If the call ran out of time.
+			Exception: Whatever the completion raised, other than a
+				structured output request being rejected.
+		"""
+		mode = choices.structured_mode(model)
+		extra = choices.request_kwargs(mode, options) if mode else {}
+		tail = ([{"role": "user", "content": prompt}] if prompt else []) + [{"role": "user", "content": instructions}]
+		try:
+			response = await self.llm.create(model=model, messages=context.messages(tail), deadline=deadline, priority=ACTION, channel=self.channel.id, purpose=purpose, conversation=context, tail=tail, **extra)
+		except openai.BadRequestError as exc:
+			if not mode or not choices.is_unsupported_error(exc):
+				raise
+			choices.mark_unsupported(model, exc)
+			return await self._choose(model, context, options, deadline, purpose, instructions, prompt)
+
+		content = self._clean_ai_content(response.choices[0].message.content or "")
+		if not mode:
+			return None, content
+		choice = choices.parse(response, mode, options)
+		if not choice:
+			logger.debug("Structured %s from %s had no valid choice, parsing it as text", purpose, model)
+		return choice, content
+
+	async def create_ai_completion(self, ai_player: Player, prompt: str, deadline: Deadline | None = None, options: list[str] | None = None) -> str:
 		"""Send a prompt to an AI player's model and return the response.
 
 		Appends the prompt as a 'user' message to the player's context,
@@ -876,27 +1498,50 @@ Message: '{text}'"""}
 		Args:
 			ai_player: The AI player to prompt.
 			prompt: The prompt text (e.g. a night action question).
+			deadline: The phase's Deadline.  Without one the call is still
+				bounded by the per-call timeout.
+			options: The valid answers, if the prompt asks for a choice.
+				They are listed after the prompt for this request only, and
+				models that support structured output answer with exactly
+				one of them.
 
 		Returns:
 			The cleaned response text, or an empty string if the completion
 			failed or returned nothing (in which case handle_player_failure
 			is called).
 
+		Raises:
+			CompletionTimeout: If the call ran out of time.  This doesn't
+				count as a player failure.
+
 		Side effects:
 			If no response is received, this calls `self.handle_player_failure`,
 			which may modkill the player.
 		"""
 		assert isinstance(ai_player.user, AIAbstraction)
-		messages = self.context.setdefault(ai_player.user, [])
-		messages.append({"role": "user", "content": prompt})
+		context = self._context_for(ai_player.user)
+		context.append("user", prompt)
 
 		content = ""
 		try:
-			response = await self.client.chat.completions.create(
-				model=ai_player.user.model,
-				messages=messages
-			)
-			content = self._clean_ai_content(response.choices[0].message.content or "")
+			if options:
+				listing = "Available options:\n" + "\n".join(f"- {option}" for option in options)
+				choice, content = await self._choose(ai_player.user.model, context, options, deadline, "night", listing)
+				content = choice or content
+			else:
+				response = await self.llm.create(
+					model=ai_player.user.model,
+					messages=context.messages(),
+					deadline=deadline,
+					priority=ACTION,
+					channel=self.channel.id,
+					purpose="night",
+					conversation=context
+				)
+				content = self._clean_ai_content(response.choices[0].message.content or "")
+		except CompletionTimeout:
+			logger.warning("AI completion for %s (%s) timed out", ai_player.name, ai_player.user.model)
+			raise
 		except Exception as exc:
 			logger.exception("OpenAI completion failed for model %s during AI completion for %s: %s", ai_player.user.model, ai_player.name, exc)
 
@@ -906,7 +1551,7 @@ Message: '{text}'"""}
 
 		# Reset failures on success
 		self.player_failures[ai_player.user] = 0
-		messages.append({"role": "assistant", "content": content})
+		context.append("assistant", content)
 		return content
 
 	async def on_message(self, message: discord.Message):
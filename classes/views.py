@@ -11,11 +11,15 @@ Classes are organized by function:
   SpecialActionsView, SpecialActionButton
 """
 
-import discord, time, logging, data, asyncio, json
-from collections import defaultdict
+import discord, time, logging, data, asyncio
 from typing import TYPE_CHECKING, Callable, cast
 from classes.roles import Role, Alignment, ALL_ROLES
 from classes.player import Player, create_ai_players, AIAbstraction
+from classes.registry import MODELS
+from classes.llm import CompletionTimeout, Deadline
+from classes.waiting import PendingInputs
+from classes.votes import VoteLedger, ABSTAIN
+from classes.edits import MessageEditor
 
 if TYPE_CHECKING:
 	from classes.abstractor import GameAbstractor
@@ -25,7 +29,10 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
-ABSTAIN_LABEL = "Abstain"
+ABSTAIN_LABEL = ABSTAIN
+
+# How long humans get for night actions.
+HUMAN_ACTION_TIMEOUT = 180.0
 
 class ConfirmView(discord.ui.View):
 	"""A simple Yes/No confirmation dialog.
@@ -71,18 +78,12 @@ class StartGameView(discord.ui.View):
 		# They have... similar APIs? So for now I'll cast unsafely
 		user = interaction.user
 		self.abstractor.players[interaction.user.id] = Player(cast(discord.Member, user))
-		try:
-			with open("models.json") as f:
-				m_data = json.load(f)
-				models = [m["model"] for m in m_data.get("models", [])[:10]]
-		except Exception:
-			models = []
-
-		for ai_player in create_ai_players(models):
+		for ai_player in create_ai_players(MODELS.default_ids()):
 			self.abstractor.players[hash(ai_player.name)] = ai_player
 
 		self.abstractor.interactions[interaction.user.id] = interaction
 		self.abstractor.running = True
+		self.abstractor.lobby.cancel()
 		data.update_game_status(self.abstractor.bot)
 		self.abstractor.last_lobby_id = None
 		self.abstractor.owner = cast(discord.User, user)
@@ -203,16 +204,16 @@ class JoinGameView(discord.ui.View):
 
 				if interaction.user == self.abstractor.owner:
 					assert interaction.message is not None  # PYREX NOTE: Seems defeasible.
+					self.game.editor.discard()
 					await interaction.message.delete()
 					assert self.game.start_job is not None
 					self.game.start_job.cancel()
+					self.game.stop_warming()
 					self.abstractor.running = False
 					data.update_game_status(self.abstractor.bot)
 					await self.abstractor.on_message(True)
 				else:
-					embed = self.generate_embed()
-					assert interaction.message is not None  # PYREX NOTE: Seems defeasible.
-					await interaction.message.edit(embed=embed)
+					self.game.editor.update(embed=self.generate_embed())
 
 			async def no(i: discord.Interaction):
 				await i.response.edit_message(content="You canceled this action.", view=None)
@@ -229,8 +230,8 @@ class JoinGameView(discord.ui.View):
 			self.abstractor.interactions[interaction.user.id] = interaction
 			# PYREX NOTE: Noting that other parts of the codebase require this to be a discord.User --
 			self.abstractor.players[interaction.user.id] = Player(cast(discord.Member, interaction.user))
-			embed = self.generate_embed()
-			await interaction.response.edit_message(embed=embed)
+			await interaction.response.defer()
+			self.game.editor.update(embed=self.generate_embed())
 
 	@discord.ui.button(label="Start Game", style=discord.ButtonStyle.green)
 	async def start(self, interaction: discord.Interaction, _):
@@ -279,7 +280,7 @@ class JoinGameView(discord.ui.View):
 			view=view,
 			ephemeral=True
 		)
-		view.message = await interaction.original_response()
+		view.editor.message = await interaction.original_response()
 
 class SettingsView(discord.ui.View):
 	"""Ephemeral settings panel for game configuration.
@@ -294,7 +295,8 @@ class SettingsView(discord.ui.View):
 	def __init__(self, game):
 		self.game = game
 		self.config = game.config
-		self.message: None | discord.InteractionMessage = None
+		# Edits the settings message once it's sent, outside interactions.
+		self.editor = MessageEditor()
 		super().__init__(timeout=None)
 
 		# Add mafia and town controls
@@ -321,12 +323,7 @@ class SettingsView(discord.ui.View):
 
 		# Initialize models if not set
 		if "models" not in self.config:
-			try:
-				with open("models.json") as f:
-					m_data = json.load(f)
-					self.config["models"] = [m["model"] for m in m_data.get("models", [])[:10]]
-			except Exception:
-				self.config["models"] = []
+			self.config["models"] = MODELS.default_ids()
 
 		# Initialize role configs (exclude Town and Mafia)
 		for role in ALL_ROLES:
@@ -343,7 +340,7 @@ class SettingsView(discord.ui.View):
 
 		Args:
 			interaction: If provided, responds to this interaction.
-				Otherwise, edits the stored self.message directly.
+				Otherwise, edits the settings message through self.editor.
 		"""
 		total_players = len(self.game.abstractor.players)
 
@@ -414,16 +411,12 @@ class SettingsView(discord.ui.View):
 
 		if interaction:
 			await interaction.response.edit_message(view=self)
-		elif self.message:
-			await self.message.edit(view=self)
+		else:
+			self.editor.update(view=self)
 
 		# Update the lobby message if it exists to reflect changes in player list or settings
 		if self.game.lobby and self.game.message:
-			try:
-				embed = self.game.lobby.generate_embed()
-				await self.game.message.edit(embed=embed)
-			except Exception:
-				logger.exception("Failed to update lobby message")
+			self.game.editor.update(embed=self.game.lobby.generate_embed())
 
 class EnabledRolesSelect(discord.ui.Select):
 	"""Multi-select dropdown for toggling special roles (Doctor, Sheriff, etc.)."""
@@ -462,24 +455,17 @@ class EnabledRolesSelect(discord.ui.Select):
 class ModelSelect(discord.ui.Select):
 	"""Multi-select dropdown for choosing which AI models participate.
 
-	Populated from models.json.  When the selection changes, AI players
+	Populated from the model registry.  When the selection changes, AI players
 	in the lobby are synced to match.
 	"""
 
 	def __init__(self):
-		try:
-			with open("models.json") as f:
-				m_data = json.load(f)
-				models = m_data.get("models", [])[:25]
-		except Exception:
-			models = []
-
 		options = []
-		for m in models:
-			emoji = m.get("emoji")
+		for m in MODELS.all()[:25]:
+			emoji = None
 
-			if emoji:
-				parts = emoji.split(":")
+			if m.emoji:
+				parts = m.emoji.split(":")
 				emoji = discord.PartialEmoji(
 					name=parts[1],
 					animated="a" in parts[0],
@@ -487,8 +473,8 @@ class ModelSelect(discord.ui.Select):
 				)
 
 			options.append(discord.SelectOption(
-				label=m["name"],
-				value=m["model"],
+				label=m.name,
+				value=m.model,
 				emoji=emoji
 			))
 
@@ -572,7 +558,7 @@ class DefaultButton(discord.ui.Button):
 	"""Button to reset all settings to their defaults.
 
 	Resets role toggles (Doctor + Sheriff enabled), recalculates mafia/town
-	split (~1/3 mafia), reloads all models from models.json, and syncs
+	split (~1/3 mafia), re-selects the default models, and syncs
 	the lobby player list.
 	"""
 
@@ -603,12 +589,7 @@ class DefaultButton(discord.ui.Button):
 		view.config["town"] = town
 
 		# Reset models to defaults (all 10)
-		try:
-			with open("models.json") as f:
-				m_data = json.load(f)
-				view.config["models"] = [m["model"] for m in m_data.get("models", [])[:10]]
-		except Exception:
-			pass
+		view.config["models"] = MODELS.default_ids()
 
 		# Sync AI players in the lobby
 		humans = {k: v for k, v in view.game.abstractor.players.items() if not isinstance(v.user, AIAbstraction)}
@@ -622,9 +603,10 @@ class DefaultButton(discord.ui.Button):
 class VoteSelect(discord.ui.Select):
 	"""Select menu for human players to cast a vote.
 
-	Each interaction records the vote in VoteView.votes, reformats the
-	tally, and updates the poll message.  Disables the select when all
-	human votes are in.
+	Each interaction records the vote in VoteView.ledger, marks the voter
+	in VoteView.inputs (which ends the vote once everyone has voted),
+	and updates the poll message through VoteView.editor.  Disables the
+	select when all human votes are in.
 	"""
 
 	def __init__(self, players, placeholder, emoji, allow_abstain: bool = False):
@@ -663,55 +645,37 @@ class VoteSelect(discord.ui.Select):
 			await interaction.response.send_message("You're not a participant in this game.", ephemeral=True)
 			return
 
-		selection = self.values[0]
-		view.votes[interaction.user.id] = selection
-
-		vote_details = defaultdict(list)
-		for vid, choice in view.votes.items():
-			voter_name = view.voter_names.get(vid, "Unknown")
-			vote_details[choice].append(voter_name)
-
-		lines = []
-		for name in view.player_names:
-			voters = vote_details.get(name, [])
-			if voters:
-				lines.append(f"- {name}: {', '.join(sorted(voters))} ({len(voters)})")
-
-		if view.allow_abstain and ABSTAIN_LABEL in vote_details:
-			voters = vote_details[ABSTAIN_LABEL]
-			lines.append(f"- {ABSTAIN_LABEL}: {', '.join(sorted(voters))} ({len(voters)})")
-
-		if not lines:
-			lines = ["No votes yet."]
+		view.ledger.cast(interaction.user.id, self.values[0])
+		view.inputs.mark(interaction.user.id)
 
-		content = view.base_message + "\n" + "\n\n**Votes:**\n" + "\n".join(lines)
-
-		if sum(1 for uid in view.votes.keys() if uid in view.allowed_voters) >= view.required_votes:
+		if view.inputs.done:
 			self.disabled = True
 
-		await interaction.response.edit_message(content=content, view=view)
+		# The poll is edited through the view's editor, which merges this
+		# with other votes arriving at the same time.
+		await interaction.response.defer()
+		view.editor.update(content=view.base_message + "\n\n**Votes:**\n" + view.ledger.tally(), view=view)
 
 class VoteView(discord.ui.View):
 	"""View containing a VoteSelect for human voting.
 
 	Created by TurnManager.run_vote().  Holds shared state between the
 	UI select and the voting manager:
-		votes: dict of voter_id -> chosen_name (shared with run_vote).
+		ledger: the VoteLedger (shared with run_vote).
 		allowed_voters: set of Discord user IDs who may vote.
-		required_votes: how many human votes to wait for.
+		inputs: PendingInputs for the human voters, which run_vote waits on.
 		base_message: the message text above the tally.
+		editor: MessageEditor for the poll message, set once it's sent.
 	"""
 
-	def __init__(self, players: list[str], placeholder="Vote on a player.", emoji="🗳️", allow_abstain: bool = False, voter_names: dict[int, str] | None = None):
+	def __init__(self, ledger: VoteLedger, placeholder="Vote on a player.", emoji="🗳️"):
 		super().__init__(timeout=None)
-		self.allow_abstain = allow_abstain
-		self.add_item(VoteSelect(players, placeholder, emoji, allow_abstain=allow_abstain))
-		self.votes: dict[int, str] = {}
+		self.ledger = ledger
+		self.add_item(VoteSelect(ledger.candidates, placeholder, emoji, allow_abstain=ledger.allow_abstain))
 		self.allowed_voters: set[int] = set()
-		self.required_votes: int = 0
+		self.inputs = PendingInputs()
 		self.base_message: str = ""
-		self.player_names: list[str] = players
-		self.voter_names = voter_names or {}
+		self.editor = MessageEditor()
 
 class SelectView(discord.ui.View):
 	"""Generic single-select view used by role night actions.
@@ -732,12 +696,12 @@ class SpecialActionsView(discord.ui.View):
 
 	Displayed during the night phase.  Each alive player with a special
 	role sees a button for their action (e.g. Doctor: Save, Sheriff:
-	Investigate).  Tracks which humans have acted and enforces a 3-minute
-	timeout; unacted players receive a failure penalty.
+	Investigate).  Tracks which humans have acted and waits for them for a
+	fixed window; unacted players receive a failure penalty.
 
 	Attributes:
-		acted_players: Set of user IDs who have completed their action.
-		pending_humans: Set of user IDs still expected to act.
+		inputs: PendingInputs for the humans expected to act.  Role
+			handlers mark players in it as they act.
 	"""
 
 	def __init__(self, alive_players: list[Player], turn_manager: "TurnManager", game: "MafiaGame"):
@@ -745,8 +709,6 @@ class SpecialActionsView(discord.ui.View):
 		self.players = alive_players
 		self.turn_manager = turn_manager
 		self.game = game
-		self.acted_players = set()
-		self.pending_humans = set()
 
 		added_roles = set()
 		for player in alive_players:
@@ -754,31 +716,38 @@ class SpecialActionsView(discord.ui.View):
 				self.add_item(SpecialActionButton(player.role_or_die))
 				added_roles.add(player.role_or_die.name)
 
-		self.pending_humans = {p.user.id for p in alive_players if p.role_or_die.is_special() and isinstance(p.user, discord.Member) and p.role_or_die.can_act(p)}
+		self.inputs = PendingInputs(p.user.id for p in alive_players if p.role_or_die.is_special() and isinstance(p.user, discord.Member) and p.role_or_die.can_act(p))
+
+	@property
+	def acted_players(self) -> set[int]:
+		"""User IDs who have completed their action."""
+		return self.inputs.received
+
+	@property
+	def pending_humans(self) -> set[int]:
+		"""User IDs still expected to act."""
+		return self.inputs.pending
 
 	def get(self, id):
 		return discord.utils.get(self.children, custom_id=id)
 
-	async def wait_for_humans(self):
-		"""Block until all pending humans have acted or the 3-minute timeout.
+	async def wait_for_humans(self, timeout: float = HUMAN_ACTION_TIMEOUT):
+		"""Block until all pending humans have acted or `timeout` seconds pass.
 
-		Players who don't act in time receive a failure penalty via
-		handle_player_failure.  Players who do act get their failure
-		counter reset to 0.
+		Returns as soon as the last human acts.  Players who don't act in
+		time receive a failure penalty via handle_player_failure.  Players
+		who do act get their failure counter reset to 0.  The window is
+		fixed, however long the night's AI calls and mafia chat took.
 		"""
-		start_time = asyncio.get_event_loop().time()
-		timeout = 180.0  # 3 minutes
-		while self.pending_humans:
-			if (asyncio.get_event_loop().time() - start_time) >= timeout:
-				# Handle timeout for players who didn't act
-				if self.game and self.game.turns:
-					for pid in list(self.pending_humans):
-						player = next((p for p in self.players if p.user.id == pid), None)
-						if player:
-							await self.game.turns.handle_player_failure(player)
-				self.pending_humans.clear()
-				return
-			await asyncio.sleep(1)
+		if not await self.inputs.wait(timeout):
+			# Handle timeout for players who didn't act
+			if self.game and self.game.turns:
+				for pid in list(self.inputs.pending):
+					player = next((p for p in self.players if p.user.id == pid), None)
+					if player:
+						await self.game.turns.handle_player_failure(player)
+			self.inputs.pending.clear()
+			return
 
 		# Reset failures for those who did act
 		if self.game and self.game.turns:
@@ -787,18 +756,21 @@ class SpecialActionsView(discord.ui.View):
 				if player:
 					self.game.turns.player_failures[player.user] = 0
 
-	async def handle_ai_special_action(self, player: Player):
+	async def handle_ai_special_action(self, player: Player, deadline: Deadline | None = None):
 		"""Delegate an AI player's night action to their role's AI handler.
 
 		Calls player.role.night_action_ai(), which uses the TurnManager
 		to get an LLM completion and apply the result (e.g. kill, save,
-		investigate).  Errors are logged but do not propagate.
+		investigate).  Errors are logged but do not propagate; running
+		out of time on the night's deadline means no action.
 		"""
 		if not self.game:
 			return
 
 		try:
-			await player.role_or_die.night_action_ai(self.game, player)
+			await player.role_or_die.night_action_ai(self.game, player, deadline)
+		except CompletionTimeout as e:
+			logger.warning("AI %s action for %s ran out of time: %s", player.role_or_die.name, player.name, e)
 		except Exception as e:
 			model = getattr(player.user, "model", None)
 			if model:
@@ -0,0 +1,149 @@
+"""The running tally of a vote.
+
+A VoteLedger is shared by the poll's select menu (human votes) and
+TurnManager.run_vote (AI votes and the outcome).  Casting or changing a
+vote only touches the two candidates involved: their counts, voter sets
+and tally lines, and the count -> candidates buckets behind the leader
+queries.  Nothing is recounted, however many votes come in.
+"""
+
+from typing import Hashable, Iterable
+
+ABSTAIN = "Abstain"
+
+NO_VOTES = "No votes yet."
+
+class VoteLedger:
+	"""Votes cast so far, by voter and by candidate.
+
+	Voters are keyed by anything hashable and unique per player: Discord
+	user IDs for humans, the AIAbstraction itself for AIs.  Display names
+	aren't unique (two players can share one), so they are only used to
+	render the tally.
+
+	Attributes:
+		candidates: Candidate names, in the order the tally lists them.
+		allow_abstain: Whether ABSTAIN is a valid choice.
+		votes: Voter key -> chosen name.
+		voters: Choice -> keys of the voters who chose it.
+		counts: Choice -> number of votes.
+		leading: Candidates (not abstain) with the most votes.
+		top: The most votes any candidate (not abstain) has.
+	"""
+
+	def __init__(self, candidates: Iterable[str], voter_names: dict[Hashable, str], allow_abstain: bool = False):
+		"""Initialize an empty ledger.
+
+		Args:
+			candidates: Names that can be voted for.
+			voter_names: Voter key -> display name, for everyone allowed to vote.
+			allow_abstain: Whether ABSTAIN is accepted as a choice.
+		"""
+		self.candidates = list(candidates)
+		self.allow_abstain = allow_abstain
+		self.voter_names = voter_names
+		choices = self.candidates + ([ABSTAIN] if allow_abstain else [])
+		self.votes: dict[Hashable, str] = {}
+		self.voters: dict[str, set[Hashable]] = {name: set() for name in choices}
+		self.counts: dict[str, int] = {name: 0 for name in choices}
+		# Count -> candidates with exactly that many votes (0 left out).
+		self._buckets: dict[int, set[str]] = {}
+		self.top = 0
+		self._lines: dict[str, str] = {}
+		self._tally: str | None = NO_VOTES
+
+	def __contains__(self, voter: Hashable) -> bool:
+		return voter in self.votes
+
+	def __len__(self) -> int:
+		return len(self.votes)
+
+	def _move(self, choice: str, delta: int):
+		"""Add `delta` (+1 or -1) to a choice's count, keeping the buckets and top in step."""
+		old = self.counts[choice]
+		new = old + delta
+		self.counts[choice] = new
+		voters = self.voters[choice]
+		self._lines.pop(choice, None)
+		if voters:
+			names = sorted(self.voter_names.get(voter, "Unknown") for voter in voters)
+			self._lines[choice] = f"- {choice}: {', '.join(names)} ({len(voters)})"
+		if choice == ABSTAIN and self.allow_abstain:
+			return
+
+		if old:
+			self._buckets[old].discard(choice)
+			if not self._buckets[old]:
+				del self._buckets[old]
+		if new:
+			self._buckets.setdefault(new, set()).add(choice)
+		if new > self.top:
+			self.top = new
+		elif old == self.top and old not in self._buckets:
+			# The only leader lost a vote, so the next count down leads.
+			self.top = new
+
+	def cast(self, voter: Hashable, choice: str) -> bool:
+		"""Record (or change) a vote.
+
+		Args:
+			voter: The voter's key.
+			choice: A candidate name, or ABSTAIN if allowed.
+
+		Returns:
+			False if the choice isn't valid or is the voter's current vote,
+			so nothing changed.  True otherwise.
+
+		Side effects:
+			Invalidates the cached tally text.
+		"""
+		if choice not in self.counts:
+			return False
+		previous = self.votes.get(voter)
+		if previous == choice:
+			return False
+		self.votes[voter] = choice
+		if previous is not None:
+			self.voters[previous].discard(voter)
+			self._move(previous, -1)
+		self.voters[choice].add(voter)
+		self._move(choice, 1)
+		self._tally = None
+		return True
+
+	@property
+	def leading(self) -> set[str]:
+		return self._buckets.get(self.top, set())
+
+	def leader(self) -> str | None:
+		"""Return the candidate with the most votes, or None if nobody has votes or there's a tie."""
+		leading = self.leading
+		if len(leading) != 1:
+			return None
+		return next(iter(leading))
+
+	def is_tie(self) -> bool:
+		"""Whether two or more candidates share the most votes."""
+		return len(self.leading) > 1
+
+	def majority_reached(self, threshold: int) -> bool:
+		"""Whether the leading candidates have at least `threshold` votes."""
+		return self.top >= threshold
+
+	def abstain_wins(self) -> bool:
+		"""Whether abstaining has at least as many votes as every candidate.
+
+		With nobody voting at all this is True, so the vote has no outcome.
+		"""
+		return self.allow_abstain and self.counts[ABSTAIN] >= self.top
+
+	def tally(self) -> str:
+		"""Return the tally as '- Name: Voter1, Voter2 (2)' lines, abstain last.
+
+		Only the lines of choices whose votes changed are rebuilt.
+		"""
+		if self._tally is None:
+			order = self.candidates + ([ABSTAIN] if self.allow_abstain else [])
+			lines = [self._lines[name] for name in order if name in self._lines]
+			self._tally = "\n".join(lines) if lines else NO_VOTES
+		return self._tally
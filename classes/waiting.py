@@ -0,0 +1,55 @@
+"""Waiting for human input without polling.
+
+Votes and night actions wait for every expected human to click before
+moving on.  A PendingInputs is shared between the Discord component
+callbacks, which mark each user as they respond, and the phase, which
+waits on an asyncio.Event that is set the moment the last one does.
+"""
+
+import asyncio
+from typing import Iterable
+
+class PendingInputs:
+	"""The users a phase is still waiting on.
+
+	Attributes:
+		pending: IDs of users who haven't responded yet.
+		received: IDs of users who have.
+	"""
+
+	def __init__(self, expected: Iterable[int] = ()):
+		self.pending: set[int] = set(expected)
+		self.received: set[int] = set()
+		self._done = asyncio.Event()
+		self._check()
+
+	def _check(self):
+		if not self.pending:
+			self._done.set()
+
+	@property
+	def done(self) -> bool:
+		return self._done.is_set()
+
+	def mark(self, user_id: int):
+		"""Record that a user has responded (again, for a changed vote)."""
+		self.received.add(user_id)
+		self.pending.discard(user_id)
+		self._check()
+
+	def skip(self, user_id: int):
+		"""Stop waiting for a user who can't respond (e.g. has no action left)."""
+		self.pending.discard(user_id)
+		self._check()
+
+	async def wait(self, timeout: float) -> bool:
+		"""Wait until nobody is pending, for at most `timeout` seconds.
+
+		Returns:
+			True if everyone responded, False if time ran out first.
+		"""
+		try:
+			await asyncio.wait_for(self._done.wait(), max(0.0, timeout))
+			return True
+		except TimeoutError:
+			return self.done
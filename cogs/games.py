@@ -2,8 +2,9 @@
 
 from discord.ext import commands
 from discord import app_commands
-import discord, json, os
+import discord, os
 from classes.player import AIAbstraction
+from classes.registry import MODELS
 from main import BotWithAbstractors
 
 class GamesCog(commands.Cog):
@@ -38,7 +39,7 @@ class GamesCog(commands.Cog):
 
 				scheduler = getattr(abstractor.game, "scheduler", None)
 				if scheduler and scheduler.lobby:
-					await scheduler.message.edit(embed=scheduler.lobby.generate_embed(), view=scheduler.lobby)
+					scheduler.editor.update(embed=scheduler.lobby.generate_embed(), view=scheduler.lobby)
 				await interaction.response.send_message(f"Kicked {player.mention} from the game.")
 			else:
 				await interaction.response.send_message("You need to be the owner of this game to kick players.", ephemeral=True)
@@ -74,22 +75,13 @@ class GamesCog(commands.Cog):
 		abstractor.players.clear()
 		abstractor.players.update(humans)
 
-		try:
-			with open("models.json") as f:
-				m_data = json.load(f)
-				llama_meta = next((m for m in m_data["models"] if m["model"] == "llama-4-maverick"), None)
-				avatar_format = m_data["avatar_template"]
-		except Exception:
-			await interaction.response.send_message("Failed to load models.json", ephemeral=True)
-			return
-
+		llama_meta = MODELS.get("llama-4-maverick")
 		if not llama_meta:
 			await interaction.response.send_message("Llama 4 model not found in models.json", ephemeral=True)
 			return
 
 		for i in range(10):
-			avatar = llama_meta.get("avatar") or llama_meta.get("avatar_url")
-			ai_user = AIAbstraction(llama_meta["model"], llama_meta["name"], avatar_format.format(avatar))
+			ai_user = AIAbstraction(llama_meta.model, llama_meta.name, llama_meta.avatar_url)
 			abstractor.players[hash(f"{ai_user.name}_{i}")] = ai_user.player
 
 		scheduler = getattr(abstractor.game, "scheduler", None)
@@ -111,7 +103,7 @@ class GamesCog(commands.Cog):
 			scheduler.config["models"] = ["llama-4-maverick"]
 
 			# Re-generate embed after config changes to ensure counts are right
-			await scheduler.message.edit(embed=scheduler.lobby.generate_embed(), view=scheduler.lobby)
+			scheduler.editor.update(embed=scheduler.lobby.generate_embed(), view=scheduler.lobby)
 			await interaction.response.send_message("Replaced AIs with 10 Llama 4 players.")
 		else:
 			await interaction.response.send_message("Lobby initialized with 10 Llama 4 players (Note: embed update failed).")
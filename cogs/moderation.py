@@ -73,10 +73,9 @@ class ModerationCog(commands.Cog):
 				return
 
 			channel = interaction.channel
-			config = data.load()
 
 			assert channel is not None
-			if str(channel.id) in config.get("profiles", {}):
+			if data.has_profile(channel.id):
 				await interaction.response.send_message(f"The game is already set up in <#{channel.id}>.", ephemeral=True)
 				return
 
@@ -93,17 +92,12 @@ class ModerationCog(commands.Cog):
 			)
 
 			webhook: discord.Webhook = await channel.create_webhook(name="AI Plays Mafia", reason="Required for sending AI messages")
-			config.setdefault("profiles", {})[str(channel.id)] = {"webhook": webhook.url}
-
-			guild_id_str = str(guild.id)
-			guilds_config = config.setdefault("guilds", {})
-			guild_config = guilds_config.get(guild_id_str, {})
-			player_role_id = guild_config.get("player_role")
+			player_role_id = data.get_guild(guild.id).get("player_role")
 			player = guild.get_role(player_role_id) if player_role_id else None
 
 			if player is None:
 				player = await guild.create_role(name="Mafia Player")
-				guilds_config[guild_id_str] = {"player_role": player.id}
+				data.update_guild(guild.id, player_role=player.id)
 
 			await channel.set_permissions(
 				player,
@@ -115,9 +109,9 @@ class ModerationCog(commands.Cog):
 				use_application_commands=False
 			)
 
-			self.bot.abstractors.append(GameAbstractor(channel.id, self.bot))
+			data.update_profile(channel.id, webhook=webhook.url)
+			self.bot.add_abstractor(GameAbstractor(channel.id, self.bot))
 
-			data.save(config)
 			data.update_game_status(self.bot)
 
 			await interaction.response.send_message(f"Mafia game set up in <#{channel.id}>!", ephemeral=True)
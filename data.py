@@ -1,34 +1,431 @@
-"""Simple JSON file persistence for bot configuration.
+"""Persistence for bot configuration.
 
 Stores channel profiles, webhook URLs, guild configs, and lobby state
-in data.json.  Uses a read-modify-write pattern.
+in data.json, or optionally in a SQLite database (DATA_BACKEND=sqlite).
+The data is read once into a process-wide ConfigStore; reads are served
+from memory, and changes are batched into debounced background writes
+(flushed on shutdown).
 """
 
-import json, logging, os
+import asyncio, json, logging, os, sqlite3, stat, tempfile, threading
 
 logger = logging.getLogger(__name__)
 
+DATA_FILE = "data.json"
+DATA_DB = "data.db"
+
+# Seconds to wait after a change before writing, so bursts of changes
+# (e.g. several lobby bumps) are written once.
+WRITE_DELAY = 2.0
+
+# The process umask, for the mode a newly created data.json would get.
+# (Read once here: os.umask() can only be read by setting it, which isn't
+# safe from the writer thread.)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+class JSONBackend:
+	"""Reads and writes the whole config as a single JSON file."""
+
+	def __init__(self, path: str = DATA_FILE):
+		self.path = path
+
+	def load(self) -> dict:
+		"""Load config from disk, creating an empty file if it doesn't exist."""
+		try:
+			with open(self.path, "r") as f:
+				return json.load(f) or {}
+		except (FileNotFoundError, json.JSONDecodeError):
+			with open(self.path, "w") as f:
+				f.write("{}")
+			return {}
+
+	def prepare(self, config: dict, dirty: set[tuple[str, str]]) -> str:
+		"""Serialize a consistent snapshot.  Runs on the event loop thread."""
+		return json.dumps(config)
+
+	def write(self, payload: str):
+		"""Atomically replace the file (temp file + fsync + rename).  Runs in a worker thread.
+
+		The file keeps its permissions (mkstemp creates the temp file 0600).
+		"""
+		directory = os.path.dirname(os.path.abspath(self.path))
+		try:
+			mode = stat.S_IMODE(os.stat(self.path).st_mode)
+		except FileNotFoundError:
+			mode = 0o666 & ~_UMASK
+		fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".data-", suffix=".tmp")
+		try:
+			with os.fdopen(fd, "w") as f:
+				os.chmod(tmp_path, mode)
+				f.write(payload)
+				f.flush()
+				os.fsync(f.fileno())
+			os.replace(tmp_path, self.path)
+		except BaseException:
+			try:
+				os.unlink(tmp_path)
+			except OSError:
+				pass
+			raise
+
+		try:
+			dir_fd = os.open(directory, os.O_RDONLY)
+		except OSError:
+			return  # e.g. Windows, where directories can't be opened
+		try:
+			os.fsync(dir_fd)
+		finally:
+			os.close(dir_fd)
+
+# Dirty marker for a config replaced wholesale.
+REPLACED = ("all", "")
+
+# Dirty section -> (SQLite table, key column).
+_TABLES = {"profiles": ("profiles", "channel_id"), "lobby": ("lobby_state", "channel_id"), "guilds": ("guilds", "guild_id")}
+
+class SQLiteBackend:
+	"""Stores the config in SQLite (WAL mode), one row per channel/guild.
+
+	Tables:
+		profiles: channel_id -> webhook (plus any other profile fields as JSON).
+		guilds: guild_id -> player_role (plus any other guild fields as JSON).
+		lobby_state: channel_id -> last_lobby.
+
+	Only rows that changed since the last write are upserted, so a lobby
+	bump writes a single lobby_state row.  Rows whose profile or guild is
+	gone (e.g. dropped by replace()) are deleted in the same transaction,
+	so a load returns what was written, as with JSONBackend.  On first use,
+	an existing data.json is imported once.
+	"""
+
+	def __init__(self, path: str = DATA_DB, legacy_path: str = DATA_FILE):
+		self.path = path
+		self.legacy_path = legacy_path
+		self._lock = threading.Lock()
+		self._conn: sqlite3.Connection | None = None
+
+	def _connect(self) -> sqlite3.Connection:
+		if self._conn is None:
+			conn = sqlite3.connect(self.path, check_same_thread=False)
+			conn.execute("PRAGMA journal_mode=WAL")
+			conn.execute("PRAGMA synchronous=NORMAL")
+			conn.executescript("""
+				CREATE TABLE IF NOT EXISTS profiles (channel_id TEXT PRIMARY KEY, webhook TEXT, extra TEXT NOT NULL DEFAULT '{}');
+				CREATE TABLE IF NOT EXISTS guilds (guild_id TEXT PRIMARY KEY, player_role INTEGER, extra TEXT NOT NULL DEFAULT '{}');
+				CREATE TABLE IF NOT EXISTS lobby_state (channel_id TEXT PRIMARY KEY, last_lobby INTEGER);
+				CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+			""")
+			self._conn = conn
+		return self._conn
+
+	def load(self) -> dict:
+		"""Read every row into the config dict shape used by ConfigStore."""
+		with self._lock:
+			conn = self._connect()
+			self._migrate(conn)
+
+			config: dict = {"profiles": {}, "guilds": {}}
+			for channel_id, webhook, extra in conn.execute("SELECT channel_id, webhook, extra FROM profiles"):
+				profile = json.loads(extra)
+				if webhook is not None:
+					profile["webhook"] = webhook
+				config["profiles"][channel_id] = profile
+			for channel_id, last_lobby in conn.execute("SELECT channel_id, last_lobby FROM lobby_state"):
+				config["profiles"].setdefault(channel_id, {})["last_lobby"] = last_lobby
+			for guild_id, player_role, extra in conn.execute("SELECT guild_id, player_role, extra FROM guilds"):
+				guild = json.loads(extra)
+				if player_role is not None:
+					guild["player_role"] = player_role
+				config["guilds"][guild_id] = guild
+			return config
+
+	def _migrate(self, conn: sqlite3.Connection):
+		"""Import data.json once, the first time the database is opened."""
+		if conn.execute("SELECT 1 FROM meta WHERE key = 'migrated'").fetchone():
+			return
+
+		legacy = {}
+		try:
+			with open(self.legacy_path, "r") as f:
+				legacy = json.load(f) or {}
+		except (FileNotFoundError, json.JSONDecodeError):
+			pass
+
+		rows = [("profiles", key, fields) for key, fields in legacy.get("profiles", {}).items()]
+		rows += [("lobby", key, fields) for key, fields in legacy.get("profiles", {}).items()]
+		rows += [("guilds", key, fields) for key, fields in legacy.get("guilds", {}).items()]
+		with conn:
+			self._upsert(conn, rows)
+			conn.execute("INSERT INTO meta (key, value) VALUES ('migrated', ?)", (self.legacy_path,))
+		if rows:
+			logger.info("Migrated %i profiles and %i guilds from %s", len(legacy.get("profiles", {})), len(legacy.get("guilds", {})), self.legacy_path)
+
+	def prepare(self, config: dict, dirty: set[tuple[str, str]]) -> list[tuple[str, str, dict | None]]:
+		"""Copy out only the dirty rows.  Runs on the event loop thread.
+
+		A row whose key is no longer in the config is copied out as None,
+		to be deleted.  After replace() every row is copied, preceded by
+		the keys to keep, so that rows for anything else are deleted.
+		"""
+		rows: list[tuple[str, str, dict | None]] = []
+		if REPLACED in dirty:
+			profiles, guilds = config.get("profiles", {}), config.get("guilds", {})
+			rows.append(("keep", "", {"profiles": set(profiles), "guilds": set(guilds)}))
+			dirty = {(section, key) for key in profiles for section in ("profiles", "lobby")} | {("guilds", key) for key in guilds}
+		for section, key in dirty:
+			source = config.get("guilds" if section == "guilds" else "profiles", {})
+			rows.append((section, key, dict(source[key]) if key in source else None))
+		return rows
+
+	def write(self, payload: list[tuple[str, str, dict | None]]):
+		"""Upsert (and delete) the given rows in one transaction.  Runs in a worker thread."""
+		with self._lock:
+			conn = self._connect()
+			with conn:
+				self._upsert(conn, payload)
+
+	def _upsert(self, conn: sqlite3.Connection, rows: list[tuple[str, str, dict | None]]):
+		for section, key, fields in rows:
+			if section == "keep":
+				assert fields is not None
+				for section, (table, column) in _TABLES.items():
+					keep = fields["guilds" if section == "guilds" else "profiles"]
+					stale = [(row,) for (row,) in conn.execute(f"SELECT {column} FROM {table}") if row not in keep]
+					conn.executemany(f"DELETE FROM {table} WHERE {column} = ?", stale)
+			elif fields is None or (section == "lobby" and "last_lobby" not in fields):
+				table, column = _TABLES[section]
+				conn.execute(f"DELETE FROM {table} WHERE {column} = ?", (key,))
+			elif section == "lobby":
+				conn.execute(
+					"INSERT INTO lobby_state (channel_id, last_lobby) VALUES (?, ?) ON CONFLICT(channel_id) DO UPDATE SET last_lobby = excluded.last_lobby",
+					(key, fields.get("last_lobby"))
+				)
+			elif section == "profiles":
+				extra = {k: v for k, v in fields.items() if k not in ("webhook", "last_lobby")}
+				conn.execute(
+					"INSERT INTO profiles (channel_id, webhook, extra) VALUES (?, ?, ?) ON CONFLICT(channel_id) DO UPDATE SET webhook = excluded.webhook, extra = excluded.extra",
+					(key, fields.get("webhook"), json.dumps(extra))
+				)
+			elif section == "guilds":
+				extra = {k: v for k, v in fields.items() if k != "player_role"}
+				conn.execute(
+					"INSERT INTO guilds (guild_id, player_role, extra) VALUES (?, ?, ?) ON CONFLICT(guild_id) DO UPDATE SET player_role = excluded.player_role, extra = excluded.extra",
+					(key, fields.get("player_role"), json.dumps(extra))
+				)
+
+	def close(self):
+		with self._lock:
+			if self._conn is not None:
+				self._conn.close()
+				self._conn = None
+
+def default_backend():
+	"""Pick the backend named by DATA_BACKEND ('json', the default, or 'sqlite')."""
+	if os.getenv("DATA_BACKEND", "json").lower() == "sqlite":
+		return SQLiteBackend(os.getenv("DATA_DB", DATA_DB))
+	return JSONBackend()
+
+class ConfigStore:
+	"""In-memory config with write-behind persistence.
+
+	The config is loaded from the backend on first access and then only
+	read from memory.  Mutations mark the touched profile/guild as dirty
+	and schedule a write WRITE_DELAY seconds later; further mutations in
+	that window are folded into the same write.
+
+	Dirty entries are (section, key) pairs, where section is 'profiles',
+	'lobby' (a profile's last_lobby field) or 'guilds', plus REPLACED after
+	replace(), since any entry may then have been added or removed.
+
+	Attributes:
+		backend: Object with load(), prepare(config, dirty) and write(payload).
+			Picked by default_backend() on first use if not given.
+		writes: Number of completed background writes.
+	"""
+
+	def __init__(self, backend=None):
+		self.backend = backend
+		self.writes = 0
+		self._config: dict | None = None
+		self._dirty: set[tuple[str, str]] = set()
+		self._write_handle: asyncio.TimerHandle | None = None
+		self._write_task: asyncio.Task | None = None
+
+	@property
+	def config(self) -> dict:
+		"""The full config dict, loaded from the backend on first access."""
+		if self._config is None:
+			self._config = self._get_backend().load()
+		return self._config
+
+	def _get_backend(self):
+		if self.backend is None:
+			self.backend = default_backend()
+		return self.backend
+
+	async def open(self):
+		"""Load the config in a worker thread, so the first read doesn't block the loop."""
+		if self._config is None:
+			backend = self._get_backend()
+			self._config = await asyncio.to_thread(backend.load)
+
+	def get_profile(self, channel_id: int | str) -> dict:
+		"""Return a copy of a channel's profile, or {} if it isn't set up."""
+		return dict(self.config.get("profiles", {}).get(str(channel_id), {}))
+
+	def has_profile(self, channel_id: int | str) -> bool:
+		"""Return True if /setup has been run in the channel."""
+		return str(channel_id) in self.config.get("profiles", {})
+
+	def profile_ids(self) -> list[int]:
+		"""Return the IDs of every configured channel."""
+		return [int(channel) for channel in self.config.get("profiles", {})]
+
+	def update_profile(self, channel_id: int | str, **fields):
+		"""Set fields on a channel's profile, creating it if needed."""
+		key = str(channel_id)
+		self.config.setdefault("profiles", {}).setdefault(key, {}).update(fields)
+		if "last_lobby" in fields:
+			self._mark_dirty("lobby", key)
+		if fields.keys() - {"last_lobby"}:
+			self._mark_dirty("profiles", key)
+
+	def get_guild(self, guild_id: int | str) -> dict:
+		"""Return a copy of a guild's config, or {} if it has none."""
+		return dict(self.config.get("guilds", {}).get(str(guild_id), {}))
+
+	def update_guild(self, guild_id: int | str, **fields):
+		"""Set fields on a guild's config, creating it if needed."""
+		key = str(guild_id)
+		self.config.setdefault("guilds", {}).setdefault(key, {}).update(fields)
+		self._mark_dirty("guilds", key)
+
+	def replace(self, config: dict):
+		"""Replace the whole config (the legacy save() path)."""
+		self._config = config
+		self._dirty.add(REPLACED)
+		self._schedule_write()
+
+	def _mark_dirty(self, section: str, key: str):
+		self._dirty.add((section, key))
+		self._schedule_write()
+
+	def _schedule_write(self):
+		"""Arrange for a background write, or write now if no loop is running."""
+		try:
+			loop = asyncio.get_running_loop()
+		except RuntimeError:
+			self.flush_sync()
+			return
+
+		if self._write_handle is None:
+			self._write_handle = loop.call_later(WRITE_DELAY, self._start_write)
+
+	def _start_write(self):
+		self._write_handle = None
+		if self._write_task and not self._write_task.done():
+			# A write is still in progress; try again once it's had time to finish.
+			self._schedule_write()
+			return
+		self._write_task = asyncio.create_task(self._write())
+
+	def _take_payload(self):
+		"""Snapshot the config and clear the dirty set.  Returns None if clean."""
+		if not self._dirty or self._config is None:
+			return None
+		payload = self.backend.prepare(self._config, self._dirty)
+		self._dirty = set()
+		return payload
+
+	async def _write(self):
+		payload = self._take_payload()
+		if payload is None:
+			return
+		logger.info("Saving data to disk...")
+		try:
+			await asyncio.to_thread(self.backend.write, payload)
+			self.writes += 1
+		except Exception:
+			logger.exception("Failed to save data")
+
+	async def close(self):
+		"""Flush pending changes and release the backend (e.g. the database connection)."""
+		await self.flush()
+		if self.backend is not None and hasattr(self.backend, "close"):
+			await asyncio.to_thread(self.backend.close)
+
+	async def flush(self):
+		"""Write any pending changes now and wait for them to land."""
+		if self._write_handle:
+			self._write_handle.cancel()
+			self._write_handle = None
+		if self._write_task:
+			await self._write_task
+		await self._write()
+
+	def flush_sync(self):
+		"""Write any pending changes on the calling thread."""
+		payload = self._take_payload()
+		if payload is not None:
+			self.backend.write(payload)
+			self.writes += 1
+
+store = ConfigStore()
+
 def save(data: dict):
-	"""Write the entire config dict to data.json, overwriting previous contents."""
-	logger.info("Saving data to disk...")
-	with open("data.json", "w") as f:
-		json.dump(data, f)
+	"""Replace the entire config dict and schedule it to be written."""
+	store.replace(data)
+
+async def init():
+	"""Load the config off the event loop.  Call once at startup."""
+	await store.open()
 
 def load():
-	"""Load config from data.json, creating an empty file if it doesn't exist."""
-	try:
-		with open("data.json", "r") as f:
-			return json.load(f) or {}
-	except (FileNotFoundError, json.JSONDecodeError):
-		with open("data.json", "w") as f:
-			f.write("{}")
-		return {}
+	"""Return the config dict (loaded from the backend on first use).
+
+	Prefer the per-channel and per-guild accessors below, which don't
+	expose the whole dict.
+	"""
+	return store.config
+
+def get_profile(channel_id: int | str) -> dict:
+	"""Return a copy of a channel's profile, or {} if it isn't set up."""
+	return store.get_profile(channel_id)
+
+def has_profile(channel_id: int | str) -> bool:
+	"""Return True if /setup has been run in the channel."""
+	return store.has_profile(channel_id)
+
+def profile_ids() -> list[int]:
+	"""Return the IDs of every configured channel."""
+	return store.profile_ids()
+
+def update_profile(channel_id: int | str, **fields):
+	"""Set fields on a channel's profile and schedule a write."""
+	store.update_profile(channel_id, **fields)
+
+def get_guild(guild_id: int | str) -> dict:
+	"""Return a copy of a guild's config, or {} if it has none."""
+	return store.get_guild(guild_id)
+
+def update_guild(guild_id: int | str, **fields):
+	"""Set fields on a guild's config and schedule a write."""
+	store.update_guild(guild_id, **fields)
+
+async def flush():
+	"""Write any pending config changes."""
+	await store.flush()
+
+async def close():
+	"""Write any pending config changes and close the backend.  Call before shutting down."""
+	await store.close()
 
 def update_game_status(bot):
 	"""Updates the games_ongoing.txt file based on whether any games are currently running."""
 	running = any(abstractor.running for abstractor in getattr(bot, "abstractors", []))
 	status = "1" if running else "0"
-	
+
 	try:
 		if os.path.exists("games_ongoing.txt"):
 			with open("games_ongoing.txt", "r") as f:
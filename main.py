@@ -12,12 +12,12 @@ from discord.ext import commands
 from dotenv import load_dotenv
 
 from classes.abstractor import GameAbstractor
+from classes.pool import POOL
+from classes.router import MessageRouter
 from logging_utils import WebhookLoggingHandler
 
 load_dotenv()
 
-config = data.load()
-
 intents = discord.Intents.default()
 intents.message_content = True
 
@@ -25,6 +25,20 @@ class BotWithAbstractors(commands.Bot):
 	def __init__(self):
 		super().__init__(command_prefix="", intents=intents)
 		self.abstractors: list[GameAbstractor] = []
+		self.router = MessageRouter()
+
+	def add_abstractor(self, abstractor: GameAbstractor):
+		"""Track a new abstractor and route its channel's messages to it."""
+		self.abstractors.append(abstractor)
+		self.router.register(abstractor.channel, abstractor)
+
+	async def close(self):
+		"""Stop every abstractor's inbox worker, flush config and close OpenAI connections before disconnecting."""
+		await asyncio.gather(*(abstractor.close() for abstractor in self.abstractors))
+		await data.close()
+		await POOL.close()
+		logger.info("OpenAI connections:\n%s", POOL.report())
+		await super().close()
 
 bot = BotWithAbstractors()
 logger = logging.getLogger(__name__)
@@ -43,19 +57,24 @@ async def on_ready():
 
 	logger.info(f"Logged in as {bot.user}!")
 
-	profiles = config.get("profiles", {})
 	tasks = []
-	for channel in profiles:
-		abstractor = GameAbstractor(int(channel), bot)
+	for channel in data.profile_ids():
+		abstractor = GameAbstractor(channel, bot)
 		tasks.append(abstractor.on_message(True)) # Force a lobby refresh since the button's stale (from last session)
-		bot.abstractors.append(abstractor)
+		bot.add_abstractor(abstractor)
 	await asyncio.gather(*tasks)
 	logger.info("Loading game abstractors, total %i", len(bot.abstractors))
 	data.update_game_status(bot)
 
 @bot.event
 async def setup_hook():
-	"""Register cogs and sync slash commands on bot startup."""
+	"""Load config, create the OpenAI client, register cogs and sync slash commands on bot startup."""
+	await data.init()
+	try:
+		POOL.get()
+	except Exception as exc:
+		logger.error("Could not create the OpenAI client: %s", exc)
+
 	from cogs.moderation import ModerationCog
 	from cogs.info import InfoCog
 	from cogs.games import GamesCog
@@ -79,11 +98,7 @@ async def on_message(message: discord.Message):
 	if message.content.startswith("!eval") and message.author.id == 1337909802931716197:
 		code = message.content[6:].strip()
 		try:
-			abstractor = None
-			for abs in bot.abstractors:
-				if abs.channel == message.channel.id:
-					abstractor = abs
-					break
+			abstractor = bot.router.get(message.channel.id)
 			wrapped_code = "async def _eval(bot, message, discord, asyncio, __import__, abstractor):\n" + "\n".join(f"    {line}" for line in code.split("\n")) + "\n    return None"
 			globals_dict = {}
 			exec(wrapped_code, globals_dict)
@@ -93,8 +108,7 @@ async def on_message(message: discord.Message):
 			await message.channel.send(f"Error:\n```python\n{traceback.format_exc()}\n```")
 		return
 
-	for abstractor in bot.abstractors:
-		await abstractor.on_message(message)
+	bot.router.route(message)
 
 if __name__ == "__main__":
 	TOKEN = os.getenv("TOKEN")
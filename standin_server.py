@@ -0,0 +1,291 @@
+"""Local stand-in for an OpenAI-compatible chat completions API.
+
+Answers well enough for a whole game to be played against it: votes and
+night actions pick one of the offered options (as text, JSON schema or a
+tool call, whichever the request asks for), the discussion analyser
+gets a plausible mention list, and speech is canned chatter naming other
+players.  Latency, jitter and error rate are configurable, so endpoint
+routing, retries, hedging and timeouts can be exercised without a real
+provider.
+
+/v1/responses keeps conversations in memory for stateful models (see
+classes/conversation.py); --forget-rate makes it lose some of them, as a
+real provider might.  Like a provider's prompt cache, it reports the
+longest message prefix it has seen before as cached_tokens.
+
+Usage:
+	python standin_server.py --port 8088 --latency 0.5 --error-rate 0.1
+
+then point OPENAI_BASE_URL at http://localhost:8088/v1, or add it as an
+endpoint in models.json (see classes/endpoints.py).
+"""
+
+import argparse, asyncio, hashlib, json, logging, random, re, time, uuid
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+SPEECHES = [
+	"I'm not sure yet, but {name} has been very quiet.",
+	"{name}, what do you think happened last night?",
+	"I trust {name} for now. Let's hear from everyone else.",
+	"Something about {name}'s last message feels off to me.",
+	"We should be careful not to rush this vote.",
+]
+
+def _names(messages: list[dict]) -> list[str]:
+	"""Collect player names from 'Name: message' lines and option lists."""
+	names = set()
+	for message in messages:
+		for line in str(message.get("content") or "").splitlines():
+			match = re.match(r"^\s*-\s+(.+?)\s*$", line) or re.match(r"^([A-Z][\w .]{0,30}?): ", line)
+			if match:
+				names.add(match.group(1))
+	return sorted(names) or ["everyone"]
+
+def _options(prompt: str) -> list[str]:
+	"""Return the options listed after 'OPTIONS:' or 'Available options:' in a prompt."""
+	lines = prompt.split("OPTIONS:", 1)[-1] if "OPTIONS:" in prompt else prompt.split("Available options:", 1)[-1]
+	options = [re.sub(r"^\s*-\s*", "", line).strip() for line in lines.splitlines()]
+	return [o for o in options if o]
+
+def _enum(body: dict) -> list[str] | None:
+	"""Return the choice enum of a structured output request, if it is one."""
+	if body.get("tools"):
+		schema = body["tools"][0]["function"]["parameters"]
+	elif (body.get("response_format") or {}).get("type") == "json_schema":
+		schema = body["response_format"]["json_schema"]["schema"]
+	else:
+		return None
+	return schema["properties"]["choice"]["enum"]
+
+def reply(messages: list[dict]) -> str:
+	"""Produce a canned reply appropriate to the last message."""
+	last = str(messages[-1].get("content") or "") if messages else ""
+	if "OPTIONS:" in last or "Available options:" in last:
+		options = _options(last)
+		return random.choice(options) if options else "abstain"
+	if "Alive players:" in last:
+		names = [n.strip(" -") for n in last.split("Alive players:", 1)[1].split("Speaker:", 1)[0].splitlines() if n.strip(" -")]
+		if not names or random.random() < 0.5:
+			return "NONE"
+		return f"{random.choice(names)}:{random.choice(['ACCUSED', 'ASKED', 'CASUAL'])}"
+	if messages and "summar" in str(messages[0].get("content") or "").lower():
+		return "Earlier, the players discussed who seemed suspicious, without agreeing."
+	return random.choice(SPEECHES).format(name=random.choice(_names(messages)))
+
+def _tokens(message: dict) -> int:
+	return len(str(message.get("content") or "")) // 4 + 4
+
+# Most message prefixes remembered for the simulated prompt cache.
+CACHE_SIZE = 100_000
+
+class StandinServer:
+	"""aiohttp application serving /v1/chat/completions, /v1/responses and /v1/models.
+
+	Attributes:
+		latency: Mean seconds before answering.
+		jitter: Maximum extra random delay in seconds.
+		error_rate: Fraction of requests answered with a 500 (or 429).
+		forget_rate: Fraction of stored conversations lost before their
+			next use.
+		requests: Requests served so far.
+		messages_received: Input messages received by /v1/responses.
+		conversations: Response ID -> the whole conversation up to and
+			including that response.
+	"""
+
+	def __init__(self, latency: float = 0.2, jitter: float = 0.1, error_rate: float = 0.0, forget_rate: float = 0.0):
+		self.latency = latency
+		self.jitter = jitter
+		self.error_rate = error_rate
+		self.forget_rate = forget_rate
+		self.requests = 0
+		self.messages_received = 0
+		self.conversations: dict[str, list[dict]] = {}
+		self.prefixes: set[str] = set()
+		self.app = web.Application()
+		self.app.add_routes([
+			web.post("/v1/chat/completions", self.chat_completions),
+			web.post("/v1/responses", self.responses),
+			web.get("/v1/models", self.models),
+		])
+
+	def _usage(self, messages: list[dict], content: str) -> dict:
+		"""Usage for a request, with the longest previously seen prefix counted as cached."""
+		digest = hashlib.sha256()
+		cached = seen = 0
+		for message in messages:
+			digest.update(json.dumps([message.get("role"), message.get("content")]).encode())
+			key = digest.hexdigest()
+			seen += _tokens(message)
+			if key in self.prefixes:
+				cached = seen
+			self.prefixes.add(key)
+		if len(self.prefixes) > CACHE_SIZE:
+			self.prefixes.clear()
+		prompt_tokens = sum(_tokens(m) for m in messages)
+		completion_tokens = len(content) // 4 + 1
+		return {
+			"prompt_tokens": prompt_tokens,
+			"completion_tokens": completion_tokens,
+			"total_tokens": prompt_tokens + completion_tokens,
+			"prompt_tokens_details": {"cached_tokens": cached},
+		}
+
+	async def _delay(self):
+		await asyncio.sleep(self.latency + random.uniform(0, self.jitter))
+
+	async def models(self, request: web.Request) -> web.Response:
+		return web.json_response({"object": "list", "data": [{"id": "standin", "object": "model", "owned_by": "standin"}]})
+
+	async def chat_completions(self, request: web.Request) -> web.StreamResponse:
+		self.requests += 1
+		body = await request.json()
+		await self._delay()
+		if random.random() < self.error_rate:
+			status = random.choice([429, 500, 503])
+			return web.json_response({"error": {"message": "Simulated failure", "type": "standin_error"}}, status=status)
+
+		model = body.get("model", "standin")
+		messages = body.get("messages", [])
+		enum = _enum(body)
+		content = json.dumps({"choice": random.choice(enum)}) if enum else reply(messages)
+		usage = self._usage(messages, content)
+		completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+		created = int(time.time())
+
+		if not body.get("stream"):
+			message = {"role": "assistant", "content": content}
+			if body.get("tools"):
+				name = body["tools"][0]["function"]["name"]
+				message = {"role": "assistant", "content": None, "tool_calls": [
+					{"id": f"call_{uuid.uuid4().hex[:12]}", "type": "function", "function": {"name": name, "arguments": content}}
+				]}
+			return web.json_response({
+				"id": completion_id,
+				"object": "chat.completion",
+				"created": created,
+				"model": model,
+				"choices": [{"index": 0, "message": message, "finish_reason": "tool_calls" if body.get("tools") else "stop"}],
+				"usage": usage,
+			})
+
+		response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+		await response.prepare(request)
+		words = re.findall(r"\S+\s*", content)
+		for i, word in enumerate(words):
+			delta = {"role": "assistant", "content": word} if i == 0 else {"content": word}
+			chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+				"choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+			await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+			await asyncio.sleep(self.latency / max(len(words), 1))
+		final = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+			"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+		await response.write(f"data: {json.dumps(final)}\n\n".encode())
+		if (body.get("stream_options") or {}).get("include_usage"):
+			usage_chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model, "choices": [], "usage": usage}
+			await response.write(f"data: {json.dumps(usage_chunk)}\n\n".encode())
+		await response.write(b"data: [DONE]\n\n")
+		await response.write_eof()
+		return response
+
+	async def responses(self, request: web.Request) -> web.StreamResponse:
+		"""Responses API subset: text or function call output, previous_response_id, streaming."""
+		self.requests += 1
+		body = await request.json()
+		await self._delay()
+		if random.random() < self.error_rate:
+			return web.json_response({"error": {"message": "Simulated failure", "type": "standin_error"}}, status=500)
+
+		new = body.get("input") or []
+		if isinstance(new, str):
+			new = [{"role": "user", "content": new}]
+		self.messages_received += len(new)
+		previous = body.get("previous_response_id")
+		if previous and random.random() < self.forget_rate:
+			self.conversations.pop(previous, None)
+		if previous and previous not in self.conversations:
+			return web.json_response({"error": {
+				"message": f"Previous response with id '{previous}' not found.",
+				"type": "invalid_request_error",
+				"param": "previous_response_id",
+				"code": "previous_response_not_found",
+			}}, status=400)
+		messages = (self.conversations[previous] if previous else []) + new
+
+		model = body.get("model", "standin")
+		tools = [{"function": tool} for tool in body.get("tools") or []]
+		text_format = (body.get("text") or {}).get("format") or {}
+		if tools:
+			enum = tools[0]["function"]["parameters"]["properties"]["choice"]["enum"]
+		elif text_format.get("type") == "json_schema":
+			enum = text_format["schema"]["properties"]["choice"]["enum"]
+		else:
+			enum = None
+		content = json.dumps({"choice": random.choice(enum)}) if enum else reply(messages)
+		usage = self._usage(messages, content)
+
+		response_id = f"resp_{uuid.uuid4().hex[:12]}"
+		self.conversations[response_id] = messages + [{"role": "assistant", "content": content}]
+		if tools:
+			output = [{"type": "function_call", "id": f"fc_{uuid.uuid4().hex[:12]}", "call_id": f"call_{uuid.uuid4().hex[:12]}",
+				"name": tools[0]["function"]["name"], "arguments": content, "status": "completed"}]
+		else:
+			output = [{"type": "message", "id": f"msg_{uuid.uuid4().hex[:12]}", "status": "completed", "role": "assistant",
+				"content": [{"type": "output_text", "text": content, "annotations": []}]}]
+		result = {
+			"id": response_id,
+			"object": "response",
+			"created_at": int(time.time()),
+			"status": "completed",
+			"model": model,
+			"output": output,
+			"previous_response_id": previous,
+			"usage": {
+				"input_tokens": usage["prompt_tokens"],
+				"output_tokens": usage["completion_tokens"],
+				"total_tokens": usage["total_tokens"],
+				"input_tokens_details": usage["prompt_tokens_details"],
+				"output_tokens_details": {"reasoning_tokens": 0},
+			},
+		}
+
+		if not body.get("stream"):
+			return web.json_response(result)
+
+		response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+		await response.prepare(request)
+		sequence = 0
+
+		async def send(event: dict):
+			nonlocal sequence
+			event["sequence_number"] = sequence
+			sequence += 1
+			await response.write(f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode())
+
+		await send({"type": "response.created", "response": {**result, "status": "in_progress", "output": []}})
+		words = re.findall(r"\S+\s*", content)
+		for word in words:
+			await send({"type": "response.output_text.delta", "item_id": output[0]["id"], "output_index": 0, "content_index": 0, "delta": word})
+			await asyncio.sleep(self.latency / max(len(words), 1))
+		await send({"type": "response.completed", "response": result})
+		await response.write_eof()
+		return response
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+	parser.add_argument("--host", default="127.0.0.1")
+	parser.add_argument("--port", type=int, default=8088)
+	parser.add_argument("--latency", type=float, default=0.2, help="Mean seconds before answering")
+	parser.add_argument("--jitter", type=float, default=0.1, help="Maximum extra random delay in seconds")
+	parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+	parser.add_argument("--forget-rate", type=float, default=0.0, help="Fraction of stored conversations lost")
+	args = parser.parse_args()
+
+	logging.basicConfig(level=logging.INFO)
+	server = StandinServer(args.latency, args.jitter, args.error_rate, args.forget_rate)
+	web.run_app(server.app, host=args.host, port=args.port)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,128 @@
+"""Unit tests for data.py."""
+
+import asyncio, json, os, stat
+import pytest
+import data
+
+class RecordingBackend:
+    def __init__(self):
+        self.payloads = []
+        self.closed = False
+
+    def load(self):
+        return {}
+
+    def prepare(self, config, dirty):
+        return sorted(dirty)
+
+    def write(self, payload):
+        self.payloads.append(payload)
+
+    def close(self):
+        self.closed = True
+
+def test_changes_are_batched_into_one_delayed_write(monkeypatch):
+    monkeypatch.setattr(data, "WRITE_DELAY", 0.05)
+    async def run():
+        backend = RecordingBackend()
+        store = data.ConfigStore(backend)
+        store.update_profile(1, last_lobby=5)
+        store.update_profile(1, last_lobby=6)
+        store.update_guild(2, player_role=3)
+        before = list(backend.payloads)
+        await asyncio.sleep(0.15)
+        return before, backend.payloads
+    before, after = asyncio.run(run())
+    assert before == []
+    assert after == [[("guilds", "2"), ("lobby", "1")]]
+
+def test_close_flushes_pending_changes_and_closes_the_backend():
+    async def run():
+        backend = RecordingBackend()
+        store = data.ConfigStore(backend)
+        store.update_profile(1, webhook="url")
+        await store.close()
+        return backend, store.writes
+    backend, writes = asyncio.run(run())
+    assert backend.payloads == [[("profiles", "1")]] and writes == 1
+    assert backend.closed
+
+def test_flush_without_changes_writes_nothing():
+    backend = RecordingBackend()
+    asyncio.run(data.ConfigStore(backend).flush())
+    assert backend.payloads == []
+
+def test_json_write_replaces_the_file_and_keeps_its_mode(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text("{}")
+    os.chmod(path, 0o640)
+    backend = data.JSONBackend(str(path))
+    backend.write(json.dumps({"profiles": {"1": {}}}))
+    assert json.loads(path.read_text()) == {"profiles": {"1": {}}}
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+    assert os.listdir(tmp_path) == ["data.json"]
+
+def test_failed_json_write_leaves_the_old_file(tmp_path, monkeypatch):
+    path = tmp_path / "data.json"
+    path.write_text('{"old": true}')
+    def fail(*args):
+        raise OSError("disk full")
+    monkeypatch.setattr(data.os, "replace", fail)
+    with pytest.raises(OSError):
+        data.JSONBackend(str(path)).write("{}")
+    assert json.loads(path.read_text()) == {"old": True}
+    assert os.listdir(tmp_path) == ["data.json"]
+
+SAMPLE = {
+    "profiles": {"10": {"webhook": "https://hook", "last_lobby": 7, "theme": "dark"}},
+    "guilds": {"1": {"player_role": 99}},
+}
+
+def test_sqlite_imports_data_json_once(tmp_path):
+    legacy = tmp_path / "data.json"
+    legacy.write_text(json.dumps(SAMPLE))
+    db = str(tmp_path / "data.db")
+    backend = data.SQLiteBackend(db, str(legacy))
+    assert backend.load() == SAMPLE
+    backend.close()
+
+    legacy.write_text(json.dumps({"profiles": {"20": {"webhook": "other"}}}))
+    backend = data.SQLiteBackend(db, str(legacy))
+    assert backend.load() == SAMPLE
+    backend.close()
+
+def test_sqlite_round_trips_updates(tmp_path):
+    db = str(tmp_path / "data.db")
+    async def run():
+        store = data.ConfigStore(data.SQLiteBackend(db, str(tmp_path / "missing.json")))
+        await store.open()
+        store.update_profile(10, webhook="https://hook", theme="dark")
+        store.update_profile(10, last_lobby=7)
+        store.update_guild(1, player_role=99)
+        await store.close()
+        store = data.ConfigStore(data.SQLiteBackend(db, str(tmp_path / "missing.json")))
+        store.update_profile(10, last_lobby=8)
+        await store.close()
+    asyncio.run(run())
+    backend = data.SQLiteBackend(db)
+    expected = {"profiles": {"10": {"webhook": "https://hook", "last_lobby": 8, "theme": "dark"}}, "guilds": {"1": {"player_role": 99}}}
+    assert backend.load() == expected
+    backend.close()
+
+def test_sqlite_round_trips_removed_profiles(tmp_path):
+    db = str(tmp_path / "data.db")
+    async def run():
+        store = data.ConfigStore(data.SQLiteBackend(db, str(tmp_path / "missing.json")))
+        await store.open()
+        store.update_profile(10, webhook="https://hook", last_lobby=7)
+        store.update_profile(20, webhook="https://other")
+        store.update_guild(1, player_role=99)
+        await store.flush()
+        config = store.config
+        del config["profiles"]["10"]
+        store.replace(config)
+        await store.close()
+    asyncio.run(run())
+    backend = data.SQLiteBackend(db)
+    assert backend.load() == {"profiles": {"20": {"webhook": "https://other"}}, "guilds": {"1": {"player_role": 99}}}
+    backend.close()
@@ -0,0 +1,65 @@
+"""Unit tests for classes/router.py."""
+
+import asyncio, types
+import pytest
+import data
+from classes.router import MessageRouter
+from classes.abstractor import GameAbstractor
+
+class FakeAbstractor:
+    def __init__(self, channel):
+        self.channel = channel
+        self.received = []
+
+    def submit(self, message):
+        self.received.append(message)
+
+    def queue_depth(self):
+        return len(self.received)
+
+def message(channel_id, author_id=1):
+    return types.SimpleNamespace(id=0, channel=types.SimpleNamespace(id=channel_id), author=types.SimpleNamespace(id=author_id))
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(data, "store", data.ConfigStore(data.JSONBackend(str(tmp_path / "data.json"))))
+
+def test_route_register_and_unregister():
+    router = MessageRouter()
+    game = FakeAbstractor(10)
+    router.register(10, game)
+    assert router.get(10) is game
+    assert router.route(message(10))
+    assert not router.route(message(11))
+    router.unregister(10)
+    router.unregister(12)
+    assert router.get(10) is None
+    assert not router.route(message(10))
+    assert len(game.received) == 1
+    assert router.stats() == {"routes": 0, "routed": 1, "dropped": 2}
+
+def test_queue_depths_counts_each_abstractor_once():
+    router = MessageRouter()
+    first, second = FakeAbstractor(10), FakeAbstractor(20)
+    router.register(10, first)
+    router.register(11, first)
+    router.register(20, second)
+    router.route(message(10))
+    router.route(message(11))
+    assert router.queue_depths() == {10: 2, 20: 0}
+
+def test_thread_messages_reach_the_owning_abstractor(store):
+    async def run():
+        router = MessageRouter()
+        bot = types.SimpleNamespace(router=router)
+        game = GameAbstractor(10, bot)
+        router.register(10, game)
+        game.on_message = lambda message: asyncio.sleep(0)
+        game.attach_thread(99)
+        assert router.get(99) is game
+        assert router.route(message(99))
+        depth = game.queue_depth()
+        game.detach_thread(99)
+        await game.close()
+        return depth, router.route(message(99))
+    assert asyncio.run(run()) == (1, False)